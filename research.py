@@ -7,20 +7,44 @@
 - MCP本地文档读取
 - 可开关互联网搜索
 - 流式进度显示
+- 最终报告逐字流式输出 (--stream)
+- 研究单元完成即报告进度，慢速单元可转入后台 (--straggler-grace)
+- 基于SQLite检查点的断点续跑 (--resume <thread_id>)
+- 批量研究，共享LLM/搜索预算，自动跳过已完成条目 (--batch)
 
 使用方法: python research.py "你的研究问题"
+断点续跑: python research.py --resume <thread_id> --model ... --max-tokens ...
 """
 
 import asyncio
 import argparse
+import csv
+import json
+import re
+import time
 import uuid
 import os
 import sys
+from datetime import datetime
+from contextlib import AsyncExitStack
 from typing import Optional
 from dotenv import load_dotenv
-from langgraph.checkpoint.memory import MemorySaver
-from open_deep_research.deep_researcher import deep_researcher
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from open_deep_research.deep_researcher import deep_researcher_builder
 from open_deep_research.configuration import Configuration
+from open_deep_research.utils import (
+    RunMetricsCollector,
+    close_tavily_clients,
+    configure_event_log,
+    configure_tracing,
+    get_tracer,
+    JsonlSpanExporter,
+    OpenTelemetrySpanExporter,
+    trace_span,
+    get_dedup_stats,
+    get_mcp_pool_stats,
+    get_default_cache_dir,
+)
 
 # 加载环境变量
 load_dotenv(".env")
@@ -35,8 +59,17 @@ class ResearchConfig:
                  search_api: str = "tavily",
                  allow_clarification: bool = True,
                  docs_path: Optional[str] = None,
+                 docs_backend: str = "native",
                  max_concurrent_units: int = 8,
-                 max_iterations: int = 10):
+                 max_iterations: int = 10,
+                 stream_report: bool = False,
+                 straggler_grace_seconds: int = 0,
+                 thread_id: Optional[str] = None,
+                 checkpoint_path: Optional[str] = None,
+                 llm_max_concurrent: Optional[int] = None,
+                 llm_requests_per_minute: Optional[int] = None,
+                 search_max_connections: Optional[int] = None,
+                 metrics_out: Optional[str] = None):
 
         self.model = model
         self.max_tokens = max_tokens
@@ -44,14 +77,26 @@ class ResearchConfig:
         self.search_api = search_api if search_enabled else "none"
         self.allow_clarification = allow_clarification
         self.docs_path = docs_path
+        # native: 进程内文档工具（异步I/O，大文件mmap）；mcp: Node文件系统MCP服务器
+        self.docs_backend = docs_backend
         self.max_concurrent_units = max_concurrent_units
         self.max_iterations = max_iterations
+        self.stream_report = stream_report
+        self.straggler_grace_seconds = straggler_grace_seconds
+        # 线程ID固定后，检查点与研究单元结果都可按该ID恢复
+        self.thread_id = thread_id or str(uuid.uuid4())
+        self.checkpoint_path = checkpoint_path or os.path.join(get_default_cache_dir(), "checkpoints.sqlite3")
+        # 进程级共享预算：同一进程内所有研究共用限流器与搜索连接池
+        self.llm_max_concurrent = llm_max_concurrent
+        self.llm_requests_per_minute = llm_requests_per_minute
+        self.search_max_connections = search_max_connections
+        self.metrics_out = metrics_out
 
     def get_langgraph_config(self) -> dict:
         """获取LangGraph配置"""
         config = {
             "configurable": {
-                "thread_id": str(uuid.uuid4()),
+                "thread_id": self.thread_id,
 
                 # 基础配置
                 "max_structured_output_retries": 3,
@@ -71,11 +116,39 @@ class ResearchConfig:
                 # 使用 qwen-plus 生成最终报告以获得更长更详细的输出
                 "final_report_model": "qwen-plus",
                 "final_report_model_max_tokens": self.max_tokens,  # 使用用户传入的max_tokens
+                "stream_final_report": self.stream_report,
+                "research_straggler_grace_seconds": self.straggler_grace_seconds,
+                # 已完成研究单元的结果落盘，中断恢复时无需重跑
+                "research_unit_store_path": os.path.join(
+                    os.path.dirname(os.path.abspath(self.checkpoint_path)), "research_units.sqlite3"
+                ),
             }
         }
 
-        # 配置MCP本地文档支持（有本地文档时自动启用）
-        if self.docs_path and os.path.exists(self.docs_path):
+        # 全局LLM与搜索并发预算（未指定时不限制）
+        if self.llm_max_concurrent:
+            config["configurable"]["llm_max_concurrent_requests"] = self.llm_max_concurrent
+        if self.llm_requests_per_minute:
+            config["configurable"]["llm_requests_per_minute"] = self.llm_requests_per_minute
+        if self.search_max_connections:
+            config["configurable"]["tavily_max_connections"] = self.search_max_connections
+            config["configurable"]["tavily_max_keepalive_connections"] = self.search_max_connections
+
+        # 配置本地文档支持（有本地文档时自动启用）
+        if self.docs_path and os.path.exists(self.docs_path) and self.docs_backend == "native":
+            # 进程内工具与MCP服务器工具同名，无需启动Node子进程；全文索引保存在文档目录下的 .odr_index 中
+            config["configurable"]["local_docs_path"] = os.path.abspath(self.docs_path)
+            config["configurable"]["mcp_prompt"] = (
+                f"你可以使用以下工具访问本地文档：\n"
+                f"- search_local_docs: 全文检索本地文档，按相关度返回段落及其文件位置（查找具体事实时优先使用，避免读取整篇文档）\n"
+                f"- read_text_file: 读取文本文件内容（可用head/tail只读取开头或结尾若干行）\n"
+                f"- list_directory: 列出目录内容\n"
+                f"- read_file: 读取任意文件\n"
+                f"- search_files: 按文件名或通配符递归查找文件\n"
+                f"目录路径: {self.docs_path}\n"
+                f"请优先使用本地文档信息，减少幻觉，提供准确的研究结果。"
+            )
+        elif self.docs_path and os.path.exists(self.docs_path):
             from pathlib import Path
             mcp_server_path = Path(__file__).parent / "mcp_runtime" / "node_modules" / "@modelcontextprotocol" / "server-filesystem" / "dist" / "index.js"
 
@@ -134,9 +207,16 @@ class ResearchConfig:
             print(f"   搜索引擎: {self.search_api}")
         print(f"   交互澄清: {'✅ 开启' if self.allow_clarification else '❌ 关闭'}")
         if self.docs_path:
-            print(f"   本地文档: {self.docs_path}")
+            print(f"   本地文档: {self.docs_path} ({'进程内工具' if self.docs_backend == 'native' else 'MCP服务器'})")
         print(f"   并发数量: {self.max_concurrent_units}")
         print(f"   最大轮次: {self.max_iterations}")
+        print(f"   流式报告: {'✅ 开启' if self.stream_report else '❌ 关闭'}")
+        if self.straggler_grace_seconds:
+            print(f"   慢速研究单元: 首个完成后等待 {self.straggler_grace_seconds}s，其余转入后台")
+        if self.llm_max_concurrent or self.llm_requests_per_minute:
+            print(f"   LLM预算: 并发 {self.llm_max_concurrent or '不限'}，每分钟 {self.llm_requests_per_minute or '不限'} 次")
+        print(f"   线程ID: {self.thread_id}")
+        print(f"   检查点: {self.checkpoint_path}")
         print("-" * 50)
 
 
@@ -192,9 +272,37 @@ def select_documents_interactive() -> Optional[str]:
     return None
 
 
-async def run_research(question: str, config: ResearchConfig) -> Optional[dict]:
-    """运行深度研究流程"""
+def extract_report_text(final_result) -> str:
+    """从工作流最终结果中提取报告文本"""
+    # 处理不同类型的 final_result
+    if isinstance(final_result, dict):
+        # 如果是字典，尝试获取 final_report
+        report = final_result.get("final_report", "❌ 报告生成失败")
+    else:
+        # 如果不是字典，可能是事件字典
+        report = "❌ 无法解析报告格式"
+        # 尝试从event中解析
+        for node_name, node_state in final_result.items():
+            if node_name == "final_report_generation" and isinstance(node_state, dict):
+                report = node_state.get("final_report", "❌ 报告生成失败")
+                break
+
+    # 处理不同的报告格式
+    if hasattr(report, 'content'):
+        return report.content
+    elif isinstance(report, str):
+        return report
+    else:
+        return str(report)
+
+
+async def run_research(question: Optional[str], config: ResearchConfig, resume: bool = False,
+                       close_clients: bool = True) -> Optional[dict]:
+    """运行深度研究流程.
 
+    resume=True 时从该线程最后完成的节点继续；
+    close_clients=False 时保留共享连接池，供同一进程内的其他研究继续使用。
+    """
     # 验证配置
     if not config.validate():
         return None
@@ -202,26 +310,105 @@ async def run_research(question: str, config: ResearchConfig) -> Optional[dict]:
     # 打印配置摘要
     config.print_summary()
 
-    print(f"🔍 开始研究: {question}")
-    print("=" * 50)
-
+    exit_stack = AsyncExitStack()
     try:
-        # 初始化LangGraph工作流 - deep_researcher 已经是编译好的图
-        graph = deep_researcher
-
-        # 获取配置
+        # 使用SQLite检查点编译工作流，每个完成的节点都会持久化
+        os.makedirs(os.path.dirname(os.path.abspath(config.checkpoint_path)), exist_ok=True)
+        checkpointer = await exit_stack.enter_async_context(
+            AsyncSqliteSaver.from_conn_string(config.checkpoint_path)
+        )
+        graph = deep_researcher_builder.compile(checkpointer=checkpointer)
+
+        # 获取配置，并挂载运行指标收集器（按阶段与研究单元统计tokens、调用、耗时、缓存命中）
         langgraph_config = config.get_langgraph_config()
+        metrics_collector = RunMetricsCollector()
+        langgraph_config["callbacks"] = [metrics_collector]
+        # 启用追踪时：节点、LLM调用、工具调用与MCP连接池等待均输出为span，整次研究为根span
+        tracer = get_tracer()
+        if tracer is not None:
+            langgraph_config["callbacks"].append(tracer.callback_handler)
+            exit_stack.enter_context(trace_span("research_run", thread_id=config.thread_id, resume=resume))
+
+        snapshot = await graph.aget_state(langgraph_config) if resume else None
+        if snapshot is not None and not snapshot.values:
+            if not question:
+                print(f"❌ 未找到线程 {config.thread_id} 的检查点")
+                return None
+            # 没有可恢复的检查点但提供了问题：从头开始
+            print(f"⚠️  未找到线程 {config.thread_id} 的检查点，重新开始研究")
+            snapshot = None
+
+        if snapshot is not None and not snapshot.next:
+            # 该线程已经运行结束，直接输出保存的报告
+            print(f"✅ 线程 {config.thread_id} 已完成，输出已保存的报告")
+            print("\n" + "=" * 60)
+            print(snapshot.values.get("final_report", "❌ 未找到最终报告"))
+            print("=" * 60)
+            return snapshot.values
+        elif snapshot is not None:
+            print(f"♻️  从检查点恢复: 线程 {config.thread_id}，下一步 {', '.join(snapshot.next)}")
+            graph_input = None
+        else:
+            print(f"🔍 开始研究: {question}")
+            print(f"🧵 线程ID: {config.thread_id} (中断后可用 --resume {config.thread_id} 继续)")
+            graph_input = {"messages": [{"role": "user", "content": question}]}
+        print("=" * 50)
 
         # 执行研究流程，支持流式输出
         step_count = 0
         final_result = None
         current_stage = "初始化"
 
-        async for event in graph.astream(
-            {"messages": [{"role": "user", "content": question}]},
+        # 流式报告：同时订阅节点更新与LLM消息块；custom 为研究单元的实时进度事件
+        stream_modes = ["updates", "custom", "messages"] if config.stream_report else ["updates", "custom"]
+        run_start_time = time.time()
+        report_phase_start_time = None
+        first_token_time = None
+
+        async for namespace, stream_mode, payload in graph.astream(
+            graph_input,
             langgraph_config,
-            stream_mode="updates"
+            stream_mode=stream_modes,
+            subgraphs=True
         ):
+            # 研究单元进度（完成一个即报告一个）
+            if stream_mode == "custom":
+                if isinstance(payload, dict) and payload.get("event") == "research_unit_completed":
+                    print(f"   ✅ 研究单元完成 {payload['completed']}/{payload['total']} "
+                          f"({payload['elapsed_seconds']}s): {payload['research_topic'][:60]}")
+                elif isinstance(payload, dict) and payload.get("event") == "research_unit_failed":
+                    print(f"   ❌ 研究单元失败 {payload['completed']}/{payload['total']} "
+                          f"({payload['elapsed_seconds']}s): {payload['research_topic'][:60]}")
+                elif isinstance(payload, dict) and payload.get("event") == "research_unit_backgrounded":
+                    print(f"   ⏳ 研究单元转入后台继续: {payload['research_topic'][:60]}")
+                elif isinstance(payload, dict) and payload.get("event") == "background_research_delivered":
+                    print(f"   📬 后台研究结果已送达: {payload['research_topic'][:60]}")
+                continue
+
+            # 最终报告的逐字输出
+            if stream_mode == "messages":
+                chunk, metadata = payload
+                if metadata.get("langgraph_node") != "final_report_generation":
+                    continue
+                content = chunk.content if isinstance(chunk.content, str) else ""
+                if not content:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.time()
+                    phase_start = report_phase_start_time or run_start_time
+                    print(f"⚡ 首字延迟: {first_token_time - phase_start:.2f}s "
+                          f"(距研究开始 {first_token_time - run_start_time:.2f}s)")
+                    print("\n" + "=" * 60)
+                    print("📊 深度研究报告")
+                    print("=" * 60)
+                print(content, end="", flush=True)
+                continue
+
+            # 只展示主图节点的更新，子图内部步骤不计入
+            if namespace:
+                continue
+
+            event = payload
             step_count += 1
 
             for node_name, node_state in event.items():
@@ -270,6 +457,11 @@ async def run_research(question: str, config: ResearchConfig) -> Optional[dict]:
                             preview = latest_note[:150] + "..." if len(latest_note) > 150 else latest_note
                             print(f"🔍 最新发现: {preview}")
 
+                    # 研究阶段结束即进入报告阶段，作为首字延迟的起点
+                    report_phase_start_time = time.time()
+                    if config.stream_report:
+                        print("✍️  正在流式生成最终研究报告...")
+
                 # 报告生成阶段
                 elif node_name == "final_report_generation":
                     print("✍️  正在生成最终研究报告...")
@@ -278,36 +470,41 @@ async def run_research(question: str, config: ResearchConfig) -> Optional[dict]:
 
             final_result = node_state if len(event) == 1 else event
 
-        # 输出最终报告
-        if final_result:
+        # 输出最终报告（流式模式下报告已逐字输出）
+        if final_result and first_token_time is not None:
+            print("\n" + "=" * 60)
+            print(f"⏱️  报告生成耗时: {time.time() - (report_phase_start_time or run_start_time):.2f}s")
+        elif final_result:
             print("\n" + "=" * 60)
             print("📊 深度研究报告")
             print("=" * 60)
 
-            # 处理不同类型的 final_result
-            if isinstance(final_result, dict):
-                # 如果是字典，尝试获取 final_report
-                report = final_result.get("final_report", "❌ 报告生成失败")
-            else:
-                # 如果不是字典，可能是事件字典
-                report = "❌ 无法解析报告格式"
-                # 尝试从event中解析
-                for node_name, node_state in final_result.items():
-                    if node_name == "final_report_generation" and isinstance(node_state, dict):
-                        report = node_state.get("final_report", "❌ 报告生成失败")
-                        break
-
-            # 处理不同的报告格式
-            if hasattr(report, 'content'):
-                report_text = report.content
-            elif isinstance(report, str):
-                report_text = report
-            else:
-                report_text = str(report)
-
-            print(report_text)
+            print(extract_report_text(final_result))
             print("\n" + "=" * 60)
 
+        # 输出本次运行的请求去重统计（并发研究员之间共享的搜索与摘要）
+        dedup_stats = get_dedup_stats(langgraph_config["configurable"]["thread_id"])
+        if dedup_stats:
+            labels = {"search": "搜索", "summary": "摘要"}
+            summary = ", ".join(
+                f"{labels.get(namespace, namespace)} 复用 {counts['hits']} / 发起 {counts['misses']}"
+                for namespace, counts in dedup_stats.items()
+            )
+            print(f"🔁 并发去重: {summary}")
+
+        # 输出本次运行的指标汇总（JSON）
+        metrics_summary = {"thread_id": config.thread_id, **metrics_collector.summary()}
+        mcp_pool_stats = get_mcp_pool_stats()
+        if mcp_pool_stats:
+            # MCP连接池规模与等待耗时（进程内累计）
+            metrics_summary["mcp_pools"] = mcp_pool_stats
+        print("📈 运行指标:")
+        print(json.dumps(metrics_summary, ensure_ascii=False, indent=2))
+        if config.metrics_out:
+            with open(config.metrics_out, "w", encoding="utf-8") as f:
+                json.dump(metrics_summary, f, ensure_ascii=False, indent=2)
+            print(f"📈 运行指标已写入: {config.metrics_out}")
+
         return final_result
 
     except Exception as e:
@@ -316,8 +513,139 @@ async def run_research(question: str, config: ResearchConfig) -> Optional[dict]:
         import traceback
         print("\n详细错误信息:")
         traceback.print_exc()
+        print(f"♻️  可使用 --resume {config.thread_id} 从最后完成的步骤继续")
         return None
 
+    finally:
+        # 关闭检查点数据库与共享的Tavily连接池
+        await exit_stack.aclose()
+        if close_clients:
+            await close_tavily_clients()
+
+
+def load_batch_items(batch_path: str) -> list[dict]:
+    """读取批量问题文件（JSONL 或带 question 列的 CSV），返回 [{"id", "question"}]"""
+    items = []
+    used_ids = set()
+    with open(batch_path, encoding="utf-8-sig", newline="") as f:
+        if batch_path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    for index, row in enumerate(rows, 1):
+        if isinstance(row, str):
+            row = {"question": row}
+        question = (row.get("question") or "").strip()
+        if not question:
+            print(f"⚠️  跳过第 {index} 条: 缺少 question 字段")
+            continue
+        item_id = str(row.get("id") or f"q{index:04d}")
+        # 编号用作文件名，只保留安全字符；清洗后重复的编号追加行号，避免多条问题写同一组文件
+        safe_id = re.sub(r"[^\w\-.]", "_", item_id)
+        if safe_id.casefold() in used_ids:
+            print(f"⚠️  第 {index} 条的编号 {item_id!r} 与前面的条目重复，改用 {safe_id}_{index}")
+            safe_id = f"{safe_id}_{index}"
+        used_ids.add(safe_id.casefold())
+        items.append({"id": safe_id, "question": question})
+    return items
+
+
+async def run_batch_item(item: dict, make_config, output_dir: str, semaphore: asyncio.Semaphore) -> str:
+    """运行单个批量问题，写出报告(.md)与元数据(.json)，返回 completed/failed/skipped"""
+    report_path = os.path.join(output_dir, f"{item['id']}.md")
+    meta_path = os.path.join(output_dir, f"{item['id']}.json")
+    metrics_path = os.path.join(output_dir, f"{item['id']}.metrics.json")
+
+    previous = None
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    if previous and previous.get("status") == "completed" and os.path.exists(report_path):
+        return "skipped"
+
+    # 中断(running)的条目沿用同一线程从检查点恢复；已跑完但失败的条目换新线程重跑
+    attempt = (previous or {}).get("attempt", 1)
+    if previous and previous.get("status") == "failed" and not previous.get("resumable"):
+        attempt += 1
+    thread_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"open-deep-research-batch:{item['id']}:{item['question']}:{attempt}"))
+
+    async with semaphore:
+        config = make_config(thread_id, metrics_out=metrics_path)
+        metadata = {
+            "id": item["id"],
+            "question": item["question"],
+            "thread_id": thread_id,
+            "attempt": attempt,
+            "model": config.model,
+            "status": "running",
+            "started_at": datetime.now().isoformat(),
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        start_time = time.time()
+        result = await run_research(item["question"], config, resume=previous is not None, close_clients=False)
+        report = extract_report_text(result) if result else ""
+        failed = not report or report.startswith(("❌", "Error generating final report"))
+
+        if report:
+            with open(report_path, "w", encoding="utf-8") as f:
+                f.write(report)
+        metadata.update({
+            "status": "failed" if failed else "completed",
+            # 研究中途出错（未到达终点）时检查点仍可恢复
+            "resumable": result is None,
+            "finished_at": datetime.now().isoformat(),
+            "duration_seconds": round(time.time() - start_time, 2),
+            "report_path": report_path if report else None,
+            "report_chars": len(report),
+            "metrics_path": metrics_path if os.path.exists(metrics_path) else None,
+        })
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+    return metadata["status"]
+
+
+async def run_batch(batch_path: str, output_dir: str, concurrency: int, make_config) -> bool:
+    """批量研究：在共享的LLM/搜索预算下并发运行多个问题，已完成的条目自动跳过"""
+    items = load_batch_items(batch_path)
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"📦 批量研究: {len(items)} 个问题，并发 {concurrency}，输出目录 {output_dir}")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    batch_start_time = time.time()
+    try:
+        statuses = await asyncio.gather(*[
+            run_batch_item(item, make_config, output_dir, semaphore) for item in items
+        ], return_exceptions=True)
+    finally:
+        await close_tavily_clients()
+
+    counts = {"completed": 0, "failed": 0, "skipped": 0}
+    for item, status in zip(items, statuses):
+        if isinstance(status, BaseException):
+            print(f"❌ {item['id']} 运行异常: {status}")
+            status = "failed"
+        counts[status] += 1
+
+    summary = {
+        "batch_file": os.path.abspath(batch_path),
+        "total": len(items),
+        **counts,
+        "duration_seconds": round(time.time() - batch_start_time, 2),
+        "finished_at": datetime.now().isoformat(),
+    }
+    with open(os.path.join(output_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 60)
+    print(f"📦 批量研究结束: 完成 {counts['completed']}，失败 {counts['failed']}，跳过 {counts['skipped']} "
+          f"(耗时 {summary['duration_seconds']}s)")
+    if counts["failed"]:
+        print("♻️  重新运行同一命令即可只重跑失败的条目")
+    return counts["failed"] == 0
+
 
 def main():
     """主函数 - 处理命令行参数和用户交互"""
@@ -336,10 +664,15 @@ def main():
   python research.py "机器学习算法比较" --model qwen-plus --max-tokens 4096
   python research.py "本地项目分析" --docs-path ./src --no-search --model deepseek-chat --max-tokens 8192
   python research.py "快速查询" --no-clarify --model qwen-flash --max-tokens 2048
+  python research.py "耕地变化趋势" --stream --model qwen-plus --max-tokens 8192
+  python research.py --resume 3f2a...e1 --model qwen-plus --max-tokens 8192
+  python research.py "耕地变化趋势" --log-level DEBUG --log-format json --model qwen-plus --max-tokens 8192 2> events.jsonl
+  python research.py "耕地变化趋势" --trace-out trace.jsonl --model qwen-plus --max-tokens 8192
+  python research.py --batch questions.jsonl --output-dir reports --batch-concurrency 4 --llm-max-concurrent 8 --model qwen-plus --max-tokens 8192
         """
     )
 
-    parser.add_argument("question", help="研究问题或主题")
+    parser.add_argument("question", nargs="?", help="研究问题或主题 (使用 --resume 或 --batch 时可省略)")
     parser.add_argument("--model", required=True,
                        help="使用的模型 (必需参数)")
     parser.add_argument("--no-search", action="store_true",
@@ -350,6 +683,8 @@ def main():
                        help="跳过交互式澄清，直接开始研究")
     parser.add_argument("--docs-path",
                        help="指定本地文档路径")
+    parser.add_argument("--docs-backend", default="native", choices=["native", "mcp"],
+                       help="本地文档工具实现: native 为进程内异步读取（默认），mcp 为Node文件系统MCP服务器")
     parser.add_argument("--interactive-docs", action="store_true",
                        help="交互式选择文档路径")
     parser.add_argument("--max-concurrent", type=int, default=8,
@@ -358,8 +693,51 @@ def main():
                        help="最大研究轮次 (默认: 10，用于深度研究)")
     parser.add_argument("--max-tokens", type=int, required=True,
                        help="模型最大token数 (必需参数)")
+    parser.add_argument("--stream", action="store_true",
+                       help="逐字流式输出最终报告，并显示首字延迟")
+    parser.add_argument("--straggler-grace", type=int, default=0,
+                       help="首个研究单元完成后等待其余单元的秒数，超时的单元转入后台继续 (默认: 0，等待全部完成)")
+    parser.add_argument("--resume", metavar="THREAD_ID",
+                       help="从指定线程的检查点恢复中断的研究")
+    parser.add_argument("--checkpoint-db",
+                       help="检查点数据库路径 (默认: ~/.cache/open_deep_research/checkpoints.sqlite3)")
+    parser.add_argument("--metrics-out",
+                       help="将运行指标汇总(JSON)写入指定文件")
+    parser.add_argument("--batch", metavar="FILE",
+                       help="批量研究: 从JSONL或CSV文件读取问题 (字段: question, 可选 id)")
+    parser.add_argument("--output-dir", default="batch_output",
+                       help="批量研究的报告与元数据输出目录 (默认: batch_output)")
+    parser.add_argument("--batch-concurrency", type=int, default=2,
+                       help="批量研究同时运行的问题数 (默认: 2)")
+    parser.add_argument("--llm-max-concurrent", type=int,
+                       help="全局LLM并发请求上限（同一进程内所有研究共享）")
+    parser.add_argument("--llm-rpm", type=int,
+                       help="全局LLM每分钟请求数上限（同一进程内所有研究共享）")
+    parser.add_argument("--search-max-connections", type=int,
+                       help="全局搜索连接数上限（同一进程内所有研究共享）")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="结构化事件日志级别 (默认读取 ODR_LOG_LEVEL，否则为 WARNING；DEBUG 输出各热点路径耗时)")
+    parser.add_argument("--log-format", choices=["text", "json"],
+                       help="结构化事件日志格式 (默认读取 ODR_LOG_FORMAT，否则为 text)")
+    parser.add_argument("--trace-out", metavar="FILE",
+                       help="将追踪span追加写入JSONL文件（节点、LLM调用、工具调用、MCP连接池等待耗时）")
+    parser.add_argument("--trace-otel", action="store_true",
+                       help="同时将span转发到OpenTelemetry（需安装 opentelemetry-sdk 并配置导出器）")
 
     args = parser.parse_args()
+    configure_event_log(args.log_level, args.log_format)
+    span_exporters = []
+    if args.trace_out:
+        span_exporters.append(JsonlSpanExporter(args.trace_out))
+    if args.trace_otel:
+        try:
+            span_exporters.append(OpenTelemetrySpanExporter())
+        except ImportError as e:
+            parser.error(str(e))
+    if span_exporters:
+        configure_tracing(span_exporters)
+    if not args.question and not args.resume and not args.batch:
+        parser.error("请提供研究问题，或使用 --resume 恢复已有线程，或使用 --batch 批量研究")
 
     # 交互式选择文档路径
     docs_path = args.docs_path
@@ -367,20 +745,42 @@ def main():
         docs_path = select_documents_interactive()
 
     # 创建研究配置
-    config = ResearchConfig(
+    config_kwargs = dict(
         model=args.model,
         max_tokens=args.max_tokens,
         search_enabled=not args.no_search,
         search_api=args.search_api,
         allow_clarification=not args.no_clarify,
         docs_path=docs_path,
+        docs_backend=args.docs_backend,
         max_concurrent_units=args.max_concurrent,
-        max_iterations=args.max_iterations
+        max_iterations=args.max_iterations,
+        stream_report=args.stream,
+        straggler_grace_seconds=args.straggler_grace,
+        checkpoint_path=args.checkpoint_db,
+        llm_max_concurrent=args.llm_max_concurrent,
+        llm_requests_per_minute=args.llm_rpm,
+        search_max_connections=args.search_max_connections,
+        metrics_out=args.metrics_out
     )
 
+    # 批量模式：无人值守，关闭澄清与流式输出
+    if args.batch:
+        batch_kwargs = {**config_kwargs, "allow_clarification": False, "stream_report": False}
+        print("🚀 启动深度研究系统 (批量模式)...")
+        success = asyncio.run(run_batch(
+            args.batch,
+            args.output_dir,
+            args.batch_concurrency,
+            lambda thread_id, metrics_out=None: ResearchConfig(**{**batch_kwargs, "metrics_out": metrics_out}, thread_id=thread_id)
+        ))
+        return 0 if success else 1
+
+    config = ResearchConfig(**config_kwargs, thread_id=args.resume)
+
     # 运行研究
     print("🚀 启动深度研究系统...")
-    result = asyncio.run(run_research(args.question, config))
+    result = asyncio.run(run_research(args.question, config, resume=bool(args.resume)))
 
     if result:
         print("\n✅ 研究完成!")
@@ -2,7 +2,7 @@
 
 import os
 from enum import Enum
-from typing import Any, List, Optional, Literal
+from typing import Any, List, Literal, Optional
 
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
@@ -16,6 +16,13 @@ class SearchAPI(Enum):
     TAVILY = "tavily"
     NONE = "none"
 
+class FinalReportMode(Enum):
+    """Enumeration of final report generation strategies."""
+    
+    SINGLE = "single"
+    MAP_REDUCE = "map_reduce"
+    AUTO = "auto"
+
 class MCPConfig(BaseModel):
     """Configuration for Model Context Protocol (MCP) servers."""
 
@@ -93,7 +100,87 @@ class Configuration(BaseModel):
                 "min": 1,
                 "max": 20,
                 "step": 1,
-                "description": "Maximum number of research units to run concurrently. This will allow the researcher to use multiple sub-agents to conduct research. Note: with more concurrency, you may run into rate limits."
+                "description": "Maximum number of research units to run concurrently. This will allow the researcher to use multiple sub-agents to conduct research. Additional research units requested in the same step are queued rather than rejected. Note: with more concurrency, you may run into rate limits."
+            }
+        }
+    )
+    research_unit_timeout_seconds: Optional[int] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "min": 30,
+                "max": 7200,
+                "description": "Wall-clock limit for a single research unit. When it is reached, running model and tool calls are cancelled and the unit compresses what it has found so far. Empty means no limit."
+            }
+        }
+    )
+    research_unit_token_budget: Optional[int] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "min": 1000,
+                "description": "Model tokens a single research unit may spend on its research loop before it stops and compresses its findings. Empty means no limit."
+            }
+        }
+    )
+    research_unit_max_retries: int = Field(
+        default=1,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 1,
+                "min": 0,
+                "max": 5,
+                "description": "Number of times a research unit is retried after a transient failure (rate limit, connection error, server error). Other failures are reported to the supervisor without affecting sibling research units."
+            }
+        }
+    )
+    research_straggler_grace_seconds: int = Field(
+        default=0,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 0,
+                "min": 0,
+                "max": 3600,
+                "description": "After the first research unit of a supervisor step finishes, wait at most this many seconds for the rest. Unfinished units keep running in the background and their results are delivered to the supervisor in a later step. 0 waits for every unit."
+            }
+        }
+    )
+    llm_requests_per_minute: Optional[int] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "min": 1,
+                "description": "Requests-per-minute budget shared by all LLM calls to the same provider endpoint. Leave empty for no limit."
+            }
+        }
+    )
+    llm_tokens_per_minute: Optional[int] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "min": 1000,
+                "description": "Tokens-per-minute budget shared by all LLM calls to the same provider endpoint. Leave empty for no limit."
+            }
+        }
+    )
+    llm_max_concurrent_requests: Optional[int] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "min": 1,
+                "description": "Maximum number of in-flight LLM calls per provider endpoint. Supervisor and final report calls are admitted before summarization calls. Leave empty for no limit."
             }
         }
     )
@@ -114,6 +201,30 @@ class Configuration(BaseModel):
             }
         }
     )
+    tavily_max_connections: int = Field(
+        default=20,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 20,
+                "min": 1,
+                "max": 200,
+                "description": "Maximum number of concurrent HTTP connections in the shared Tavily connection pool"
+            }
+        }
+    )
+    tavily_max_keepalive_connections: int = Field(
+        default=10,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 10,
+                "min": 0,
+                "max": 200,
+                "description": "Maximum number of idle keep-alive connections kept open in the shared Tavily connection pool"
+            }
+        }
+    )
     max_researcher_iterations: int = Field(
         default=6,
         metadata={
@@ -140,6 +251,18 @@ class Configuration(BaseModel):
             }
         }
     )
+    researcher_context_window: int = Field(
+        default=0,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 0,
+                "min": 0,
+                "max": 30,
+                "description": "Number of most recent tool exchanges a researcher sees verbatim; older tool outputs are replaced with short digests. 0 keeps the full history."
+            }
+        }
+    )
     # Model Configuration
     summarization_model: str = Field(
         default="openai:gpt-4.1-mini",
@@ -233,6 +356,119 @@ class Configuration(BaseModel):
             }
         }
     )
+    final_report_mode: FinalReportMode = Field(
+        default=FinalReportMode.AUTO,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "select",
+                "default": "auto",
+                "description": "How to write the final report. Map-reduce drafts sections from groups of notes in parallel and merges them in a final pass; auto uses map-reduce only when the notes do not fit the final report model's context.",
+                "options": [
+                    {"label": "Auto", "value": FinalReportMode.AUTO.value},
+                    {"label": "Single Pass", "value": FinalReportMode.SINGLE.value},
+                    {"label": "Map-Reduce", "value": FinalReportMode.MAP_REDUCE.value}
+                ]
+            }
+        }
+    )
+    final_report_max_concurrency: int = Field(
+        default=4,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "slider",
+                "default": 4,
+                "min": 1,
+                "max": 16,
+                "step": 1,
+                "description": "Maximum number of section drafts written in parallel in map-reduce final report mode"
+            }
+        }
+    )
+    stream_final_report: bool = Field(
+        default=False,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "boolean",
+                "default": False,
+                "description": "Whether to stream the final report token by token (surfaced through stream_mode='messages')"
+            }
+        }
+    )
+    # Cache Configuration
+    summary_cache_enabled: bool = Field(
+        default=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "boolean",
+                "default": True,
+                "description": "Whether to cache webpage summaries by content hash so the same page is only summarized once across researchers and runs"
+            }
+        }
+    )
+    summary_cache_path: Optional[str] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "text",
+                "description": "Path of the on-disk SQLite summary cache. Defaults to ~/.cache/open_deep_research/summary_cache.sqlite3; set to an empty string to keep the cache in memory only."
+            }
+        }
+    )
+    summary_cache_ttl_seconds: int = Field(
+        default=604800,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 604800,
+                "min": 60,
+                "description": "Time-to-live in seconds for cached webpage summaries"
+            }
+        }
+    )
+    summary_cache_max_entries: int = Field(
+        default=20000,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 20000,
+                "min": 100,
+                "description": "Maximum number of webpage summaries kept in the on-disk cache before the least recently used ones are evicted"
+            }
+        }
+    )
+    research_unit_store_path: Optional[str] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "text",
+                "description": "SQLite database where finished research unit results are kept per thread, so a resumed run does not redo research that completed before an interruption. Empty disables the store."
+            }
+        }
+    )
+    research_unit_store_ttl_seconds: int = Field(
+        default=604800,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 604800,
+                "min": 60,
+                "description": "Time-to-live in seconds for stored research unit results of runs that were interrupted and never resumed (results of finished runs are deleted right away)"
+            }
+        }
+    )
+    # Local documents
+    local_docs_path: Optional[str] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "text",
+                "description": "Directory of local documents researchers can list, read and search with the built-in list_directory, read_text_file, read_file and search_files tools (in-process, no MCP server). Access outside this directory is refused."
+            }
+        }
+    )
     # MCP server configuration
     mcp_config: Optional[MCPConfig] = Field(
         default=None,
@@ -254,6 +490,68 @@ class Configuration(BaseModel):
             }
         }
     )
+    mcp_tool_schema_cache_path: Optional[str] = Field(
+        default=None,
+        optional=True,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "text",
+                "description": "Directory where stdio MCP servers' tool schemas are cached across runs, so tools can be bound without starting the server until one is called. Defaults to ~/.cache/open_deep_research/mcp_tool_schemas; set to an empty string to disable."
+            }
+        }
+    )
+    mcp_pool_min_size: int = Field(
+        default=1,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 1,
+                "min": 0,
+                "max": 16,
+                "step": 1,
+                "description": "Number of MCP server connections the pool keeps open even when idle"
+            }
+        }
+    )
+    mcp_pool_max_size: int = Field(
+        default=8,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 8,
+                "min": 1,
+                "max": 32,
+                "step": 1,
+                "description": "Maximum number of MCP server connections the pool opens when tool calls queue up"
+            }
+        }
+    )
+    mcp_pool_grow_after_wait_seconds: float = Field(
+        default=0.5,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 0.5,
+                "min": 0,
+                "max": 30,
+                "step": 0.1,
+                "description": "How long a tool call waits for a free MCP connection before the pool opens another one"
+            }
+        }
+    )
+    mcp_pool_idle_timeout_seconds: float = Field(
+        default=120,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 120,
+                "min": 5,
+                "max": 3600,
+                "step": 5,
+                "description": "MCP connections idle for longer than this are closed, down to the pool's minimum size"
+            }
+        }
+    )
 
 
     @classmethod
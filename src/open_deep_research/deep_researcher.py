@@ -1,7 +1,9 @@
 """Main LangGraph implementation for the Deep Research agent."""
 
 import asyncio
-from typing import Literal
+import logging
+import time
+from typing import Literal, Optional
 
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import (
@@ -11,19 +13,24 @@ from langchain_core.messages import (
     ToolMessage,
     filter_messages,
     get_buffer_string,
+    message_chunk_to_message,
 )
 from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import merge_configs
+from langgraph.constants import TAG_NOSTREAM
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Command
 
 from open_deep_research.configuration import (
     Configuration,
+    FinalReportMode,
 )
 from open_deep_research.prompts import (
     clarify_with_user_instructions,
     compress_research_simple_human_message,
     compress_research_system_prompt,
     final_report_generation_prompt,
+    final_report_section_draft_prompt,
     lead_researcher_prompt,
     research_system_prompt,
     transform_messages_into_research_topic_prompt,
@@ -40,23 +47,48 @@ from open_deep_research.state import (
     SupervisorState,
 )
 from open_deep_research.utils import (
+    BACKGROUND_RESEARCH_MESSAGE_NAME,
+    BACKGROUND_RESEARCH_PENDING_PREFIX,
+    LLM_PRIORITY_HIGH,
+    LLM_PRIORITY_NORMAL,
+    MIN_REPORT_CLUSTER_TOKENS,
     anthropic_websearch_called,
-    get_all_tools,
+    apply_context_window,
+    background_research_message_id,
+    cancel_background_research,
+    cluster_notes,
+    compact_messages,
+    drain_background_research,
+    emit_research_progress,
+    estimate_message_tokens,
+    estimate_token_count,
+    find_orphaned_background_research,
     get_api_key_for_model,
+    get_config_value,
     get_configured_chat_model,
     get_configured_chat_model_with_structured_output,
-    get_model_token_limit,
+    get_configured_chat_model_with_tools,
     get_notes_from_tool_calls,
-    get_model_config,
+    get_prompt_token_budget,
+    get_research_toolkit,
+    get_research_unit_store,
     get_today_str,
     is_token_limit_exceeded,
+    is_transient_error,
+    log_event,
+    make_tool_output_digest,
     openai_websearch_called,
+    pack_findings,
+    pop_finished_background_research,
+    prewarm_local_docs_index,
+    prewarm_mcp_pool,
+    register_background_research,
     remove_up_to_last_ai_message,
-    supports_structured_output,
+    span,
     think_tool,
+    trace_span,
 )
 
-
 # Original configurable model for compatibility
 configurable_model = init_chat_model(
     configurable_fields=("model", "max_tokens", "api_key"),
@@ -75,7 +107,9 @@ async def clarify_with_user(state: AgentState, config: RunnableConfig) -> Comman
     Returns:
         Command to either end with a clarifying question or proceed to research brief
     """
-    # Step 1: Check if clarification is enabled in configuration
+    # Step 1: Start MCP servers and the local docs index in the background, then check if clarification is enabled
+    await prewarm_mcp_pool(config)
+    prewarm_local_docs_index(config)
     configurable = Configuration.from_runnable_config(config)
     if not configurable.allow_clarification:
         # Skip clarification step and proceed directly to research
@@ -96,7 +130,9 @@ async def clarify_with_user(state: AgentState, config: RunnableConfig) -> Comman
         configurable.research_model_max_tokens,
         get_api_key_for_model(configurable.research_model, config),
         ClarifyWithUser,
-        configurable.max_structured_output_retries
+        configurable.max_structured_output_retries,
+        priority=LLM_PRIORITY_HIGH,
+        configurable=configurable
     )
     
     # Step 3: Analyze whether clarification is needed
@@ -135,7 +171,9 @@ async def write_research_brief(state: AgentState, config: RunnableConfig) -> Com
     Returns:
         Command to proceed to research supervisor with initialized context
     """
-    # Step 1: Set up the research model for structured output
+    # Step 1: Set up the research model for structured output (MCP servers and the docs index keep warming up meanwhile)
+    await prewarm_mcp_pool(config)
+    prewarm_local_docs_index(config)
     configurable = Configuration.from_runnable_config(config)
     research_model_config = {
         "model": configurable.research_model,
@@ -150,7 +188,9 @@ async def write_research_brief(state: AgentState, config: RunnableConfig) -> Com
         configurable.research_model_max_tokens,
         get_api_key_for_model(configurable.research_model, config),
         ResearchQuestion,
-        configurable.max_structured_output_retries
+        configurable.max_structured_output_retries,
+        priority=LLM_PRIORITY_HIGH,
+        configurable=configurable
     )
     
     # Step 2: Generate structured research brief from user messages
@@ -208,16 +248,15 @@ async def supervisor(state: SupervisorState, config: RunnableConfig) -> Command[
     # Available tools: research delegation, completion signaling, and strategic thinking
     lead_researcher_tools = [ConductResearch, ResearchComplete, think_tool]
     
-    # Configure model with tools, retry logic, and model settings
-    base_supervisor_model = get_configured_chat_model(
+    # Configure model with tools, retry logic, and model settings (memoized across iterations)
+    research_model = get_configured_chat_model_with_tools(
         configurable.research_model,
         configurable.research_model_max_tokens,
-        get_api_key_for_model(configurable.research_model, config)
-    )
-    research_model = (
-        base_supervisor_model
-        .bind_tools(lead_researcher_tools)
-        .with_retry(stop_after_attempt=configurable.max_structured_output_retries)
+        get_api_key_for_model(configurable.research_model, config),
+        lead_researcher_tools,
+        configurable.max_structured_output_retries,
+        priority=LLM_PRIORITY_HIGH,
+        configurable=configurable
     )
     
     # Step 2: Generate supervisor response based on current context
@@ -233,6 +272,142 @@ async def supervisor(state: SupervisorState, config: RunnableConfig) -> Command[
         }
     )
 
+async def invoke_research_unit(tool_call: dict, config: RunnableConfig, configurable: Configuration) -> dict:
+    """Run one ConductResearch call through the researcher subgraph, bounded by its deadline.
+
+    Args:
+        tool_call: ConductResearch tool call from the supervisor
+        config: Runtime configuration passed to the researcher
+        configurable: Configuration with the research unit limits
+
+    Returns:
+        Researcher output state with compressed research and raw notes
+    """
+    timeout_seconds = configurable.research_unit_timeout_seconds
+    researcher_input = {
+        "researcher_messages": [
+            HumanMessage(content=tool_call["args"]["research_topic"])
+        ],
+        "research_topic": tool_call["args"]["research_topic"],
+        "deadline": time.time() + timeout_seconds if timeout_seconds else None
+    }
+    # Tag every call made by this unit so metrics and traces can be attributed to it
+    config = merge_configs(config, {
+        "metadata": {
+            "research_unit_id": tool_call["id"],
+            "research_topic": tool_call["args"]["research_topic"][:200]
+        }
+    })
+    if not timeout_seconds:
+        return await researcher_subgraph.ainvoke(researcher_input, config)
+    
+    # Backstop in case the unit overruns its deadline while compressing its findings
+    try:
+        return await asyncio.wait_for(
+            researcher_subgraph.ainvoke(researcher_input, config),
+            timeout=timeout_seconds + RESEARCH_UNIT_COMPRESSION_GRACE_SECONDS
+        )
+    except TimeoutError:
+        raise TimeoutError(f"Research did not finish within {timeout_seconds} seconds and was cancelled") from None
+
+async def run_research_unit(tool_call: dict, config: RunnableConfig, slots: asyncio.Semaphore) -> dict:
+    """Run one ConductResearch call once a slot is free, retrying transient failures.
+
+    Args:
+        tool_call: ConductResearch tool call from the supervisor
+        config: Runtime configuration passed to the researcher
+        slots: Semaphore bounding concurrently running research units
+
+    Returns:
+        Researcher output state with compressed research and raw notes
+
+    Raises:
+        Exception: The last failure, if the unit failed permanently or ran out of retries
+    """
+    configurable = Configuration.from_runnable_config(config)
+    
+    # Reuse the result if this tool call already finished before the run was interrupted
+    thread_id = config.get("configurable", {}).get("thread_id")
+    store = get_research_unit_store(configurable) if thread_id else None
+    if store is not None:
+        stored_result = await store.aget(thread_id, tool_call["id"])
+        if stored_result is not None:
+            return stored_result
+    
+    # The research unit span covers its wait for a slot, every attempt and the backoff between them
+    with trace_span(
+        "research_unit",
+        research_unit_id=tool_call["id"],
+        research_topic=tool_call["args"]["research_topic"][:200]
+    ) as span_attributes:
+        queued_at = time.perf_counter()
+        async with slots:
+            span_attributes["queue_wait_ms"] = round((time.perf_counter() - queued_at) * 1000, 2)
+            attempt = 0
+            while True:
+                try:
+                    result = await invoke_research_unit(tool_call, config, configurable)
+                    if store is not None:
+                        await store.aset(thread_id, tool_call["id"], result)
+                    return result
+                except Exception as e:
+                    retryable = is_transient_error(e) and not is_token_limit_exceeded(e, configurable.research_model)
+                    if not retryable or attempt >= configurable.research_unit_max_retries:
+                        raise
+                    delay = RESEARCH_UNIT_RETRY_BACKOFF_SECONDS * 2 ** attempt
+                    attempt += 1
+                    span_attributes["retries"] = attempt
+                    log_event(
+                        logging.WARNING, "supervisor.research_unit_retry",
+                        error=str(e), attempt=attempt, max_retries=configurable.research_unit_max_retries, delay_seconds=delay
+                    )
+                    await asyncio.sleep(delay)
+
+def background_research_messages(finished: list) -> tuple[list[HumanMessage], list[str]]:
+    """Turn finished background research units into supervisor messages and raw notes.
+
+    Args:
+        finished: (tool_call_id, topic, result or exception) for each finished unit
+
+    Returns:
+        Messages delivering the findings, and the units' raw notes
+    """
+    messages = []
+    raw_notes = []
+    for tool_call_id, topic, result in finished:
+        if isinstance(result, BaseException):
+            # Reported to the supervisor, but not named as a delivery so it never becomes a note
+            messages.append(HumanMessage(
+                content=f"Background research on \"{topic}\" failed: {result}",
+                id=background_research_message_id(tool_call_id)
+            ))
+        else:
+            messages.append(HumanMessage(
+                content=f"Background research on \"{topic}\" finished:\n\n{result.get('compressed_research', '')}",
+                name=BACKGROUND_RESEARCH_MESSAGE_NAME,
+                id=background_research_message_id(tool_call_id)
+            ))
+            raw_notes.extend(note for note in result.get("raw_notes", []) if note)
+        emit_research_progress({
+            "event": "background_research_delivered",
+            "tool_call_id": tool_call_id,
+            "research_topic": topic
+        })
+    return messages, raw_notes
+
+async def end_research_phase(state: SupervisorState, thread_id: str) -> Command:
+    """End the research phase once every background research unit has delivered its findings."""
+    background_messages, background_raw_notes = background_research_messages(
+        await drain_background_research(thread_id)
+    )
+    update = {
+        "notes": get_notes_from_tool_calls(state.get("supervisor_messages", []) + background_messages),
+        "research_brief": state.get("research_brief", "")
+    }
+    if background_raw_notes:
+        update["raw_notes"] = background_raw_notes
+    return Command(goto=END, update=update)
+
 async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor", "__end__"]]:
     """Execute tools called by the supervisor, including research delegation and strategic thinking.
     
@@ -262,20 +437,32 @@ async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Co
         for tool_call in most_recent_message.tool_calls
     )
     
+    thread_id = config.get("configurable", {}).get("thread_id")
+    
+    # Re-launch background research lost with an earlier process (crash or resume); stored results return at once
+    orphaned_research_calls = find_orphaned_background_research(thread_id, supervisor_messages) if thread_id else []
+    if orphaned_research_calls:
+        log_event(logging.WARNING, "supervisor.background_research_relaunched", research_units=len(orphaned_research_calls))
+        relaunch_slots = asyncio.Semaphore(configurable.max_concurrent_research_units)
+        for tool_call in orphaned_research_calls:
+            register_background_research(
+                thread_id, tool_call["id"], tool_call["args"]["research_topic"],
+                asyncio.create_task(run_research_unit(tool_call, config, relaunch_slots))
+            )
+    
     # Exit if any termination condition is met
     if exceeded_allowed_iterations or no_tool_calls or research_complete_tool_call:
-        return Command(
-            goto=END,
-            update={
-                "notes": get_notes_from_tool_calls(supervisor_messages),
-                "research_brief": state.get("research_brief", "")
-            }
-        )
+        return await end_research_phase(state, thread_id)
     
     # Step 2: Process all tool calls together (both think_tool and ConductResearch)
     all_tool_messages = []
     update_payload = {"supervisor_messages": []}
     
+    # Pick up background research that finished since the last step
+    background_messages, background_raw_notes = background_research_messages(
+        pop_finished_background_research(thread_id)
+    )
+    
     # Handle think_tool calls (strategic reflection)
     think_tool_calls = [
         tool_call for tool_call in most_recent_message.tool_calls 
@@ -297,67 +484,108 @@ async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Co
     ]
     
     if conduct_research_calls:
+        # Queue every requested topic; the semaphore bounds how many run at once
+        research_unit_slots = asyncio.Semaphore(configurable.max_concurrent_research_units)
+
+        log_event(
+            logging.INFO, "supervisor.delegate",
+            research_units=len(conduct_research_calls), max_concurrent=configurable.max_concurrent_research_units
+        )
+        research_tasks = {
+            asyncio.create_task(run_research_unit(tool_call, config, research_unit_slots)): tool_call
+            for tool_call in conduct_research_calls
+        }
+
+        # Record each result (or failure) as soon as it finishes; once the first is in, stragglers get a grace period
+        grace_seconds = configurable.research_straggler_grace_seconds if thread_id else 0
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        straggler_deadline = None
+        tool_results = {}
+        pending = set(research_tasks)
         try:
-            from datetime import datetime
-            # Limit concurrent research units to prevent resource exhaustion
-            allowed_conduct_research_calls = conduct_research_calls[:configurable.max_concurrent_research_units]
-            overflow_conduct_research_calls = conduct_research_calls[configurable.max_concurrent_research_units:]
-
-            print(f"[{datetime.now()}] 📋 Supervisor: Delegating {len(allowed_conduct_research_calls)} research tasks...")
-            # Execute research tasks in parallel
-            research_tasks = [
-                researcher_subgraph.ainvoke({
-                    "researcher_messages": [
-                        HumanMessage(content=tool_call["args"]["research_topic"])
-                    ],
+            while pending:
+                timeout = None if straggler_deadline is None else max(0, straggler_deadline - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    tool_call = research_tasks[task]
+                    # Failures are kept per task so one researcher cannot discard its siblings' results
+                    tool_results[tool_call["id"]] = task.exception() or task.result()
+                    failed = isinstance(tool_results[tool_call["id"]], Exception)
+                    log_event(
+                        logging.WARNING if failed else logging.INFO,
+                        "supervisor.research_unit_failed" if failed else "supervisor.research_unit_completed",
+                        completed=len(tool_results), total=len(research_tasks),
+                        research_topic=tool_call["args"]["research_topic"][:60]
+                    )
+                    emit_research_progress({
+                        "event": "research_unit_failed" if failed else "research_unit_completed",
+                        "tool_call_id": tool_call["id"],
+                        "research_topic": tool_call["args"]["research_topic"],
+                        "completed": len(tool_results),
+                        "total": len(research_tasks),
+                        "elapsed_seconds": round(loop.time() - started_at, 2)
+                    })
+                if grace_seconds > 0 and straggler_deadline is None:
+                    straggler_deadline = loop.time() + grace_seconds
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        log_event(
+            logging.INFO, "supervisor.research_units_finished",
+            finished=len(tool_results), total=len(research_tasks), elapsed_seconds=round(loop.time() - started_at, 2)
+        )
+        
+        # End the research phase only if every research unit failed on context limits
+        failures = [result for result in tool_results.values() if isinstance(result, Exception)]
+        if not pending and len(failures) == len(research_tasks) and all(
+            is_token_limit_exceeded(failure, configurable.research_model) for failure in failures
+        ):
+            return await end_research_phase(state, thread_id)
+        
+        # Create tool messages with research results; stragglers keep running in the background
+        for task, tool_call in research_tasks.items():
+            status = "success"
+            if task in pending:
+                register_background_research(thread_id, tool_call["id"], tool_call["args"]["research_topic"], task)
+                emit_research_progress({
+                    "event": "research_unit_backgrounded",
+                    "tool_call_id": tool_call["id"],
                     "research_topic": tool_call["args"]["research_topic"]
-                }, config)
-                for tool_call in allowed_conduct_research_calls
-            ]
-
-            print(f"[{datetime.now()}] 📋 Supervisor: Waiting for researcher tasks to complete...")
-            tool_results = await asyncio.gather(*research_tasks)
-            print(f"[{datetime.now()}] 📋 Supervisor: All {len(tool_results)} researcher tasks completed")
-            
-            # Create tool messages with research results
-            for observation, tool_call in zip(tool_results, allowed_conduct_research_calls):
-                all_tool_messages.append(ToolMessage(
-                    content=observation.get("compressed_research", "Error synthesizing research report: Maximum retries exceeded"),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"]
-                ))
-            
-            # Handle overflow research calls with error messages
-            for overflow_call in overflow_conduct_research_calls:
-                all_tool_messages.append(ToolMessage(
-                    content=f"Error: Did not run this research as you have already exceeded the maximum number of concurrent research units. Please try again with {configurable.max_concurrent_research_units} or fewer research units.",
-                    name="ConductResearch",
-                    tool_call_id=overflow_call["id"]
-                ))
-            
-            # Aggregate raw notes from all research results
-            raw_notes_concat = "\n".join([
-                "\n".join(observation.get("raw_notes", [])) 
-                for observation in tool_results
-            ])
-            
-            if raw_notes_concat:
-                update_payload["raw_notes"] = [raw_notes_concat]
-                
-        except Exception as e:
-            # Handle research execution errors
-            if is_token_limit_exceeded(e, configurable.research_model) or True:
-                # Token limit exceeded or other error - end research phase
-                return Command(
-                    goto=END,
-                    update={
-                        "notes": get_notes_from_tool_calls(supervisor_messages),
-                        "research_brief": state.get("research_brief", "")
-                    }
+                })
+                content = (
+                    f"{BACKGROUND_RESEARCH_PENDING_PREFIX} This research is taking longer and continues in the background. "
+                    "Its findings will be delivered in a later message; do not delegate this topic again."
                 )
+            elif isinstance(tool_results[tool_call["id"]], Exception):
+                status = "error"
+                content = f"Error: Research on this topic failed: {tool_results[tool_call['id']]}"
+            else:
+                content = tool_results[tool_call["id"]].get("compressed_research", "Error synthesizing research report: Maximum retries exceeded")
+            all_tool_messages.append(ToolMessage(
+                content=content,
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                status=status
+            ))
+        
+        # Aggregate raw notes from all successful research results
+        raw_notes_concat = "\n".join([
+            "\n".join(observation.get("raw_notes", [])) 
+            for observation in tool_results.values()
+            if not isinstance(observation, Exception)
+        ])
+        
+        if raw_notes_concat:
+            update_payload["raw_notes"] = [raw_notes_concat]
     
-    # Step 3: Return command with all tool results
-    update_payload["supervisor_messages"] = all_tool_messages
+    # Step 3: Return command with all tool results, followed by any background research deliveries
+    update_payload["supervisor_messages"] = all_tool_messages + background_messages
+    if background_raw_notes:
+        update_payload["raw_notes"] = update_payload.get("raw_notes", []) + background_raw_notes
     return Command(
         goto="supervisor",
         update=update_payload
@@ -377,7 +605,48 @@ supervisor_builder.add_edge(START, "supervisor")  # Entry point to supervisor
 # Compile supervisor subgraph for use in main workflow
 supervisor_subgraph = supervisor_builder.compile()
 
-async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[Literal["researcher_tools"]]:
+async def research_supervisor(state: AgentState, config: RunnableConfig) -> dict:
+    """Run the supervisor subgraph, cleaning up per-thread research state when it ends.
+
+    Straggling research units normally outlive a supervisor step and are drained when
+    the research phase ends; if the run is cancelled or fails first, nothing else
+    would ever collect them. Once the phase has finished, the stored research unit
+    results kept for resuming it are no longer needed.
+
+    Args:
+        state: Current agent state with the research brief and supervisor messages
+        config: Runtime configuration
+
+    Returns:
+        The supervisor subgraph's notes, raw notes and research brief
+    """
+    thread_id = config.get("configurable", {}).get("thread_id")
+    try:
+        result = await supervisor_subgraph.ainvoke(state, config)
+    except BaseException:
+        cancelled = cancel_background_research(thread_id)
+        if cancelled:
+            log_event(logging.WARNING, "supervisor.background_research_cancelled", thread_id=thread_id, cancelled=cancelled)
+        raise
+    store = get_research_unit_store(Configuration.from_runnable_config(config)) if thread_id else None
+    if store is not None:
+        await store.adelete_thread(thread_id)
+    return {key: value for key, value in result.items() if key in AgentState.__annotations__}
+
+def get_research_unit_time_left(state: ResearcherState) -> Optional[float]:
+    """Seconds left before the research unit's deadline, or None if it has no deadline."""
+    deadline = state.get("deadline")
+    return None if deadline is None else max(0.0, deadline - time.time())
+
+def is_research_unit_budget_exhausted(state: ResearcherState, configurable: Configuration) -> bool:
+    """Check whether the research unit has run out of time or model tokens."""
+    time_left = get_research_unit_time_left(state)
+    token_budget = configurable.research_unit_token_budget
+    return (time_left is not None and time_left <= 0) or (
+        token_budget is not None and state.get("tokens_used", 0) >= token_budget
+    )
+
+async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[Literal["researcher_tools", "compress_research"]]:
     """Individual researcher that conducts focused research on specific topics.
 
     This researcher is given a specific research topic by the supervisor and uses
@@ -389,21 +658,20 @@ async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[
         config: Runtime configuration with model settings and tool availability
 
     Returns:
-        Command to proceed to researcher_tools for tool execution
+        Command to proceed to researcher_tools for tool execution, or to
+        compress_research once the unit's time or token budget is spent
     """
     # Step 1: Load configuration and validate tool availability
-    import time
-    from datetime import datetime
-
-    print(f"[{datetime.now()}] 🔧 Researcher node: Starting tool loading...")
     configurable = Configuration.from_runnable_config(config)
     researcher_messages = state.get("researcher_messages", [])
+    if is_research_unit_budget_exhausted(state, configurable):
+        log_event(logging.INFO, "researcher.budget_exhausted", tokens_used=state.get("tokens_used", 0))
+        return Command(goto="compress_research")
 
-    # Get all available research tools (search, MCP, think_tool)
-    start_time = time.time()
-    print(f"[{datetime.now()}] 🔧 Researcher node: Calling get_all_tools...")
-    tools = await get_all_tools(config)
-    print(f"[{datetime.now()}] 🔧 Researcher node: get_all_tools completed in {time.time() - start_time:.2f}s, got {len(tools)} tools")
+    # Get all available research tools (search, MCP, think_tool), assembled once per configuration
+    with span("researcher.load_toolkit") as toolkit_span:
+        tools = (await get_research_toolkit(config)).tools
+        toolkit_span["tool_count"] = len(tools)
 
     if len(tools) == 0:
         raise ValueError(
@@ -412,7 +680,6 @@ async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[
         )
     
     # Step 2: Configure the researcher model with tools
-    print(f"[{datetime.now()}] 🔧 Researcher node: Configuring model...")
     research_model_config = {
         "model": configurable.research_model,
         "max_tokens": configurable.research_model_max_tokens,
@@ -427,31 +694,44 @@ async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[
     )
 
     # Configure model with tools, retry logic, and settings
-    print(f"[{datetime.now()}] 🔧 Researcher node: Creating base model...")
-    base_researcher_model = get_configured_chat_model(
+    research_model = get_configured_chat_model_with_tools(
         configurable.research_model,
         configurable.research_model_max_tokens,
-        get_api_key_for_model(configurable.research_model, config)
-    )
-    print(f"[{datetime.now()}] 🔧 Researcher node: Binding {len(tools)} tools to model...")
-    research_model = (
-        base_researcher_model
-        .bind_tools(tools)
-        .with_retry(stop_after_attempt=configurable.max_structured_output_retries)
+        get_api_key_for_model(configurable.research_model, config),
+        tools,
+        configurable.max_structured_output_retries,
+        priority=LLM_PRIORITY_NORMAL,
+        configurable=configurable
     )
-    print(f"[{datetime.now()}] 🔧 Researcher node: Model configured, invoking with messages...")
 
-    # Step 3: Generate researcher response with system context
-    messages = [SystemMessage(content=researcher_prompt)] + researcher_messages
-    response = await research_model.ainvoke(messages)
-    print(f"[{datetime.now()}] 🔧 Researcher node: Model invocation completed")
+    # Step 3: Generate researcher response with system context, older tool outputs as digests
+    windowed_messages = apply_context_window(
+        researcher_messages,
+        state.get("tool_output_digests", {}),
+        configurable.researcher_context_window
+    )
+    messages = [SystemMessage(content=researcher_prompt)] + windowed_messages
+    try:
+        with span("researcher.model_call", model=configurable.research_model, message_count=len(messages)):
+            response = await asyncio.wait_for(
+                research_model.ainvoke(messages),
+                timeout=get_research_unit_time_left(state)
+            )
+    except TimeoutError:
+        log_event(logging.INFO, "researcher.deadline_reached", during="model_call")
+        return Command(goto="compress_research")
     
     # Step 4: Update state and proceed to tool execution
+    usage = getattr(response, "usage_metadata", None) or {}
+    tokens_used = usage.get("total_tokens") or (
+        estimate_message_tokens(messages) + estimate_message_tokens([response])
+    )
     return Command(
         goto="researcher_tools",
         update={
             "researcher_messages": [response],
-            "tool_call_iterations": state.get("tool_call_iterations", 0) + 1
+            "tool_call_iterations": state.get("tool_call_iterations", 0) + 1,
+            "tokens_used": state.get("tokens_used", 0) + tokens_used
         }
     )
 
@@ -496,19 +776,24 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
         return Command(goto="compress_research")
     
     # Step 2: Handle other tool calls (search, MCP tools, etc.)
-    tools = await get_all_tools(config)
-    tools_by_name = {
-        tool.name if hasattr(tool, "name") else tool.get("name", "web_search"): tool 
-        for tool in tools
-    }
+    tools_by_name = (await get_research_toolkit(config)).tools_by_name
     
-    # Execute all tool calls in parallel
+    # Execute all tool calls in parallel, cancelling any still running at the unit's deadline
     tool_calls = most_recent_message.tool_calls
     tool_execution_tasks = [
-        execute_tool_safely(tools_by_name[tool_call["name"]], tool_call["args"], config) 
+        asyncio.create_task(execute_tool_safely(tools_by_name[tool_call["name"]], tool_call["args"], config))
         for tool_call in tool_calls
     ]
-    observations = await asyncio.gather(*tool_execution_tasks)
+    unfinished_tasks = set()
+    if tool_execution_tasks:
+        _, unfinished_tasks = await asyncio.wait(tool_execution_tasks, timeout=get_research_unit_time_left(state))
+    for task in unfinished_tasks:
+        task.cancel()
+    observations = [
+        "Error executing tool: Cancelled because the research unit reached its deadline"
+        if task in unfinished_tasks else task.result()
+        for task in tool_execution_tasks
+    ]
     
     # Create tool messages from execution results
     tool_outputs = [
@@ -519,9 +804,18 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
         ) 
         for observation, tool_call in zip(observations, tool_calls)
     ]
+    tool_output_digests = {}
+    if configurable.researcher_context_window > 0:
+        tool_output_digests = {
+            tool_output.tool_call_id: make_tool_output_digest(str(tool_output.content))
+            for tool_output in tool_outputs
+        }
     
     # Step 3: Check late exit conditions (after processing tools)
-    exceeded_iterations = state.get("tool_call_iterations", 0) >= configurable.max_react_tool_calls
+    exceeded_iterations = (
+        state.get("tool_call_iterations", 0) >= configurable.max_react_tool_calls
+        or is_research_unit_budget_exhausted(state, configurable)
+    )
     research_complete_called = any(
         tool_call["name"] == "ResearchComplete" 
         for tool_call in most_recent_message.tool_calls
@@ -537,7 +831,10 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
     # Continue research loop with tool results
     return Command(
         goto="researcher",
-        update={"researcher_messages": tool_outputs}
+        update={
+            "researcher_messages": tool_outputs,
+            "tool_output_digests": tool_output_digests
+        }
     )
 
 async def compress_research(state: ResearcherState, config: RunnableConfig):
@@ -559,60 +856,73 @@ async def compress_research(state: ResearcherState, config: RunnableConfig):
     synthesizer_model = get_configured_chat_model(
         configurable.compression_model,
         configurable.compression_model_max_tokens,
-        get_api_key_for_model(configurable.compression_model, config)
+        get_api_key_for_model(configurable.compression_model, config),
+        priority=LLM_PRIORITY_NORMAL,
+        configurable=configurable
     )
     
     # Step 2: Prepare messages for compression
-    researcher_messages = state.get("researcher_messages", [])
+    original_messages = state.get("researcher_messages", [])
+    compression_prompt = compress_research_system_prompt.format(date=get_today_str())
+    compress_instruction = HumanMessage(content=compress_research_simple_human_message)
+    
+    # Raw notes always come from the full, uncompacted tool and AI messages
+    raw_notes_content = "\n".join([
+        str(message.content) 
+        for message in filter_messages(original_messages, include_types=["tool", "ai"])
+    ])
+    
+    # Step 3: Compact the oldest tool outputs up front so the first call fits the model's budget
+    researcher_messages = list(original_messages)
+    compaction_stats = {}
+    history_token_budget = get_prompt_token_budget(
+        configurable.compression_model,
+        configurable.compression_model_max_tokens,
+        estimate_message_tokens([SystemMessage(content=compression_prompt), compress_instruction])
+    )
+    if history_token_budget is not None:
+        researcher_messages, compaction_stats = compact_messages(researcher_messages, history_token_budget)
+        if compaction_stats["tool_outputs_elided"]:
+            log_event(logging.INFO, "compress.compacted", **compaction_stats)
     
     # Add instruction to switch from research mode to compression mode
-    researcher_messages.append(HumanMessage(content=compress_research_simple_human_message))
+    researcher_messages.append(compress_instruction)
     
-    # Step 3: Attempt compression with retry logic for token limit issues
+    # Step 4: Attempt compression with retry logic for token limit issues
     synthesis_attempts = 0
     max_attempts = 3
     
     while synthesis_attempts < max_attempts:
         try:
             # Create system prompt focused on compression task
-            compression_prompt = compress_research_system_prompt.format(date=get_today_str())
             messages = [SystemMessage(content=compression_prompt)] + researcher_messages
             
             # Execute compression
             response = await synthesizer_model.ainvoke(messages)
             
-            # Extract raw notes from all tool and AI messages
-            raw_notes_content = "\n".join([
-                str(message.content) 
-                for message in filter_messages(researcher_messages, include_types=["tool", "ai"])
-            ])
-            
             # Return successful compression result
             return {
                 "compressed_research": str(response.content),
-                "raw_notes": [raw_notes_content]
+                "raw_notes": [raw_notes_content],
+                "compaction_stats": compaction_stats
             }
             
         except Exception as e:
             synthesis_attempts += 1
             
             # Handle token limit exceeded by removing older messages
-            if is_token_limit_exceeded(e, configurable.research_model):
-                researcher_messages = remove_up_to_last_ai_message(researcher_messages)
+            if is_token_limit_exceeded(e, configurable.compression_model):
+                researcher_messages = remove_up_to_last_ai_message(researcher_messages[:-1]) + [compress_instruction]
                 continue
             
             # For other errors, continue retrying
             continue
     
-    # Step 4: Return error result if all attempts failed
-    raw_notes_content = "\n".join([
-        str(message.content) 
-        for message in filter_messages(researcher_messages, include_types=["tool", "ai"])
-    ])
-    
+    # Step 5: Return error result if all attempts failed
     return {
         "compressed_research": "Error synthesizing research report: Maximum retries exceeded",
-        "raw_notes": [raw_notes_content]
+        "raw_notes": [raw_notes_content],
+        "compaction_stats": compaction_stats
     }
 
 # Researcher Subgraph Construction
@@ -633,7 +943,91 @@ researcher_builder.add_edge(START, "researcher")           # Entry point to rese
 researcher_builder.add_edge("compress_research", END)      # Exit point after compression
 
 # Compile researcher subgraph for parallel execution by supervisor
-researcher_subgraph = researcher_builder.compile()
+# (never checkpointed: several instances run inside one supervisor node, and their
+# results are persisted through the research unit store instead)
+researcher_subgraph = researcher_builder.compile(checkpointer=False)
+
+# Maximum rounds of section drafting before the merge pass in map-reduce report mode
+MAX_REPORT_MAP_DEPTH = 3
+
+# Extra time a research unit gets past its deadline to compress its findings
+RESEARCH_UNIT_COMPRESSION_GRACE_SECONDS = 120
+
+# Initial delay before retrying a research unit after a transient failure (doubles per retry)
+RESEARCH_UNIT_RETRY_BACKOFF_SECONDS = 2
+
+async def draft_report_sections(
+    notes: list[str],
+    note_tokens: list[int],
+    research_brief: str,
+    chat_model,
+    model_name: str,
+    configurable: Configuration,
+) -> list[str]:
+    """Draft report sections from groups of notes in parallel (the map step of map-reduce).
+
+    Args:
+        notes: Research notes in collection order
+        note_tokens: Token estimate of each note
+        research_brief: Research brief the report answers
+        chat_model: Configured final report model
+        model_name: Final report model identifier, used to size the groups
+        configurable: Configuration with the report concurrency settings
+
+    Returns:
+        One section draft per group of notes; a group whose draft fails keeps its notes
+    """
+    # Step 1: Size the groups so every draft call fits, spreading notes across the parallel slots
+    max_concurrency = max(1, configurable.final_report_max_concurrency)
+    fixed_prompt_tokens = estimate_token_count(final_report_section_draft_prompt.format(
+        research_brief=research_brief,
+        findings="",
+        date=get_today_str(),
+        part_index=0,
+        part_count=0
+    ))
+    draft_budget = get_prompt_token_budget(
+        model_name,
+        configurable.final_report_model_max_tokens,
+        fixed_prompt_tokens
+    )
+    cluster_budget = max(MIN_REPORT_CLUSTER_TOKENS, -(-sum(note_tokens) // max_concurrency))
+    if draft_budget is not None:
+        cluster_budget = min(cluster_budget, draft_budget)
+    clusters = cluster_notes(note_tokens, cluster_budget)
+
+    # Step 2: Draft each group's sections; drafts stay off the message stream
+    semaphore = asyncio.Semaphore(max_concurrency)
+    draft_model = chat_model.with_config(tags=[TAG_NOSTREAM])
+
+    async def draft_cluster(part_index: int, cluster: list[int]) -> str:
+        cluster_notes_text = [notes[i] for i in cluster]
+        findings = pack_findings(cluster_notes_text, cluster_budget, [note_tokens[i] for i in cluster])
+        prompt = final_report_section_draft_prompt.format(
+            research_brief=research_brief,
+            findings=findings,
+            date=get_today_str(),
+            part_index=part_index,
+            part_count=len(clusters)
+        )
+        async with semaphore:
+            response = await draft_model.ainvoke([HumanMessage(content=prompt)])
+        return str(response.content)
+
+    results = await asyncio.gather(
+        *[draft_cluster(i + 1, cluster) for i, cluster in enumerate(clusters)],
+        return_exceptions=True
+    )
+
+    # Step 3: Keep the raw notes of any group whose draft failed so no findings are lost
+    drafts = []
+    for cluster, result in zip(clusters, results):
+        if isinstance(result, Exception) or not result:
+            log_event(logging.WARNING, "final_report.section_draft_failed", raw_notes_kept=len(cluster), error=str(result))
+            drafts.extend(notes[i] for i in cluster)
+        else:
+            drafts.append(result)
+    return drafts
 
 async def final_report_generation(state: AgentState, config: RunnableConfig):
     """Generate the final comprehensive research report with retry logic for token limits.
@@ -651,7 +1045,6 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
     # Step 1: Extract research findings and prepare state cleanup
     notes = state.get("notes", [])
     cleared_state = {"notes": {"type": "override", "value": []}}
-    findings = "\n".join(notes)
 
     # Step 2: Configure the final report generation model
     configurable = Configuration.from_runnable_config(config)
@@ -668,8 +1061,7 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
         else:
             final_report_model = "deepseek-reasoner"
 
-        from datetime import datetime
-        print(f"[{datetime.now()}] 🔄 Auto-switching: Detected deepseek-chat as research model, using {final_report_model} for final report")
+        log_event(logging.INFO, "final_report.model_switched", research_model=configurable.research_model, final_report_model=final_report_model)
 
     writer_model_config = {
         "model": final_report_model,
@@ -678,36 +1070,101 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
         "tags": ["langsmith:nostream"]
     }
     
-    # Step 3: Attempt report generation with token limit retry logic
+    # Generate the final report using properly configured model
+    final_report_chat_model = get_configured_chat_model(
+        final_report_model,
+        configurable.final_report_model_max_tokens,
+        get_api_key_for_model(final_report_model, config),
+        priority=LLM_PRIORITY_HIGH,
+        configurable=configurable
+    )
+    
+    # Step 3: Pack findings into the prompt budget up front (whole notes, by priority)
+    research_brief = state.get("research_brief", "")
+    messages_buffer = get_buffer_string(state.get("messages", []))
+    fixed_prompt_tokens = estimate_token_count(final_report_generation_prompt.format(
+        research_brief=research_brief,
+        messages=messages_buffer,
+        findings="",
+        date=get_today_str()
+    ))
+    findings_token_budget = get_prompt_token_budget(
+        final_report_model,
+        configurable.final_report_model_max_tokens,
+        fixed_prompt_tokens
+    )
+    note_tokens = [estimate_token_count(note) for note in notes]
+
+    # Map step: when the notes cannot fit one call, condense them into section drafts first
+    report_mode = FinalReportMode(get_config_value(configurable.final_report_mode))
+    use_map_reduce = len(notes) > 1 and (
+        report_mode == FinalReportMode.MAP_REDUCE
+        or (
+            report_mode == FinalReportMode.AUTO
+            and findings_token_budget is not None
+            and sum(note_tokens) > findings_token_budget
+        )
+    )
+    map_depth = 0
+    while use_map_reduce and map_depth < MAX_REPORT_MAP_DEPTH:
+        map_depth += 1
+        log_event(logging.INFO, "final_report.map_round", round=map_depth, notes=len(notes), estimated_tokens=sum(note_tokens))
+        drafts = await draft_report_sections(
+            notes,
+            note_tokens,
+            research_brief,
+            final_report_chat_model,
+            final_report_model,
+            configurable
+        )
+        draft_tokens = [estimate_token_count(draft) for draft in drafts]
+        condensed = sum(draft_tokens) < sum(note_tokens)
+        notes, note_tokens = drafts, draft_tokens
+        # Repeat the map step over the drafts while they still overflow the merge call and keep shrinking
+        use_map_reduce = (
+            condensed
+            and len(notes) > 1
+            and findings_token_budget is not None
+            and sum(note_tokens) > findings_token_budget
+        )
+
+    if findings_token_budget is None:
+        findings = "\n".join(notes)
+    else:
+        findings = pack_findings(notes, findings_token_budget, note_tokens)
+        if sum(note_tokens) > findings_token_budget:
+            log_event(logging.INFO, "final_report.findings_packed", estimated_tokens=sum(note_tokens), token_budget=findings_token_budget)
+    
+    # Step 4: Attempt report generation, repacking if the estimate was too optimistic
     max_retries = 3
     current_retry = 0
-    findings_token_limit = None
     
     while current_retry <= max_retries:
         try:
             # Create comprehensive prompt with all research context
             final_report_prompt = final_report_generation_prompt.format(
-                research_brief=state.get("research_brief", ""),
-                messages=get_buffer_string(state.get("messages", [])),
+                research_brief=research_brief,
+                messages=messages_buffer,
                 findings=findings,
                 date=get_today_str()
             )
             
-            # Generate the final report using properly configured model
-            from datetime import datetime
-            print(f"[{datetime.now()}] 📝 Final Report: Configured max_tokens = {configurable.final_report_model_max_tokens}")
-
-            final_report_chat_model = get_configured_chat_model(
-                final_report_model,
-                configurable.final_report_model_max_tokens,
-                get_api_key_for_model(final_report_model, config)
-            )
-
-            print(f"[{datetime.now()}] 📝 Final Report: Calling model {final_report_model}...")
-            final_report = await final_report_chat_model.ainvoke([
-                HumanMessage(content=final_report_prompt)
-            ])
-            print(f"[{datetime.now()}] 📝 Final Report: Generated {len(final_report.content)} characters")
+            with span("final_report.model_call", logging.INFO, model=final_report_model, attempt=current_retry) as report_span:
+                if configurable.stream_final_report:
+                    # Stream tokens so callers using stream_mode="messages" see the report as it is written
+                    final_report_chunk = None
+                    async for chunk in final_report_chat_model.astream([
+                        HumanMessage(content=final_report_prompt)
+                    ]):
+                        final_report_chunk = chunk if final_report_chunk is None else final_report_chunk + chunk
+                    if final_report_chunk is None:
+                        raise ValueError("Final report model returned an empty stream")
+                    final_report = message_chunk_to_message(final_report_chunk)
+                else:
+                    final_report = await final_report_chat_model.ainvoke([
+                        HumanMessage(content=final_report_prompt)
+                    ])
+                report_span["characters"] = len(final_report.content)
             
             # Return successful report generation
             return {
@@ -717,27 +1174,20 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
             }
             
         except Exception as e:
-            # Handle token limit exceeded errors with progressive truncation
+            # Handle token limit exceeded errors by repacking whole notes into a smaller budget
             if is_token_limit_exceeded(e, final_report_model):
                 current_retry += 1
 
-                if current_retry == 1:
-                    # First retry: determine initial truncation limit
-                    model_token_limit = get_model_token_limit(final_report_model)
-                    if not model_token_limit:
-                        return {
-                            "final_report": f"Error generating final report: Token limit exceeded, however, we could not determine the model's maximum context length. Please update the model map in deep_researcher/utils.py with this information. {e}",
-                            "messages": [AIMessage(content="Report generation failed due to token limits")],
-                            **cleared_state
-                        }
-                    # Use 4x token limit as character approximation for truncation
-                    findings_token_limit = model_token_limit * 4
-                else:
-                    # Subsequent retries: reduce by 10% each time
-                    findings_token_limit = int(findings_token_limit * 0.9)
+                if findings_token_budget is None:
+                    return {
+                        "final_report": f"Error generating final report: Token limit exceeded, however, we could not determine the model's maximum context length. Please update the model map in deep_researcher/utils.py with this information. {e}",
+                        "messages": [AIMessage(content="Report generation failed due to token limits")],
+                        **cleared_state
+                    }
                 
-                # Truncate findings and retry
-                findings = findings[:findings_token_limit]
+                # The token estimate was too optimistic for this model - shrink by 20% and repack
+                findings_token_budget = int(min(findings_token_budget, sum(note_tokens)) * 0.8)
+                findings = pack_findings(notes, findings_token_budget, note_tokens)
                 continue
             else:
                 # Non-token-limit error: return error immediately
@@ -747,7 +1197,7 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
                     **cleared_state
                 }
     
-    # Step 4: Return failure result if all retries exhausted
+    # Step 5: Return failure result if all retries exhausted
     return {
         "final_report": "Error generating final report: Maximum retries exceeded",
         "messages": [AIMessage(content="Report generation failed after maximum retries")],
@@ -765,7 +1215,7 @@ deep_researcher_builder = StateGraph(
 # Add main workflow nodes for the complete research process
 deep_researcher_builder.add_node("clarify_with_user", clarify_with_user)           # User clarification phase
 deep_researcher_builder.add_node("write_research_brief", write_research_brief)     # Research planning phase
-deep_researcher_builder.add_node("research_supervisor", supervisor_subgraph)       # Research execution phase
+deep_researcher_builder.add_node("research_supervisor", research_supervisor)       # Research execution phase
 deep_researcher_builder.add_node("final_report_generation", final_report_generation)  # Report generation phase
 
 # Define main workflow edges for sequential execution
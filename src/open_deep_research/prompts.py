@@ -108,7 +108,7 @@ lead_researcher_prompt = """您是一个研究主管。您的工作是通过调
 - **当您可以自信地回答时停止** - 不要为了完美而继续委托研究
 - **限制工具调用** - 如果找不到合适的信息源，在{max_researcher_iterations}次调用ConductResearch和think_tool后总是停止
 
-**每次迭代最多{max_concurrent_research_units}个并行代理**
+**每次迭代最多同时运行{max_concurrent_research_units}个并行代理** - 超出的研究主题会排队等待执行，但每个主题都会增加耗时，请只委托必要的主题
 </硬限制>
 
 <展示您的思考>
@@ -331,6 +331,28 @@ final_report_generation_prompt = """基于所有进行的研究，创建一个
 """
 
 
+final_report_section_draft_prompt = """您正在协助撰写一份大型研究报告。全部研究发现过多，无法一次写入单个报告，因此被分成了{part_count}组，您负责其中第{part_index}组。
+<研究简报>
+{research_brief}
+</研究简报>
+
+今天的日期是 {date}。
+
+以下是分配给您的研究发现：
+<发现>
+{findings}
+</发现>
+
+请仅基于这些发现撰写报告章节草稿，之后会有单独的步骤将所有草稿合并为最终报告：
+1. 按主题将内容组织为若干章节，每个章节使用 ## 作为标题
+2. 保留所有具体事实、数据、统计、案例和详细解释，不要概括或省略细节
+3. 在正文中使用[标题](URL)格式内联引用信息源，保留完整URL，不要为信息源编号（编号将在合并时统一分配）
+4. 不要写引言、结论或"信息源"列表 —— 这些将在合并时完成
+5. 不要提及"本组"、"草稿"或自己的写作过程，只输出章节内容
+6. 使用与研究简报相同的语言撰写
+"""
+
+
 summarize_webpage_prompt = """You are tasked with summarizing the raw content of a webpage retrieved from a web search. Your goal is to create a summary that preserves the most important information from the original web page. This summary will be used by a downstream research agent, so it's crucial to maintain the key details without losing essential information.
 
 Here is the raw content of the webpage:
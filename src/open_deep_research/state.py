@@ -59,6 +59,10 @@ def override_reducer(current_value, new_value):
     else:
         return operator.add(current_value, new_value)
     
+def merge_reducer(current_value, new_value):
+    """Reducer function that merges dictionary updates into the current value."""
+    return {**(current_value or {}), **new_value}
+    
 class AgentInputState(MessagesState):
     """InputState is only 'messages'."""
 
@@ -88,9 +92,14 @@ class ResearcherState(TypedDict):
     research_topic: str
     compressed_research: str
     raw_notes: Annotated[list[str], override_reducer] = []
+    compaction_stats: dict = {}
+    tool_output_digests: Annotated[dict[str, str], merge_reducer] = {}
+    deadline: Optional[float] = None
+    tokens_used: int = 0
 
 class ResearcherOutputState(BaseModel):
     """Output state from individual researchers."""
     
     compressed_research: str
-    raw_notes: Annotated[list[str], override_reducer] = []
\ No newline at end of file
+    raw_notes: Annotated[list[str], override_reducer] = []
+    compaction_stats: dict = {}
\ No newline at end of file
@@ -1,22 +1,49 @@
 """Utility functions and helpers for the Deep Research agent."""
 
 import asyncio
+import atexit
+import fnmatch
+import hashlib
+import heapq
+import inspect
+import itertools
+import json
 import logging
+import math
+import mmap
 import os
+import queue
+import re
+import shutil
+import sqlite3
+import threading
+import time
 import warnings
-from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 from typing import Annotated, Any, Dict, List, Literal, Optional
+from uuid import UUID
 
 import aiohttp
+import httpx
 from langchain.chat_models import init_chat_model
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import (
     AIMessage,
+    BaseMessage,
     HumanMessage,
     MessageLikeRepresentation,
+    ToolMessage,
     filter_messages,
 )
+from langchain_core.outputs import LLMResult
 from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import var_child_runnable_config
 from langchain_core.tools import (
     BaseTool,
     InjectedToolArg,
@@ -25,14 +52,498 @@ from langchain_core.tools import (
     tool,
 )
 from langchain_mcp_adapters.client import MultiServerMCPClient
-from langgraph.config import get_store
+from langgraph.config import get_store, get_stream_writer
 from mcp import McpError
+from mcp.types import CONNECTION_CLOSED
 from tavily import AsyncTavilyClient
 
 from open_deep_research.configuration import Configuration, SearchAPI
 from open_deep_research.prompts import summarize_webpage_prompt
 from open_deep_research.state import ResearchComplete, Summary
 
+##########################
+# Event Log Utils
+##########################
+
+# Structured event log for the agent's hot paths. As a library the package only logs to
+# the "open_deep_research" logger and leaves handlers to the host application;
+# configure_event_log() installs a dedicated handler fed through a QueueHandler, so emitting
+# an event is a queue put on the event loop and a QueueListener thread does the I/O.
+event_logger = logging.getLogger("open_deep_research")
+EVENT_LOG_LEVEL_ENV = "ODR_LOG_LEVEL"
+EVENT_LOG_FORMAT_ENV = "ODR_LOG_FORMAT"
+_event_log_listener: Optional[QueueListener] = None
+
+class JsonEventFormatter(logging.Formatter):
+    """Format event records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render the event name, level, timestamp and structured fields as JSON."""
+        event = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+class TextEventFormatter(logging.Formatter):
+    """Format event records as a readable line with key=value fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render the timestamp, level, event name and fields."""
+        fields = " ".join(f"{key}={value}" for key, value in getattr(record, "fields", {}).items())
+        line = f"[{datetime.fromtimestamp(record.created)}] {record.levelname:<7} {record.getMessage()}"
+        if fields:
+            line = f"{line} {fields}"
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
+
+def configure_event_log(level: Optional[str] = None, log_format: Optional[str] = None, stream=None):
+    """Set up (or reconfigure) a dedicated, non-blocking handler for the event log.
+
+    Meant for entry points such as the CLI. Events then stop propagating to the root
+    logger, so applications that configure logging themselves should not call this.
+
+    Args:
+        level: Log level name; defaults to the ODR_LOG_LEVEL environment variable, else WARNING
+        log_format: "text" or "json"; defaults to ODR_LOG_FORMAT, else text
+        stream: Output stream for the listener thread (defaults to stderr)
+    """
+    global _event_log_listener
+    level = (level or os.getenv(EVENT_LOG_LEVEL_ENV) or "WARNING").upper()
+    log_format = (log_format or os.getenv(EVENT_LOG_FORMAT_ENV) or "text").lower()
+
+    stop_event_log()
+    output_handler = logging.StreamHandler(stream)
+    output_handler.setFormatter(JsonEventFormatter() if log_format == "json" else TextEventFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    event_logger.handlers = [QueueHandler(log_queue)]
+    event_logger.propagate = False
+    event_logger.setLevel(level)
+    _event_log_listener = QueueListener(log_queue, output_handler)
+    _event_log_listener.start()
+
+def set_event_log_level(level: str):
+    """Change the event log level at runtime (e.g. "DEBUG" to see per-call spans)."""
+    event_logger.setLevel(level.upper())
+
+def stop_event_log():
+    """Flush and stop the listener thread, if running."""
+    global _event_log_listener
+    if _event_log_listener is not None:
+        _event_log_listener.stop()
+        _event_log_listener = None
+
+def log_event(level: int, event: str, **fields: Any):
+    """Emit a structured event if its level is enabled.
+
+    Args:
+        level: logging level (logging.DEBUG, logging.INFO, ...)
+        event: Dotted event name, e.g. "mcp_pool.acquire"
+        **fields: Structured fields attached to the event
+    """
+    if event_logger.isEnabledFor(level):
+        event_logger.log(level, event, extra={"fields": fields})
+
+@contextmanager
+def span(event: str, level: int = logging.DEBUG, **fields: Any):
+    """Time a block and emit one event with its duration and outcome when it ends.
+
+    The yielded dict can be filled with fields known only inside the block.
+
+    Args:
+        event: Dotted event name of the span
+        level: Level the span is emitted at
+        **fields: Structured fields attached to the event
+    """
+    start_time = time.perf_counter()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException as e:
+        status = f"error:{type(e).__name__}"
+        raise
+    finally:
+        if event_logger.isEnabledFor(level):
+            fields["duration_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+            fields["status"] = status
+            event_logger.log(level, event, extra={"fields": fields})
+
+atexit.register(stop_event_log)
+
+##########################
+# Trace Utils
+##########################
+
+# Optional OpenTelemetry-shaped spans for graph nodes, LLM calls, tool calls and pool waits.
+# Tracing is off (every hook is a no-op) until configure_tracing() installs exporters.
+_tracer: Optional["Tracer"] = None
+_current_span: ContextVar[Optional["TraceSpan"]] = ContextVar("open_deep_research_current_span", default=None)
+
+class TraceSpan:
+    """One timed operation, following the OpenTelemetry span data model."""
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], kind: str, attributes: dict):
+        """Start a span now.
+
+        Args:
+            name: Span name, e.g. "node.researcher" or "chat deepseek-chat"
+            trace_id: 32 hex character trace id shared by the whole run
+            parent_span_id: Span id of the parent, None for a root span
+            kind: OpenTelemetry span kind name (INTERNAL, CLIENT, ...)
+            attributes: Initial span attributes
+        """
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: Optional[int] = None
+        self.status_code = "UNSET"
+        self.status_message = ""
+
+    def end(self, error: Optional[BaseException] = None):
+        """Stop the clock and record the outcome."""
+        self.end_time_unix_nano = time.time_ns()
+        if error is None:
+            self.status_code = "OK"
+        else:
+            self.status_code = "ERROR"
+            self.status_message = f"{type(error).__name__}: {error}"[:500]
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Span duration in milliseconds, once ended."""
+        if self.end_time_unix_nano is None:
+            return None
+        return round((self.end_time_unix_nano - self.start_time_unix_nano) / 1e6, 3)
+
+    def to_dict(self) -> dict:
+        """Serialize the span (field names follow OTLP JSON)."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "duration_ms": self.duration_ms,
+            "status": {"code": self.status_code, "message": self.status_message},
+            "attributes": self.attributes,
+        }
+
+class InMemorySpanExporter:
+    """Keep finished spans in a list (tests, notebooks, post-run analysis)."""
+
+    def __init__(self):
+        """Initialize an empty exporter."""
+        self.spans: list[TraceSpan] = []
+
+    def on_start(self, span: TraceSpan):
+        """Spans are only collected once finished."""
+
+    def on_end(self, span: TraceSpan):
+        """Collect a finished span."""
+        self.spans.append(span)
+
+    def shutdown(self):
+        """Nothing to release."""
+
+class JsonlSpanExporter:
+    """Append finished spans to a JSON Lines file for offline analysis.
+
+    Writes go to the file's buffer and reach disk in blocks, so exporting
+    does not add a disk write to every traced call.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the span file.
+
+        Args:
+            path: File the spans are appended to, one JSON object per line
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def on_start(self, span: TraceSpan):
+        """Spans are only written once finished."""
+
+    def on_end(self, span: TraceSpan):
+        """Write a finished span."""
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+    def shutdown(self):
+        """Flush and close the span file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+class OpenTelemetrySpanExporter:
+    """Mirror spans into OpenTelemetry, so any configured OTLP or console exporter receives them.
+
+    Needs the opentelemetry-api package (plus an SDK tracer provider to actually export).
+    """
+
+    def __init__(self, tracer_provider=None):
+        """Bind to an OpenTelemetry tracer provider.
+
+        Args:
+            tracer_provider: Tracer provider to use; defaults to the globally registered one
+
+        Raises:
+            ImportError: If opentelemetry is not installed
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry export requires the opentelemetry-api and opentelemetry-sdk packages"
+            ) from e
+        self._trace = trace
+        self._tracer = trace.get_tracer("open_deep_research", tracer_provider=tracer_provider)
+        self._spans: dict = {}
+
+    def on_start(self, span: TraceSpan):
+        """Start the matching OpenTelemetry span under its parent's, with the same start time."""
+        parent = self._spans.get(span.parent_span_id)
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        kind = getattr(self._trace.SpanKind, span.kind, self._trace.SpanKind.INTERNAL)
+        self._spans[span.span_id] = self._tracer.start_span(
+            span.name, context=context, kind=kind, start_time=span.start_time_unix_nano
+        )
+
+    def on_end(self, span: TraceSpan):
+        """Copy attributes and status onto the OpenTelemetry span and end it."""
+        otel_span = self._spans.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes({
+            key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in span.attributes.items()
+        })
+        if span.status_code == "ERROR":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.status_message))
+        otel_span.end(end_time=span.end_time_unix_nano)
+
+    def shutdown(self):
+        """Spans are flushed by the OpenTelemetry tracer provider."""
+
+class Tracer:
+    """Create spans and hand them to the exporters.
+
+    The tracer also remembers, for every LangChain run it has seen, the nearest
+    enclosing span, so spans opened inside tools and nodes find their parent.
+    """
+
+    def __init__(self, exporters: list):
+        """Initialize the tracer.
+
+        Args:
+            exporters: Objects with on_start(span), on_end(span) and shutdown()
+        """
+        self.exporters = list(exporters)
+        self.run_spans: dict[UUID, TraceSpan] = {}
+        self.callback_handler = TracingCallbackHandler(self)
+
+    def start_span(self, name: str, kind: str = "INTERNAL", parent: Optional[TraceSpan] = None, attributes: Optional[dict] = None) -> TraceSpan:
+        """Start a span, as a child of parent or as the root of a new trace."""
+        span = TraceSpan(
+            name,
+            parent.trace_id if parent is not None else os.urandom(16).hex(),
+            parent.span_id if parent is not None else None,
+            kind,
+            attributes or {}
+        )
+        self._export("on_start", span)
+        return span
+
+    def end_span(self, span: TraceSpan, error: Optional[BaseException] = None):
+        """End a span and export it."""
+        span.end(error)
+        self._export("on_end", span)
+
+    def _export(self, method: str, span: TraceSpan):
+        """Pass a span to every exporter; a failing exporter never fails the traced call."""
+        for exporter in self.exporters:
+            try:
+                getattr(exporter, method)(span)
+            except Exception as e:
+                log_event(logging.WARNING, "trace.export_failed", exporter=type(exporter).__name__, error=str(e))
+
+    def resolve_parent(self, parent_run_id: Optional[UUID]) -> Optional[TraceSpan]:
+        """Find the innermost open span for the current point of execution.
+
+        Both the span of the enclosing LangChain run and the span set by trace_span()
+        enclose the caller; the one started last is the innermost.
+        """
+        run_span = self.run_spans.get(parent_run_id) if parent_run_id is not None else None
+        context_span = _current_span.get()
+        if run_span is None or context_span is None:
+            return run_span or context_span
+        return max(run_span, context_span, key=lambda span: span.start_time_unix_nano)
+
+    def shutdown(self):
+        """Flush and release every exporter."""
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+class TracingCallbackHandler(AsyncCallbackHandler):
+    """Callback handler that opens spans for graph nodes, LLM calls and tool calls.
+
+    Installed by configure_tracing() as Tracer.callback_handler; pass it in the
+    run config's callbacks. Spans carry the research_unit_id and research_topic
+    metadata set by the supervisor, so a slow research unit stands out.
+    """
+
+    run_inline = True
+
+    def __init__(self, tracer: Tracer):
+        """Initialize the handler for a tracer."""
+        self.tracer = tracer
+        self._spans: dict[UUID, TraceSpan] = {}
+
+    def _start(self, name: str, kind: str, run_id: UUID, parent_run_id: Optional[UUID], metadata: Optional[dict], attributes: dict):
+        """Open the span of a run."""
+        metadata = metadata or {}
+        span = self.tracer.start_span(name, kind, self.tracer.resolve_parent(parent_run_id), {
+            **attributes,
+            "langgraph.step": metadata.get("langgraph_step"),
+            "research_unit.id": metadata.get("research_unit_id"),
+            "research_unit.topic": metadata.get("research_topic"),
+        })
+        self._spans[run_id] = span
+        self.tracer.run_spans[run_id] = span
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, attributes: Optional[dict] = None):
+        """Close the span of a run, if it has one."""
+        self.tracer.run_spans.pop(run_id, None)
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.attributes.update({key: value for key, value in (attributes or {}).items() if value is not None})
+            self.tracer.end_span(span, error)
+
+    async def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs: Any):
+        """Open a span for a graph node (the chain named after its own node); other chains inherit their parent's."""
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node and not node.startswith("__"):
+            self._start(f"node.{node}", "INTERNAL", run_id, parent_run_id, metadata, {"langgraph.node": node})
+        else:
+            parent = self.tracer.resolve_parent(parent_run_id)
+            if parent is not None:
+                self.tracer.run_spans[run_id] = parent
+
+    async def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any):
+        """Close a node span."""
+        self._end(run_id)
+
+    async def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Close a failed node span."""
+        self._end(run_id, error)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs: Any):
+        """Open a span for an LLM call."""
+        model = (metadata or {}).get("ls_model_name") or "unknown"
+        self._start(f"chat {model}", "CLIENT", run_id, parent_run_id, metadata, {
+            "gen_ai.operation.name": "chat",
+            "gen_ai.request.model": model,
+            "gen_ai.system": (metadata or {}).get("ls_provider"),
+        })
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        """Close an LLM call span with its token usage."""
+        input_tokens, output_tokens = get_llm_result_usage(response)
+        self._end(run_id, attributes={
+            "gen_ai.usage.input_tokens": input_tokens,
+            "gen_ai.usage.output_tokens": output_tokens,
+            "gen_ai.usage.total_tokens": (input_tokens + output_tokens) or get_llm_result_token_usage(response),
+        })
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Close a failed LLM call span."""
+        self._end(run_id, error)
+
+    async def on_tool_start(self, serialized, input_str, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs: Any):
+        """Open a span for a tool call."""
+        tool_name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(f"execute_tool {tool_name}", "INTERNAL", run_id, parent_run_id, metadata, {"gen_ai.tool.name": tool_name})
+
+    async def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any):
+        """Close a tool call span."""
+        self._end(run_id)
+
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Close a failed tool call span."""
+        self._end(run_id, error)
+
+def configure_tracing(exporters: list) -> "Tracer":
+    """Turn tracing on with the given exporters (replacing any previous tracer).
+
+    Args:
+        exporters: e.g. [JsonlSpanExporter("trace.jsonl")] or [OpenTelemetrySpanExporter()]
+
+    Returns:
+        The tracer; add tracer.callback_handler to the run config's callbacks
+    """
+    global _tracer
+    shutdown_tracing()
+    _tracer = Tracer(exporters)
+    return _tracer
+
+def get_tracer() -> Optional["Tracer"]:
+    """Get the active tracer, or None if tracing is off."""
+    return _tracer
+
+def shutdown_tracing():
+    """Turn tracing off and flush the exporters."""
+    global _tracer
+    if _tracer is not None:
+        tracer, _tracer = _tracer, None
+        tracer.shutdown()
+
+@contextmanager
+def trace_span(name: str, kind: str = "INTERNAL", **attributes: Any):
+    """Trace a block as a span; a no-op when tracing is off.
+
+    The span's parent is the innermost enclosing trace_span() or traced
+    LangChain run (node, tool call), so spans opened inside a tool nest under it.
+    The yielded dict can be filled with attributes known only inside the block.
+
+    Args:
+        name: Span name
+        kind: OpenTelemetry span kind name
+        **attributes: Span attributes
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield {}
+        return
+    child_config = var_child_runnable_config.get() or {}
+    parent_run_id = getattr(child_config.get("callbacks"), "parent_run_id", None)
+    span = tracer.start_span(name, kind, tracer.resolve_parent(parent_run_id), attributes)
+    token = _current_span.set(span)
+    error = None
+    try:
+        yield span.attributes
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(span, error)
+
+atexit.register(shutdown_tracing)
+
 ##########################
 # Model Configuration Utils
 ##########################
@@ -55,47 +566,454 @@ def supports_structured_output(model_name: str) -> bool:
     # Default to False for unknown models to be safe
     return False
 
-def get_configured_chat_model_with_structured_output(model_name: str, max_tokens: int, api_key: str, output_schema=None, with_retry_attempts: int = 3):
+def get_configured_chat_model_with_structured_output(
+    model_name: str,
+    max_tokens: int,
+    api_key: str,
+    output_schema=None,
+    with_retry_attempts: int = 3,
+    priority: Optional[int] = None,
+    configurable: Optional[Configuration] = None
+):
     """Get a chat model with structured output support, with fallback for unsupported models."""
-    base_model = get_configured_chat_model(model_name, max_tokens, api_key)
-
-    if output_schema and supports_structured_output(model_name):
-        # Model supports structured output
-        return base_model.with_structured_output(output_schema).with_retry(stop_after_attempt=with_retry_attempts)
-    elif output_schema:
-        # Model doesn't support structured output, use text output with JSON parsing
-        from langchain_core.output_parsers import PydanticOutputParser
-        parser = PydanticOutputParser(pydantic_object=output_schema)
-        return (base_model | parser).with_retry(stop_after_attempt=with_retry_attempts)
-    else:
-        # No structured output needed
-        return base_model.with_retry(stop_after_attempt=with_retry_attempts)
+    base_model = get_configured_chat_model(model_name, max_tokens, api_key, priority, configurable)
+    cache_key = ("structured_output", id(base_model), output_schema, with_retry_attempts)
+
+    def build_structured_model():
+        if output_schema and supports_structured_output(model_name):
+            # Model supports structured output
+            return base_model.with_structured_output(output_schema).with_retry(stop_after_attempt=with_retry_attempts)
+        elif output_schema:
+            # Model doesn't support structured output, use text output with JSON parsing
+            from langchain_core.output_parsers import PydanticOutputParser
+            parser = PydanticOutputParser(pydantic_object=output_schema)
+            return (base_model | parser).with_retry(stop_after_attempt=with_retry_attempts)
+        else:
+            # No structured output needed
+            return base_model.with_retry(stop_after_attempt=with_retry_attempts)
+
+    return _get_or_create_cached_model(cache_key, build_structured_model, pinned=(base_model,))
+
+def get_configured_chat_model_with_tools(
+    model_name: str,
+    max_tokens: int,
+    api_key: str,
+    tools: list,
+    with_retry_attempts: int = 3,
+    priority: Optional[int] = None,
+    configurable: Optional[Configuration] = None
+):
+    """Get a chat model bound to a list of tools, with retry logic.
+
+    The bound model is memoized on the base model and the identity of the tool
+    objects, so callers that reuse the same tool list get the same runnable back.
+    """
+    base_model = get_configured_chat_model(model_name, max_tokens, api_key, priority, configurable)
+    cache_key = ("tools", id(base_model), tuple(id(tool) for tool in tools), with_retry_attempts)
+
+    def build_tool_model():
+        return base_model.bind_tools(tools).with_retry(stop_after_attempt=with_retry_attempts)
+
+    # Pin the tools so their ids cannot be reused by other objects while cached
+    return _get_or_create_cached_model(cache_key, build_tool_model, pinned=(base_model, tuple(tools)))
+
+def get_configured_chat_model(
+    model_name: str,
+    max_tokens: int,
+    api_key: str,
+    priority: Optional[int] = None,
+    configurable: Optional[Configuration] = None
+):
+    """Get a properly configured chat model with special handling for Qwen and DeepSeek.
+
+    Models are memoized on (model, max_tokens, API key hash, base_url, rate limiter,
+    priority), so repeated node invocations reuse one client and its HTTP pool.
+    When the configuration sets LLM rate limits, the model is attached to the shared
+    limiter of its provider endpoint and admitted according to ``priority``.
+    """
+    limiter = get_llm_rate_limiter(model_name, configurable) if configurable else None
+    if limiter is not None:
+        priority = LLM_PRIORITY_NORMAL if priority is None else priority
+    model_config = get_model_config(model_name) if model_name.lower().startswith(("qwen-", "deepseek-")) else {}
+
+    cache_key = (
+        "model",
+        model_name,
+        max_tokens,
+        hashlib.sha256((api_key or "").encode("utf-8")).hexdigest(),
+        model_config.get("base_url"),
+        id(limiter) if limiter is not None else None,
+        priority if limiter is not None else None,
+    )
+    return _get_or_create_cached_model(
+        cache_key,
+        lambda: _init_configured_chat_model(model_name, max_tokens, api_key, model_config, limiter, priority),
+        pinned=(limiter,)
+    )
 
-def get_configured_chat_model(model_name: str, max_tokens: int, api_key: str):
-    """Get a properly configured chat model with special handling for Qwen and DeepSeek."""
+def _init_configured_chat_model(
+    model_name: str,
+    max_tokens: int,
+    api_key: str,
+    model_config: dict,
+    limiter: Optional["LLMRateLimiter"],
+    priority: Optional[int]
+):
+    """Construct a chat model (uncached)."""
+    model_kwargs = {}
+    if limiter is not None:
+        model_kwargs["callbacks"] = [LLMRateLimitCallbackHandler(limiter, priority)]
 
     # Handle special model configurations (Qwen and DeepSeek)
-    if model_name.lower().startswith(("qwen-", "deepseek-")):
-        model_config = get_model_config(model_name)
-        if model_config:
-            # 明确指定模型提供者
-            model_provider = "openai"
-            return init_chat_model(
-                model=model_config["model"],
-                model_provider=model_provider,
-                max_tokens=max_tokens,
-                api_key=api_key,
-                base_url=model_config["base_url"],
-                **model_config.get("model_kwargs", {})
-            )
+    if model_config:
+        # 明确指定模型提供者
+        model_provider = "openai"
+        return init_chat_model(
+            model=model_config["model"],
+            model_provider=model_provider,
+            max_tokens=max_tokens,
+            api_key=api_key,
+            base_url=model_config["base_url"],
+            **model_config.get("model_kwargs", {}),
+            **model_kwargs
+        )
 
     # Default model initialization
     return init_chat_model(
         model=model_name,
         max_tokens=max_tokens,
         api_key=api_key,
+        **model_kwargs
     )
 
+# Memoized chat models and their tool/structured-output wrappers (LRU)
+CHAT_MODEL_CACHE_SIZE = 64
+_chat_model_cache: OrderedDict = OrderedDict()
+
+def _get_or_create_cached_model(cache_key: tuple, factory, pinned: tuple = ()):
+    """Return the cached runnable for a key, building it with factory() on a miss.
+
+    Args:
+        cache_key: Hashable identity of the runnable
+        factory: Zero-argument callable that builds the runnable
+        pinned: Objects whose ids appear in the key and must stay alive while cached
+    """
+    entry = _chat_model_cache.get(cache_key)
+    if entry is not None:
+        _chat_model_cache.move_to_end(cache_key)
+        return entry[0]
+
+    runnable = factory()
+    _chat_model_cache[cache_key] = (runnable, pinned)
+    while len(_chat_model_cache) > CHAT_MODEL_CACHE_SIZE:
+        _chat_model_cache.popitem(last=False)
+    return runnable
+
+##########################
+# LLM Rate Limiting Utils
+##########################
+
+# Lower value = admitted first when calls queue up on the same endpoint
+LLM_PRIORITY_HIGH = 0    # clarify, research brief, supervisor, final report
+LLM_PRIORITY_NORMAL = 1  # researcher and compression calls
+LLM_PRIORITY_LOW = 2     # webpage summarization
+
+LLM_RATE_LIMIT_BURST_SECONDS = 10.0  # Bucket capacity, expressed in seconds of budget
+LLM_RATE_LIMIT_BACKOFF_SECONDS = 10.0  # Pause after a 429 without a Retry-After header
+
+_CJK_CHAR_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+
+def estimate_token_count(text: str) -> int:
+    """Cheaply estimate the number of tokens in a piece of text.
+
+    CJK characters are counted as one token each and everything else as four
+    characters per token, which is close enough for budgeting across providers.
+    """
+    if not text:
+        return 0
+    cjk_chars = len(_CJK_CHAR_PATTERN.findall(text))
+    return cjk_chars + (len(text) - cjk_chars + 3) // 4
+
+def estimate_message_tokens(messages: list[BaseMessage]) -> int:
+    """Estimate the prompt tokens of a list of messages."""
+    return sum(estimate_token_count(str(message.content)) + 4 for message in messages)
+
+def get_llm_result_usage(response: LLMResult) -> tuple[int, int]:
+    """Sum the input and output tokens the provider reported on an LLM result's messages."""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+    return input_tokens, output_tokens
+
+def get_llm_result_token_usage(response: LLMResult) -> Optional[int]:
+    """Extract total token usage from an LLM result, if the provider reported it."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage and usage.get("total_tokens"):
+                return usage["total_tokens"]
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return token_usage.get("total_tokens")
+
+def get_model_endpoint_key(model_name: str) -> str:
+    """Identify the provider endpoint a model talks to (base_url, or provider prefix)."""
+    model_config = get_model_config(model_name)
+    if model_config:
+        return model_config["base_url"]
+    return model_name.split(":", 1)[0].lower() if ":" in model_name else model_name.lower()
+
+class LLMRateLimiter:
+    """Token-bucket rate limiter and priority concurrency governor for one endpoint.
+
+    Every LLM call to the endpoint must be admitted before it is sent:
+    - A request bucket refilled at requests_per_minute
+    - A token bucket refilled at tokens_per_minute (charged with an estimate up
+      front, reconciled with the real usage when the call finishes)
+    - At most max_concurrency calls in flight
+    Waiting calls are admitted strictly by (priority, arrival order), so supervisor
+    and final report calls overtake queued summarization calls.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget, None for unlimited
+            tokens_per_minute: Token budget, None for unlimited
+            max_concurrency: Maximum in-flight calls, None for unlimited
+        """
+        self.active = 0
+        self._waiters: list = []  # Heap of [priority, sequence, future, tokens]
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._blocked_until = 0.0
+        self._last_refill = time.monotonic()
+        self.configure(requests_per_minute, tokens_per_minute, max_concurrency)
+        self._request_allowance = self._request_capacity
+        self._token_allowance = self._token_capacity
+
+    def configure(
+        self,
+        requests_per_minute: Optional[int],
+        tokens_per_minute: Optional[int],
+        max_concurrency: Optional[int]
+    ):
+        """Update the budgets (takes effect for calls admitted from now on)."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self._request_rate = requests_per_minute / 60.0 if requests_per_minute else None
+        self._token_rate = tokens_per_minute / 60.0 if tokens_per_minute else None
+        self._request_capacity = max(1.0, self._request_rate * LLM_RATE_LIMIT_BURST_SECONDS) if self._request_rate else 0.0
+        self._token_capacity = self._token_rate * LLM_RATE_LIMIT_BURST_SECONDS if self._token_rate else 0.0
+
+    def _refill(self):
+        """Refill both buckets for the time elapsed since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self._request_rate:
+            self._request_allowance = min(self._request_capacity, self._request_allowance + elapsed * self._request_rate)
+        if self._token_rate:
+            self._token_allowance = min(self._token_capacity, self._token_allowance + elapsed * self._token_rate)
+
+    def _reserve(self, tokens: int) -> float:
+        """Try to take budget for one call; return 0 on success or the seconds to wait."""
+        delay = max(0.0, self._blocked_until - time.monotonic())
+        needed_tokens = min(tokens, self._token_capacity)
+        if self._request_rate and self._request_allowance < 1.0:
+            delay = max(delay, (1.0 - self._request_allowance) / self._request_rate)
+        if self._token_rate and self._token_allowance < needed_tokens:
+            delay = max(delay, (needed_tokens - self._token_allowance) / self._token_rate)
+        if delay > 0:
+            return delay
+
+        if self._request_rate:
+            self._request_allowance -= 1.0
+        if self._token_rate:
+            self._token_allowance -= needed_tokens
+        return 0.0
+
+    def _dispatch(self):
+        """Admit queued calls in priority order while budget and concurrency allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+
+        while self._waiters:
+            if self.max_concurrency and self.active >= self.max_concurrency:
+                return
+            _, _, future, tokens = self._waiters[0]
+            if future.done():
+                # Waiter was cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            delay = self._reserve(tokens)
+            if delay > 0:
+                # Head of the queue waits for its budget; lower priorities wait behind it
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self.active += 1
+            future.set_result(None)
+
+    async def acquire(self, priority: int, tokens: int):
+        """Wait until a call with the given priority and estimated tokens is admitted.
+
+        Args:
+            priority: Admission priority (lower is admitted first)
+            tokens: Estimated tokens charged against the token budget
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._sequence), future, tokens])
+        self._dispatch()
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # Admitted and cancelled in the same tick - give the slot back
+                self.release(tokens, 0)
+            else:
+                future.cancel()
+                self._dispatch()
+            raise
+
+    def release(self, reserved_tokens: int, used_tokens: Optional[int] = None):
+        """Release an admitted call and reconcile its token charge.
+
+        Args:
+            reserved_tokens: Tokens charged when the call was admitted
+            used_tokens: Tokens actually consumed, if known
+        """
+        self.active = max(0, self.active - 1)
+        if self._token_rate and used_tokens is not None:
+            self._refill()
+            self._token_allowance = min(
+                self._token_capacity,
+                self._token_allowance + min(reserved_tokens, self._token_capacity) - used_tokens
+            )
+        self._dispatch()
+
+    def backoff(self, seconds: float):
+        """Stop admitting calls for a while, e.g. after the provider answered 429."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+class LLMRateLimitCallbackHandler(AsyncCallbackHandler):
+    """Callback handler that gates a chat model's calls through an LLMRateLimiter.
+
+    The handler runs inline in the calling task: on_chat_model_start blocks until
+    the call is admitted, and the slot is released when the call ends, fails or
+    its task finishes (covers cancellation).
+    """
+
+    run_inline = True
+
+    def __init__(self, limiter: LLMRateLimiter, priority: int):
+        """Initialize the handler.
+
+        Args:
+            limiter: Shared limiter of the model's endpoint
+            priority: Admission priority for this model's calls
+        """
+        self.limiter = limiter
+        self.priority = priority
+        self._held: dict[UUID, int] = {}
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        """Wait for admission before the request is sent."""
+        estimated_tokens = sum(estimate_message_tokens(batch) for batch in messages)
+        await self.limiter.acquire(self.priority, estimated_tokens)
+        self._held[run_id] = estimated_tokens
+
+        # Release the slot even if the call is cancelled before on_llm_end/on_llm_error
+        task = asyncio.current_task()
+        if task is not None:
+            task.add_done_callback(lambda _: self._release(run_id))
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        """Release the slot and reconcile the real token usage."""
+        self._release(run_id, get_llm_result_token_usage(response))
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Release the slot and back off the endpoint when the provider rate limited us."""
+        if is_rate_limit_error(error):
+            retry_after = _get_retry_after_seconds(error)
+            self.limiter.backoff(retry_after or LLM_RATE_LIMIT_BACKOFF_SECONDS)
+        self._release(run_id)
+
+    def _release(self, run_id: UUID, used_tokens: Optional[int] = None):
+        """Release the slot held by a run (idempotent)."""
+        reserved_tokens = self._held.pop(run_id, None)
+        if reserved_tokens is not None:
+            self.limiter.release(reserved_tokens, used_tokens)
+
+def is_rate_limit_error(exception: BaseException) -> bool:
+    """Determine if an exception is a provider rate-limit (HTTP 429) error."""
+    if getattr(exception, "status_code", None) == 429:
+        return True
+    error_str = str(exception).lower()
+    return exception.__class__.__name__ == "RateLimitError" or "rate limit" in error_str
+
+def is_transient_error(exception: BaseException) -> bool:
+    """Determine if an exception is a transient provider or network failure worth retrying."""
+    if is_rate_limit_error(exception):
+        return True
+    if isinstance(exception, (httpx.TransportError, aiohttp.ClientConnectionError, ConnectionError)):
+        return True
+    status_code = getattr(exception, "status_code", None)
+    if isinstance(status_code, int) and 500 <= status_code < 600:
+        return True
+    return exception.__class__.__name__ in ("APIConnectionError", "APITimeoutError", "InternalServerError", "ServiceUnavailableError")
+
+def _get_retry_after_seconds(exception: BaseException) -> Optional[float]:
+    """Read the Retry-After header from a provider error, if present."""
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+# Global registry of rate limiters by provider endpoint
+_llm_rate_limiters: dict = {}
+
+def get_llm_rate_limiter(model_name: str, configurable: Configuration) -> Optional[LLMRateLimiter]:
+    """Get the shared rate limiter for a model's provider endpoint.
+
+    Args:
+        model_name: Model identifier used to derive the provider endpoint
+        configurable: Agent configuration with the LLM rate limit settings
+
+    Returns:
+        Shared LLMRateLimiter, or None if no limits are configured
+    """
+    limits = (
+        configurable.llm_requests_per_minute,
+        configurable.llm_tokens_per_minute,
+        configurable.llm_max_concurrent_requests,
+    )
+    if not any(limits):
+        return None
+
+    endpoint_key = get_model_endpoint_key(model_name)
+    limiter = _llm_rate_limiters.get(endpoint_key)
+    if limiter is None:
+        limiter = _llm_rate_limiters[endpoint_key] = LLMRateLimiter(*limits)
+    elif limits != (limiter.requests_per_minute, limiter.tokens_per_minute, limiter.max_concurrency):
+        limiter.configure(*limits)
+    return limiter
+
 ##########################
 # Tavily Search Tool Utils
 ##########################
@@ -130,6 +1048,8 @@ async def tavily_search(
         config=config
     )
     
+    await dispatch_metrics_event("web_search", {"queries": len(queries)}, config)
+    
     # Step 2: Deduplicate results by URL to avoid processing the same content multiple times
     unique_results = {}
     for response in search_results:
@@ -152,19 +1072,27 @@ async def tavily_search(
         configurable.summarization_model_max_tokens,
         model_api_key,
         Summary,
-        configurable.max_structured_output_retries
+        configurable.max_structured_output_retries,
+        priority=LLM_PRIORITY_LOW,
+        configurable=configurable
     )
     
-    # Step 4: Create summarization tasks (skip empty content)
+    # Step 4: Create summarization tasks (skip empty content, reuse cached summaries)
     async def noop():
         """No-op function for results without raw content."""
         return None
     
+    summary_cache = get_summary_cache(configurable)
+    single_flight = get_single_flight(config)
     summarization_tasks = [
         noop() if not result.get("raw_content") 
-        else summarize_webpage(
+        else summarize_webpage_with_cache(
             summarization_model, 
-            result['raw_content'][:max_char_to_include]
+            result['raw_content'][:max_char_to_include],
+            configurable.summarization_model,
+            summary_cache,
+            single_flight,
+            config
         )
         for result in unique_results.values()
     ]
@@ -217,16 +1145,26 @@ async def tavily_search_async(
     Returns:
         List of search result dictionaries from Tavily API
     """
-    # Initialize the Tavily client with API key from config
-    tavily_client = AsyncTavilyClient(api_key=get_tavily_api_key(config))
+    # Reuse the process-wide Tavily client (and its connection pool) for this API key
+    configurable = Configuration.from_runnable_config(config)
+    tavily_client = get_tavily_client(
+        get_tavily_api_key(config),
+        max_connections=configurable.tavily_max_connections,
+        max_keepalive_connections=configurable.tavily_max_keepalive_connections
+    )
     
-    # Create search tasks for parallel execution
+    # Create search tasks for parallel execution, sharing identical queries already in flight
+    single_flight = get_single_flight(config)
     search_tasks = [
-        tavily_client.search(
-            query,
-            max_results=max_results,
-            include_raw_content=include_raw_content,
-            topic=topic
+        single_flight.do(
+            "search",
+            json.dumps([normalize_search_query(query), max_results, topic, include_raw_content]),
+            lambda query=query: tavily_client.search(
+                query,
+                max_results=max_results,
+                include_raw_content=include_raw_content,
+                topic=topic
+            )
         )
         for query in search_queries
     ]
@@ -275,6 +1213,602 @@ async def summarize_webpage(model: BaseChatModel, webpage_content: str) -> str:
         logging.warning(f"Summarization failed with error: {str(e)}, returning original content")
         return webpage_content
 
+async def summarize_webpage_with_cache(
+    model: BaseChatModel,
+    webpage_content: str,
+    model_name: str,
+    cache: Optional["SummaryCache"] = None,
+    single_flight: Optional["SingleFlight"] = None,
+    config: RunnableConfig = None
+) -> str:
+    """Summarize webpage content, reusing cached or in-flight summaries of identical content.
+    
+    Args:
+        model: The chat model configured for summarization
+        webpage_content: Raw (already truncated) webpage content to be summarized
+        model_name: Name of the summarization model, part of the cache key
+        cache: Summary cache to consult, or None to always summarize
+        single_flight: Per-run single-flight group used to share concurrent summarizations
+        config: Runtime configuration used to report the cache outcome to metrics handlers
+        
+    Returns:
+        Formatted summary with key excerpts, or original content if summarization fails
+    """
+    cache_key = SummaryCache.make_key(model_name, webpage_content)
+    # Stays "deduplicated" when another caller's in-flight summarization is shared
+    outcome = "deduplicated"
+    
+    async def summarize_and_cache():
+        nonlocal outcome
+        if cache is not None:
+            cached_summary = await cache.aget(cache_key)
+            if cached_summary is not None:
+                outcome = "cache_hit"
+                return cached_summary
+        
+        outcome = "summarized"
+        summary = await summarize_webpage(model, webpage_content)
+        
+        # summarize_webpage falls back to the raw content on failure - never cache that
+        if cache is not None and summary is not webpage_content:
+            await cache.aset(cache_key, summary)
+        return summary
+    
+    if single_flight is None:
+        summary = await summarize_and_cache()
+    else:
+        summary = await single_flight.do("summary", cache_key, summarize_and_cache)
+    await dispatch_metrics_event("webpage_summary", {"outcome": outcome}, config)
+    return summary
+
+##########################
+# Summary Cache Utils
+##########################
+
+# Any edit to the summarization prompt changes this version and invalidates old summaries
+SUMMARIZE_WEBPAGE_PROMPT_VERSION = hashlib.sha256(summarize_webpage_prompt.encode("utf-8")).hexdigest()[:12]
+SUMMARY_CACHE_MEMORY_ENTRIES = 1024
+SUMMARY_CACHE_EVICTION_INTERVAL = 100
+
+def get_default_cache_dir() -> str:
+    """Get the directory for on-disk caches (overridable with the ODR_CACHE_DIR environment variable)."""
+    return os.getenv("ODR_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "open_deep_research")
+
+class SummaryCache:
+    """Content-addressed, two-tier cache for webpage summaries.
+
+    Entries are keyed on (summarization model, prompt version, hash of the truncated
+    raw content), so a page fetched by several researchers or by later runs is only
+    summarized once.
+
+    Architecture:
+    - In-process LRU tier (OrderedDict) serving hot entries without any I/O
+    - Optional on-disk SQLite tier shared across runs and processes
+    - TTL expiry on both tiers, size-based LRU eviction on the disk tier
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        ttl_seconds: int,
+        max_entries: int,
+        memory_entries: int = SUMMARY_CACHE_MEMORY_ENTRIES
+    ):
+        """Initialize the summary cache.
+
+        Args:
+            path: SQLite database path for the disk tier, or None for memory only
+            ttl_seconds: Time-to-live for cached summaries
+            max_entries: Maximum number of entries kept in the disk tier
+            memory_entries: Maximum number of entries kept in the in-process tier
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = max(1, min(memory_entries, max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()  # Disk tier is accessed from worker threads
+        self._writes_since_eviction = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+        if path:
+            try:
+                self._connection = self._open_database(path)
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(f"Summary cache disabled on disk ({path}): {e}")
+
+    @staticmethod
+    def make_key(model_name: str, content: str) -> str:
+        """Build the cache key for a piece of content summarized by a model."""
+        content_hash = hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+        return f"{SUMMARIZE_WEBPAGE_PROMPT_VERSION}:{model_name}:{content_hash}"
+
+    @staticmethod
+    def _open_database(path: str) -> sqlite3.Connection:
+        """Open (and create if needed) the SQLite disk tier."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS summaries_accessed_at ON summaries (accessed_at)")
+        connection.commit()
+        return connection
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        """Look up an entry in the in-process tier, refreshing its LRU position."""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if time.time() - created_at > self.ttl_seconds:
+            self._memory.pop(key, None)
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: str, created_at: float):
+        """Insert an entry into the in-process tier, evicting the least recently used."""
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, str]]:
+        """Look up an entry in the disk tier."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                self._connection.commit()
+                return None
+            self._connection.execute("UPDATE summaries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            return created_at, value
+
+    def _disk_set(self, key: str, value: str, created_at: float):
+        """Insert an entry into the disk tier, periodically running eviction."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, created_at, created_at)
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= SUMMARY_CACHE_EVICTION_INTERVAL:
+                self._writes_since_eviction = 0
+                self._evict_disk_locked()
+            self._connection.commit()
+
+    def _evict_disk_locked(self):
+        """Drop expired entries, then the least recently used ones above max_entries."""
+        self._connection.execute(
+            "DELETE FROM summaries WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        )
+        (entry_count,) = self._connection.execute("SELECT COUNT(*) FROM summaries").fetchone()
+        overflow = entry_count - self.max_entries
+        if overflow > 0:
+            self._connection.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Get a cached summary, checking the memory tier before the disk tier.
+
+        Args:
+            key: Cache key built with make_key()
+
+        Returns:
+            Cached summary, or None on a miss
+        """
+        value = self._memory_get(key)
+        if value is None and self._connection is not None:
+            try:
+                disk_entry = await asyncio.to_thread(self._disk_get, key)
+            except sqlite3.Error as e:
+                logging.warning(f"Summary cache read failed: {e}")
+                disk_entry = None
+            if disk_entry is not None:
+                created_at, value = disk_entry
+                self._memory_set(key, value, created_at)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def aset(self, key: str, value: str):
+        """Store a summary in both tiers.
+
+        Args:
+            key: Cache key built with make_key()
+            value: Formatted summary to cache
+        """
+        created_at = time.time()
+        self._memory_set(key, value, created_at)
+        if self._connection is not None:
+            try:
+                await asyncio.to_thread(self._disk_set, key, value, created_at)
+            except sqlite3.Error as e:
+                logging.warning(f"Summary cache write failed: {e}")
+
+    def stats(self) -> dict:
+        """Get hit/miss counters for this cache."""
+        return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+# Global registry of summary caches (one per database path and eviction policy)
+_summary_caches: dict = {}
+
+def get_summary_cache(configurable: Configuration) -> Optional[SummaryCache]:
+    """Get the process-wide summary cache for a configuration.
+
+    Args:
+        configurable: Agent configuration with summary cache settings
+
+    Returns:
+        Shared SummaryCache instance, or None if caching is disabled
+    """
+    if not configurable.summary_cache_enabled:
+        return None
+
+    path = configurable.summary_cache_path
+    if path is None:
+        path = os.path.join(get_default_cache_dir(), "summary_cache.sqlite3")
+    path = path or None  # Empty string keeps the cache in memory only
+
+    cache_key = (path, configurable.summary_cache_ttl_seconds, configurable.summary_cache_max_entries)
+    if cache_key not in _summary_caches:
+        _summary_caches[cache_key] = SummaryCache(
+            path,
+            ttl_seconds=configurable.summary_cache_ttl_seconds,
+            max_entries=configurable.summary_cache_max_entries
+        )
+    return _summary_caches[cache_key]
+
+##########################
+# Research Unit Store Utils
+##########################
+
+class ResearchUnitStore:
+    """Durable store of finished research unit results, keyed by thread and tool call.
+
+    A supervisor step runs all its research units inside one graph node, so a
+    checkpointer alone would lose units that finished before a crash in the same
+    step. Results stored here are reused when a resumed run replays the step
+    with the same ConductResearch tool call ids. A thread's rows are deleted once
+    its research phase finishes; rows of runs that never finish expire after a TTL.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int):
+        """Initialize the research unit store.
+
+        Args:
+            path: SQLite database path
+            ttl_seconds: Time-to-live for results of threads that never finished
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()  # Database is accessed from worker threads
+        self._connection = self._open_database(path)
+        self._delete_expired()
+
+    @staticmethod
+    def _open_database(path: str) -> sqlite3.Connection:
+        """Open (and create if needed) the SQLite database."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS research_units ("
+            "thread_id TEXT NOT NULL, tool_call_id TEXT NOT NULL, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, PRIMARY KEY (thread_id, tool_call_id))"
+        )
+        connection.commit()
+        return connection
+
+    def _get(self, thread_id: str, tool_call_id: str) -> Optional[str]:
+        """Read a stored result."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM research_units WHERE thread_id = ? AND tool_call_id = ?",
+                (thread_id, tool_call_id)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _delete_expired(self):
+        """Drop results older than the TTL."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM research_units WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._connection.commit()
+
+    def _delete_thread(self, thread_id: str):
+        """Drop every result of a thread."""
+        with self._lock:
+            self._connection.execute("DELETE FROM research_units WHERE thread_id = ?", (thread_id,))
+            self._connection.commit()
+
+    def _set(self, thread_id: str, tool_call_id: str, value: str):
+        """Write a result."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO research_units (thread_id, tool_call_id, value, created_at) VALUES (?, ?, ?, ?)",
+                (thread_id, tool_call_id, value, time.time())
+            )
+            self._connection.commit()
+
+    async def aget(self, thread_id: str, tool_call_id: str) -> Optional[dict]:
+        """Get the stored result of a research unit.
+
+        Args:
+            thread_id: Thread the research unit ran in
+            tool_call_id: Id of the ConductResearch tool call
+
+        Returns:
+            Researcher output (compressed_research, raw_notes), or None if not stored
+        """
+        try:
+            value = await asyncio.to_thread(self._get, thread_id, tool_call_id)
+        except sqlite3.Error as e:
+            logging.warning(f"Research unit store read failed: {e}")
+            return None
+        return json.loads(value) if value else None
+
+    async def aset(self, thread_id: str, tool_call_id: str, result: dict):
+        """Store the result of a finished research unit.
+
+        Args:
+            thread_id: Thread the research unit ran in
+            tool_call_id: Id of the ConductResearch tool call
+            result: Researcher output state
+        """
+        value = json.dumps({
+            "compressed_research": result.get("compressed_research", ""),
+            "raw_notes": list(result.get("raw_notes", []))
+        }, ensure_ascii=False)
+        try:
+            await asyncio.to_thread(self._set, thread_id, tool_call_id, value)
+        except sqlite3.Error as e:
+            logging.warning(f"Research unit store write failed: {e}")
+
+    async def adelete_thread(self, thread_id: str):
+        """Forget the stored results of a thread whose research phase has finished.
+
+        Args:
+            thread_id: Thread the research units ran in
+        """
+        try:
+            await asyncio.to_thread(self._delete_thread, thread_id)
+        except sqlite3.Error as e:
+            logging.warning(f"Research unit store delete failed: {e}")
+
+# Global registry of research unit stores by database path
+_research_unit_stores: dict = {}
+
+def get_research_unit_store(configurable: Configuration) -> Optional[ResearchUnitStore]:
+    """Get the process-wide research unit store for a configuration.
+
+    Args:
+        configurable: Agent configuration with the research unit store path
+
+    Returns:
+        Shared ResearchUnitStore instance, or None if no store is configured
+    """
+    path = configurable.research_unit_store_path
+    if not path:
+        return None
+    store_key = (path, configurable.research_unit_store_ttl_seconds)
+    if store_key not in _research_unit_stores:
+        try:
+            _research_unit_stores[store_key] = ResearchUnitStore(path, configurable.research_unit_store_ttl_seconds)
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Research unit store disabled ({path}): {e}")
+            return None
+    return _research_unit_stores[store_key]
+
+##########################
+# Tavily Client Utils
+##########################
+
+# Global registry of Tavily clients by API key hash (one pooled HTTP client each)
+_tavily_clients: dict = {}
+
+def _tavily_accepts_http_client() -> bool:
+    """Check whether the installed tavily-python lets us inject a pooled httpx client."""
+    return "client" in inspect.signature(AsyncTavilyClient.__init__).parameters
+
+def get_tavily_client(
+    api_key: Optional[str],
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10
+) -> AsyncTavilyClient:
+    """Get the process-wide AsyncTavilyClient for an API key.
+
+    The client is created once per API key and event loop and backed by a bounded
+    httpx connection pool, so searches reuse keep-alive connections instead of
+    paying a TLS handshake per tool call. Pool limits are fixed when the client
+    is first created. TAVILY_HTTP_PROXY / TAVILY_HTTPS_PROXY are honoured as with
+    the client tavily-python builds itself.
+
+    Args:
+        api_key: Tavily API key (None falls back to TAVILY_API_KEY inside the client)
+        max_connections: Maximum concurrent connections in the pool
+        max_keepalive_connections: Maximum idle keep-alive connections in the pool
+
+    Returns:
+        Shared AsyncTavilyClient instance
+    """
+    loop = asyncio.get_running_loop()
+    registry_key = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()
+    entry = _tavily_clients.get(registry_key)
+
+    # Clients are bound to the loop that created their connections
+    if entry is not None and entry["loop"] is loop and not (
+        entry["http_client"] is not None and entry["http_client"].is_closed
+    ):
+        return entry["client"]
+
+    http_client = None
+    if _tavily_accepts_http_client():
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        # tavily-python only maps TAVILY_HTTP(S)_PROXY onto clients it creates itself
+        proxies = {
+            "http://": os.getenv("TAVILY_HTTP_PROXY"),
+            "https://": os.getenv("TAVILY_HTTPS_PROXY"),
+        }
+        proxy_mounts = {
+            scheme: httpx.AsyncHTTPTransport(proxy=proxy, limits=limits)
+            for scheme, proxy in proxies.items() if proxy
+        }
+        http_client = httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(180.0),
+            mounts=proxy_mounts or None,
+        )
+        tavily_client = AsyncTavilyClient(api_key=api_key, client=http_client)
+    else:
+        # Older tavily-python manages its own HTTP client; still reuse the client object
+        tavily_client = AsyncTavilyClient(api_key=api_key)
+
+    _tavily_clients[registry_key] = {"client": tavily_client, "http_client": http_client, "loop": loop}
+    return tavily_client
+
+async def close_tavily_clients():
+    """Close every pooled Tavily HTTP client owned by the current event loop.
+
+    Call this before the event loop shuts down (e.g. at the end of a CLI run);
+    clients created on other loops are simply dropped.
+    """
+    loop = asyncio.get_running_loop()
+    entries = list(_tavily_clients.values())
+    _tavily_clients.clear()
+
+    for entry in entries:
+        http_client = entry["http_client"]
+        if http_client is None or entry["loop"] is not loop:
+            continue
+        try:
+            await http_client.aclose()
+        except Exception as e:
+            logging.warning(f"Error closing Tavily HTTP client: {e}")
+
+##########################
+# In-flight Deduplication Utils
+##########################
+
+SINGLE_FLIGHT_MAX_RUNS = 256
+
+def normalize_search_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share one request."""
+    return " ".join(query.split()).casefold()
+
+class SingleFlight:
+    """Per-run single-flight group that collapses concurrent identical work.
+
+    When parallel researchers ask for the same search query or page summary while
+    an identical call is still running, only the first caller executes it and the
+    others await the same task. Hit/miss counters are kept per namespace
+    (e.g. "search", "summary") so a run can report how much work was shared.
+    """
+
+    def __init__(self):
+        """Initialize an empty single-flight group."""
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+
+    async def do(self, namespace: str, key: str, coroutine_factory):
+        """Run coroutine_factory() once per key among concurrent callers.
+
+        Args:
+            namespace: Counter namespace for this kind of work
+            key: Identity of the work within the namespace
+            coroutine_factory: Zero-argument callable returning the coroutine to run
+
+        Returns:
+            Result of the (possibly shared) call
+        """
+        flight_key = (namespace, key)
+        task = self._in_flight.get(flight_key)
+
+        if task is not None and not task.done():
+            self.hits[namespace] = self.hits.get(namespace, 0) + 1
+        else:
+            self.misses[namespace] = self.misses.get(namespace, 0) + 1
+            task = asyncio.ensure_future(coroutine_factory())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._forget(flight_key, done))
+
+        # Shield so one cancelled waiter does not cancel the call for everybody else
+        return await asyncio.shield(task)
+
+    def _forget(self, flight_key: tuple[str, str], task: asyncio.Future):
+        """Drop a finished task from the in-flight table."""
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Get hit/miss counters per namespace."""
+        namespaces = set(self.hits) | set(self.misses)
+        return {
+            namespace: {"hits": self.hits.get(namespace, 0), "misses": self.misses.get(namespace, 0)}
+            for namespace in sorted(namespaces)
+        }
+
+# Global registry of single-flight groups by run (thread_id), oldest runs dropped first
+_single_flight_groups: OrderedDict = OrderedDict()
+
+def get_single_flight(config: RunnableConfig) -> SingleFlight:
+    """Get the single-flight group for the run identified by the config's thread_id.
+
+    Args:
+        config: Runtime configuration containing the thread identifier
+
+    Returns:
+        SingleFlight shared by every researcher of the same run
+    """
+    thread_id = (config or {}).get("configurable", {}).get("thread_id") or "default"
+    group = _single_flight_groups.get(thread_id)
+    if group is None:
+        group = _single_flight_groups[thread_id] = SingleFlight()
+        while len(_single_flight_groups) > SINGLE_FLIGHT_MAX_RUNS:
+            _single_flight_groups.popitem(last=False)
+    else:
+        _single_flight_groups.move_to_end(thread_id)
+    return group
+
+def get_dedup_stats(thread_id: str) -> dict:
+    """Get in-flight deduplication counters for a run.
+
+    Args:
+        thread_id: Thread identifier of the run
+
+    Returns:
+        Hit/miss counters per namespace, empty if the run made no deduplicated calls
+    """
+    group = _single_flight_groups.get(thread_id)
+    return group.stats() if group else {}
+
 ##########################
 # Reflection Tool Utils
 ##########################
@@ -381,7 +1915,7 @@ async def get_tokens(config: RunnableConfig):
     # Check token expiration
     expires_in = tokens.value.get("expires_in")  # seconds until expiration
     created_at = tokens.created_at  # datetime of token creation
-    current_time = datetime.now(timezone.utc)
+    current_time = datetime.now(UTC)
     expiration_time = created_at + timedelta(seconds=expires_in)
     
     if current_time > expiration_time:
@@ -454,12 +1988,14 @@ def wrap_mcp_authenticate_tool(tool: StructuredTool) -> StructuredTool:
     Returns:
         Enhanced tool with authentication error handling
     """
+    # Pool tools are shared across calls - only wrap them once
+    if getattr(tool, "_mcp_authenticate_wrapped", False):
+        return tool
+    
     original_coroutine = tool.coroutine
     
     async def authentication_wrapper(**kwargs):
         """Enhanced coroutine with MCP error handling, pool management, and user-friendly messages."""
-        from datetime import datetime
-
         def _find_mcp_error_in_exception_chain(exc: BaseException) -> McpError | None:
             """Recursively search for MCP errors in exception chains."""
             if isinstance(exc, McpError):
@@ -475,32 +2011,40 @@ def wrap_mcp_authenticate_tool(tool: StructuredTool) -> StructuredTool:
         # Check if this tool has a pool attached (for MCP tools)
         pool = getattr(tool, '_mcp_pool', None)
 
+        # Different timeouts for different operations
+        timeout = 120.0  # Default: 2 minutes for file operations
+        if tool.name == "list_directory":
+            timeout = 60.0  # 1 minute for listing directories
+
         try:
-            # If pool exists, acquire a client for this tool call
+            # If pool exists, acquire a connection and run the call on its own session
+            coroutine = original_coroutine
             if pool:
-                print(f"[{datetime.now()}] 🔧 Tool '{tool.name}': Acquiring client from pool...")
-                client = await pool.acquire()
-                print(f"[{datetime.now()}] 🔧 Tool '{tool.name}': Client acquired")
+                with span("mcp_tool.acquire_client", tool=tool.name):
+                    client = await asyncio.wait_for(pool.acquire(), timeout=timeout)
+                coroutine = client.tool_coroutines.get(tool.name, original_coroutine)
 
+            broken = False
             try:
-                # Execute the original tool functionality with timeout protection
-                import asyncio
-                # Different timeouts for different operations
-                timeout = 120.0  # Default: 2 minutes for file operations
-                if tool.name == "list_directory":
-                    timeout = 60.0  # 1 minute for listing directories
-
-                result = await asyncio.wait_for(
-                    original_coroutine(**kwargs),
-                    timeout=timeout
-                )
+                # Execute the tool functionality with timeout protection
+                with span("mcp_tool.call", tool=tool.name):
+                    result = await asyncio.wait_for(
+                        coroutine(**kwargs),
+                        timeout=timeout
+                    )
 
                 return result
+            except Exception as e:
+                # Errors reported by the server leave the connection usable; timeouts and transport failures do not
+                mcp_error = _find_mcp_error_in_exception_chain(e)
+                broken = not isinstance(e, ToolException) and (
+                    mcp_error is None or mcp_error.error.code == CONNECTION_CLOSED
+                )
+                raise
             finally:
                 # Always release client back to pool after tool execution
                 if pool:
-                    await pool.release(client)
-                    print(f"[{datetime.now()}] 🔧 Tool '{tool.name}': Client released")
+                    await pool.release(client, broken=broken)
 
         except asyncio.TimeoutError:
             # MCP tool call timed out
@@ -541,122 +2085,471 @@ def wrap_mcp_authenticate_tool(tool: StructuredTool) -> StructuredTool:
     
     # Replace the tool's coroutine with our enhanced version
     tool.coroutine = authentication_wrapper
+    tool._mcp_authenticate_wrapped = True
     return tool
 
-# MCP Client Pool for handling concurrent access
-class MCPClientPool:
-    """True resource pool for MCP clients with acquire/release semantics.
+# Pooled MCP connections idle for longer than this are pinged before they are handed out
+MCP_POOL_HEALTH_CHECK_IDLE_SECONDS = 30.0
+MCP_POOL_HEALTH_CHECK_TIMEOUT_SECONDS = 5.0
+MCP_CLIENT_START_TIMEOUT_SECONDS = 60.0
+MCP_CLIENT_CLOSE_TIMEOUT_SECONDS = 10.0
 
-    Best practice: Each researcher acquires an exclusive MCP client from the pool,
-    uses it for the entire research session, then releases it back. This prevents
-    stdio conflicts while allowing true parallelism up to pool_size.
+def get_mcp_server_fingerprint(mcp_server_config: dict) -> Optional[str]:
+    """Fingerprint an MCP server setup: its configuration plus the mtimes of the files it runs.
 
-    Architecture:
-    - pool_size clients are pre-created (based on CPU cores)
-    - asyncio.Queue manages available clients
-    - Researcher acquires → uses exclusively → releases
+    Upgrading the server (a new binary or script) changes the fingerprint, so cached
+    tool schemas are never served for a different server version.
+
+    Args:
+        mcp_server_config: MCP server configuration (as passed to MultiServerMCPClient)
+
+    Returns:
+        Hex fingerprint, or None for remote servers, whose tools can change at any time
+    """
+    parts = [json.dumps(mcp_server_config, sort_keys=True)]
+    for server in mcp_server_config.values():
+        if server.get("transport") != "stdio":
+            return None
+        cwd = server.get("cwd") or ""
+        command = shutil.which(server["command"]) or server["command"]
+        for path in [command, *server.get("args", [])]:
+            path = os.path.join(cwd, path)
+            if os.path.isfile(path):
+                parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+def load_mcp_tool_schemas(cache_dir: str, fingerprint: str) -> Optional[list[dict]]:
+    """Read cached tool schemas for a server fingerprint, if present and readable."""
+    try:
+        with open(os.path.join(cache_dir, f"{fingerprint}.json"), encoding="utf-8") as f:
+            return json.load(f)["tools"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def save_mcp_tool_schemas(cache_dir: str, fingerprint: str, tools: list[BaseTool]):
+    """Write a server's tool schemas to the cache (atomically, so readers never see a partial file)."""
+    schemas = [
+        {
+            "name": mcp_tool.name,
+            "description": mcp_tool.description,
+            "args_schema": mcp_tool.args_schema if isinstance(mcp_tool.args_schema, dict) else mcp_tool.get_input_jsonschema(),
+            "metadata": mcp_tool.metadata,
+            "response_format": mcp_tool.response_format,
+        }
+        for mcp_tool in tools
+    ]
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = os.path.join(cache_dir, f"{fingerprint}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "tools": schemas}, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, os.path.join(cache_dir, f"{fingerprint}.json"))
+    except OSError as e:
+        log_event(logging.WARNING, "mcp_pool.schema_cache_write_failed", error=str(e))
+
+def make_cached_mcp_tool(schema: dict) -> StructuredTool:
+    """Build a tool from a cached schema; calls run on a pooled connection once a pool is attached."""
+    async def call_without_connection(**kwargs):
+        raise ToolException(f"MCP tool '{schema['name']}' has no MCP connection")
+
+    return StructuredTool(
+        name=schema["name"],
+        description=schema.get("description") or "",
+        args_schema=schema["args_schema"],
+        coroutine=call_without_connection,
+        response_format=schema.get("response_format") or "content_and_artifact",
+        metadata=schema.get("metadata"),
+    )
+
+class MCPPooledClient:
+    """One pooled connection to the configured MCP server(s), with tools bound to its sessions.
+
+    The sessions are opened and closed by a dedicated task, because stdio transports
+    must be exited by the task that entered them; tool calls from any task can use
+    the open sessions.
     """
 
-    def __init__(self, mcp_config: dict, pool_size: int):
+    def __init__(self, mcp_config: dict):
+        """Prepare a connection; nothing is spawned until start().
+
+        Args:
+            mcp_config: MCP server configuration
+        """
+        self.client = MultiServerMCPClient(mcp_config)
+        self.sessions: list = []
+        self.tools: list[BaseTool] = []
+        self.tool_coroutines: dict = {}  # Tool name -> coroutine calling it on this connection's session
+        self.last_used = time.monotonic()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether the connection has ended (closed by the pool, or the server went away)."""
+        return self._task is not None and self._task.done()
+
+    async def start(self, timeout: float = MCP_CLIENT_START_TIMEOUT_SECONDS):
+        """Start the server(s), open the sessions and list their tools.
+
+        Raises:
+            Exception: If the server could not be started or did not answer in time
+        """
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except BaseException:
+            await self.close()
+            raise
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self):
+        """Hold the sessions open until close() is called or the server goes away."""
+        from langchain_mcp_adapters.tools import load_mcp_tools as load_session_tools
+
+        try:
+            async with AsyncExitStack() as stack:
+                for server_name in self.client.connections:
+                    session = await stack.enter_async_context(self.client.session(server_name))
+                    self.sessions.append(session)
+                    for session_tool in await load_session_tools(session):
+                        self.tools.append(session_tool)
+                        self.tool_coroutines[session_tool.name] = session_tool.coroutine
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            log_event(logging.WARNING, "mcp_pool.client_stopped", error=str(e))
+        finally:
+            self.sessions = []
+            self._ready.set()
+
+    async def ping(self, timeout: float = MCP_POOL_HEALTH_CHECK_TIMEOUT_SECONDS) -> bool:
+        """Check that every server still answers."""
+        if self.closed or not self.sessions:
+            return False
+        try:
+            for session in self.sessions:
+                await asyncio.wait_for(session.send_ping(), timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        """Close the sessions and wait (briefly) for the server processes to exit."""
+        self._closing.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=MCP_CLIENT_CLOSE_TIMEOUT_SECONDS)
+        except TimeoutError:
+            self._task.cancel()
+
+# MCP Client Pool for handling concurrent access
+class MCPClientPool:
+    """Elastic resource pool of MCP connections with acquire/release semantics.
+
+    Each MCP tool call acquires an exclusive connection, runs on its session and
+    releases it, so concurrent researchers never share a stdio stream.
+
+    Sizing follows demand rather than the machine:
+    - min_size connections are started concurrently when the pool is first used
+      (or pre-warmed with start()) and kept open; the pool is usable as soon as
+      the first one is ready
+    - when an acquire has waited grow_after_wait_seconds, one more connection is
+      opened in the background, up to max_size
+    - connections idle for longer than idle_timeout_seconds are closed, down to min_size
+    - idle connections are pinged before reuse, and dead ones are replaced
+    """
+
+    def __init__(
+        self,
+        mcp_config: dict,
+        min_size: int = 1,
+        max_size: int = 8,
+        grow_after_wait_seconds: float = 0.5,
+        idle_timeout_seconds: float = 120.0,
+        tool_schema_cache_dir: Optional[str] = None
+    ):
         """Initialize MCP client pool.
 
         Args:
             mcp_config: MCP server configuration
-            pool_size: Maximum number of concurrent MCP clients (based on CPU cores)
+            min_size: Connections kept open even when idle
+            max_size: Maximum number of concurrent MCP connections
+            grow_after_wait_seconds: Acquire wait after which the pool opens another connection
+            idle_timeout_seconds: Idle time after which surplus connections are closed
+            tool_schema_cache_dir: Directory caching the tool schemas across processes (None disables)
         """
         self.mcp_config = mcp_config
-        self.pool_size = pool_size
-        self.available_clients = asyncio.Queue(maxsize=pool_size)  # Queue of available clients
-        self.all_clients: list = []  # All created clients (for cleanup)
-        self.init_lock = asyncio.Lock()  # Protect pool initialization
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.grow_after_wait_seconds = grow_after_wait_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.idle_clients: asyncio.LifoQueue = asyncio.LifoQueue()  # Most recently used first, so surplus connections go idle
+        self.clients: set[MCPPooledClient] = set()  # Open and starting connections
+        self._starting = 0  # Connections still starting up
+        self._waiting = 0  # Acquires waiting for a free connection
         self.initialized = False
-        self.cached_tools: list = []  # Cached tool list to avoid repeated get_tools() calls
+        self._init_task: Optional[asyncio.Task] = None  # Shared by everyone waiting for the first connection
+        self._last_start_error: Optional[BaseException] = None
+        self.cached_tools: list = []  # Tool list fetched once and shared by every researcher
+        self.tool_schema_cache_dir = tool_schema_cache_dir
+        self.tool_schema_fingerprint = get_mcp_server_fingerprint(mcp_config) if tool_schema_cache_dir else None
+        self._schema_cache_tools: Optional[list] = None  # Tools built from the schema cache, before any connection
+        self._background_tasks: set[asyncio.Task] = set()
+        self.stats = {
+            "acquires": 0,
+            "waited_acquires": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "clients_started": 0,
+            "client_start_failures": 0,
+            "clients_closed_idle": 0,
+            "clients_replaced": 0,
+            "health_check_failures": 0,
+        }
 
-        from datetime import datetime
-        print(f"[{datetime.now()}] 🏊 MCP Pool: Created with size {pool_size} (CPU-based)")
+        log_event(logging.INFO, "mcp_pool.created", min_size=self.min_size, max_size=self.max_size)
 
-    async def _initialize_pool(self):
-        """Pre-create all clients in the pool and cache the tool list (lazy initialization on first use)."""
-        from langchain_mcp_adapters.client import MultiServerMCPClient
-        from datetime import datetime
+    def _run_in_background(self, coroutine) -> asyncio.Task:
+        """Run a pool maintenance coroutine without awaiting it."""
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
 
-        async with self.init_lock:
-            if self.initialized:
-                return
+    def _track(self) -> MCPPooledClient:
+        """Create a connection and count it against max_size right away."""
+        client = MCPPooledClient(self.mcp_config)
+        self.clients.add(client)
+        _mcp_clients.append(client.client)
+        return client
+
+    def _forget(self, client: MCPPooledClient):
+        """Stop counting a connection that was closed or never started."""
+        self.clients.discard(client)
+        if client.client in _mcp_clients:
+            _mcp_clients.remove(client.client)
 
-            print(f"[{datetime.now()}] 🏊 MCP Pool: Initializing {self.pool_size} clients...")
+    async def _start_client(self, client: MCPPooledClient):
+        """Start a tracked connection, forgetting it if it fails."""
+        self._starting += 1
+        try:
+            with span("mcp_pool.start_client", level=logging.INFO) as span_fields:
+                await client.start()
+                span_fields["pool_size"] = len(self.clients)
+        except BaseException:
+            self._forget(client)
+            self.stats["client_start_failures"] += 1
+            raise
+        finally:
+            self._starting -= 1
+        self.stats["clients_started"] += 1
 
-            # Create the first client and get tools from it ONCE
-            print(f"[{datetime.now()}] 🔌 MCP Pool: Creating client #1/{self.pool_size}...")
-            first_client = MultiServerMCPClient(self.mcp_config)
+    def _grow(self) -> Optional[asyncio.Task]:
+        """Open one more connection in the background; it joins the idle queue once ready.
 
-            # Register for cleanup
-            global _mcp_clients
-            _mcp_clients.append(first_client)
-            self.all_clients.append(first_client)
+        Returns:
+            The start-up task (its result tells whether the connection started),
+            or None if the pool is already at max_size
+        """
+        if len(self.clients) >= self.max_size:
+            return None
+        client = self._track()
 
-            # Get tools ONCE from the first client and cache
-            print(f"[{datetime.now()}] 📋 MCP Pool: Fetching tool list from first client...")
+        async def start_and_offer() -> bool:
             try:
-                self.cached_tools = await asyncio.wait_for(first_client.get_tools(), timeout=60.0)
-                print(f"[{datetime.now()}] ✅ MCP Pool: Cached {len(self.cached_tools)} tools")
+                await self._start_client(client)
             except Exception as e:
-                print(f"[{datetime.now()}] ⚠️  MCP Pool: Failed to get tools: {e}")
-                self.cached_tools = []
-
-            # Put first client into available queue
-            await self.available_clients.put(first_client)
-            print(f"[{datetime.now()}] ✅ MCP Pool: Client #1 ready")
-
-            # Create remaining clients (no need to get_tools from each)
-            for i in range(1, self.pool_size):
-                print(f"[{datetime.now()}] 🔌 MCP Pool: Creating client #{i+1}/{self.pool_size}...")
-                client = MultiServerMCPClient(self.mcp_config)
-
-                # Register for cleanup
-                _mcp_clients.append(client)
-                self.all_clients.append(client)
+                self._last_start_error = e
+                log_event(logging.WARNING, "mcp_pool.grow_failed", error=str(e))
+                return False
+            # The first connection to come up provides the tool list for every researcher
+            if not self.initialized and not self.cached_tools:
+                self.cached_tools = client.tools
+            client.last_used = time.monotonic()
+            self.idle_clients.put_nowait(client)
+            return True
 
-                # Put into available queue
-                await self.available_clients.put(client)
-                print(f"[{datetime.now()}] ✅ MCP Pool: Client #{i+1} ready")
+        return self._run_in_background(start_and_offer())
 
-            self.initialized = True
-            print(f"[{datetime.now()}] 🏊 MCP Pool: All {self.pool_size} clients initialized")
+    async def _close_client(self, client: MCPPooledClient):
+        """Close a connection and stop counting it."""
+        self._forget(client)
+        await client.close()
 
-    async def acquire(self):
-        """Acquire an exclusive MCP client from the pool.
+    async def _replace(self, client: MCPPooledClient):
+        """Drop a dead or broken connection, reopening one if the pool fell below min_size."""
+        self.stats["clients_replaced"] += 1
+        log_event(logging.WARNING, "mcp_pool.client_replaced", pool_size=len(self.clients) - 1)
+        await self._close_client(client)
+        if len(self.clients) < self.min_size:
+            self._grow()
 
-        Blocks if all clients are in use. Returns a client that the caller
-        owns exclusively until release() is called.
+    def start(self) -> asyncio.Task:
+        """Start opening the pool's connections in the background (idempotent).
 
         Returns:
-            MCP client instance for exclusive use
+            The initialization task, done once the first connection is ready
         """
-        from datetime import datetime
-
-        # Lazy initialize pool on first acquire
+        if self._init_task is None or (self._init_task.done() and not self.initialized):
+            self._init_task = asyncio.create_task(self._initialize_pool())
+            self._init_task.add_done_callback(self._log_init_failure)
+        return self._init_task
+
+    @staticmethod
+    def _log_init_failure(task: asyncio.Task):
+        """Report a failed initialization nobody may be waiting on (e.g. a pre-warm)."""
+        if not task.cancelled() and task.exception() is not None:
+            log_event(logging.WARNING, "mcp_pool.initialize_failed", error=str(task.exception()))
+
+    async def _ensure_initialized(self):
+        """Wait until the pool has a connection and the tool list (lazy initialization on first use)."""
         if not self.initialized:
-            await self._initialize_pool()
+            # Shielded: a cancelled waiter must not abort start-up for everyone else
+            await asyncio.shield(self.start())
 
-        # Wait for available client (blocks if pool is full)
-        client = await self.available_clients.get()
-        current_available = self.available_clients.qsize()
-        print(f"[{datetime.now()}] 🏊 MCP Pool: Acquired client (available: {current_available}/{self.pool_size})")
+    async def _initialize_pool(self):
+        """Start the first min_size connections concurrently; the pool is usable once the first is ready."""
+        log_event(logging.INFO, "mcp_pool.initializing", min_size=self.min_size)
+
+        with span("mcp_pool.fetch_tools", level=logging.INFO) as span_fields:
+            starting = {task for task in (self._grow() for _ in range(max(self.min_size, 1))) if task}
+            while starting:
+                done, starting = await asyncio.wait(starting, return_when=asyncio.FIRST_COMPLETED)
+                if any(task.result() for task in done):
+                    break
+            else:
+                raise RuntimeError(f"No MCP connection could be started: {self._last_start_error}")
+            span_fields["tool_count"] = len(self.cached_tools)
+            span_fields["still_starting"] = len(starting)
+
+        self._run_in_background(self._reap_idle_clients())
+        self.initialized = True
+        log_event(logging.INFO, "mcp_pool.initialized", pool_size=len(self.clients))
+
+        # Refresh the schema cache from the live server for the next process
+        if self.tool_schema_fingerprint:
+            self._run_in_background(asyncio.to_thread(
+                save_mcp_tool_schemas, self.tool_schema_cache_dir, self.tool_schema_fingerprint, self.cached_tools
+            ))
+
+    async def _reap_idle_clients(self):
+        """Periodically close connections idle past the timeout, keeping min_size open."""
+        while True:
+            await asyncio.sleep(self.idle_timeout_seconds / 2)
+            now = time.monotonic()
+            idle = []
+            while not self.idle_clients.empty():
+                idle.append(self.idle_clients.get_nowait())
+            surplus = len(self.clients) - self.min_size
+            expired = []
+            # The queue yields the most recently used first; put survivors back oldest first to keep that order
+            for client in reversed(idle):
+                if surplus > 0 and now - client.last_used > self.idle_timeout_seconds:
+                    expired.append(client)
+                    surplus -= 1
+                else:
+                    self.idle_clients.put_nowait(client)
+            for client in expired:
+                self.stats["clients_closed_idle"] += 1
+                await self._close_client(client)
+            if expired:
+                log_event(logging.INFO, "mcp_pool.shrunk", closed=len(expired), pool_size=len(self.clients))
+
+    async def _is_healthy(self, client: MCPPooledClient) -> bool:
+        """Check a connection before handing it out, pinging it if it sat idle for a while."""
+        if client.closed:
+            return False
+        if time.monotonic() - client.last_used < MCP_POOL_HEALTH_CHECK_IDLE_SECONDS:
+            return True
+        if await client.ping():
+            return True
+        self.stats["health_check_failures"] += 1
+        return False
 
+    async def _get_idle_client(self) -> MCPPooledClient:
+        """Take an idle connection, opening another one whenever the wait passes the growth threshold."""
+        if not self.clients:
+            self._grow()
+        try:
+            return self.idle_clients.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        self._waiting += 1
+        try:
+            while True:
+                try:
+                    return await asyncio.wait_for(
+                        self.idle_clients.get(),
+                        timeout=max(self.grow_after_wait_seconds, 0.01)
+                    )
+                except TimeoutError:
+                    # Grow by at most one connection per waiting acquire
+                    if self._starting < self._waiting:
+                        self._grow()
+        finally:
+            self._waiting -= 1
+
+    async def acquire(self) -> MCPPooledClient:
+        """Acquire an exclusive MCP connection from the pool.
+
+        Blocks if all connections are in use, growing the pool when the wait gets long.
+        The caller owns the connection exclusively until release() is called.
+
+        Returns:
+            Pooled connection whose tools are bound to its own session
+        """
+        with trace_span("mcp_pool.acquire", pool_size=len(self.clients)) as span_attributes:
+            # Lazy initialize pool on first acquire
+            if not self.initialized:
+                span_attributes["waited_for_initialization"] = True
+                await self._ensure_initialized()
+
+            # The span's duration is the queue time
+            span_attributes["idle_at_request"] = self.idle_clients.qsize()
+            wait_started = time.monotonic()
+            while True:
+                client = await self._get_idle_client()
+                try:
+                    healthy = await self._is_healthy(client)
+                except BaseException:
+                    # Cancelled (e.g. an acquire timeout) mid health check: the connection is ours, so
+                    # hand it back as broken - in the background, not to delay the cancellation
+                    self._run_in_background(self._replace(client))
+                    raise
+                if healthy:
+                    break
+                await self._replace(client)
+            waited = time.monotonic() - wait_started
+
+        self.stats["acquires"] += 1
+        self.stats["wait_seconds_total"] += waited
+        self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], waited)
+        if waited >= self.grow_after_wait_seconds:
+            self.stats["waited_acquires"] += 1
+        log_event(
+            logging.DEBUG, "mcp_pool.acquire",
+            wait_ms=round(waited * 1000, 2), idle=self.idle_clients.qsize(), pool_size=len(self.clients)
+        )
         return client
 
-    async def release(self, client):
-        """Release a client back to the pool.
+    async def release(self, client: MCPPooledClient, broken: bool = False):
+        """Release a connection back to the pool.
 
         Args:
-            client: The MCP client to return to the pool
+            client: The connection to return to the pool
+            broken: Whether the caller saw the connection fail; it is replaced instead of reused
         """
-        from datetime import datetime
-
-        await self.available_clients.put(client)
-        current_available = self.available_clients.qsize()
-        print(f"[{datetime.now()}] 🏊 MCP Pool: Released client (available: {current_available}/{self.pool_size})")
+        if broken or client.closed:
+            await self._replace(client)
+            return
+        client.last_used = time.monotonic()
+        self.idle_clients.put_nowait(client)
+        log_event(logging.DEBUG, "mcp_pool.release", idle=self.idle_clients.qsize(), pool_size=len(self.clients))
 
     async def get_cached_tools(self):
         """Get the cached tool list without calling get_tools().
@@ -667,76 +2560,68 @@ class MCPClientPool:
         Returns:
             List of cached tools from the pool
         """
-        from datetime import datetime
-
         # Ensure pool is initialized (will cache tools on first call)
-        if not self.initialized:
-            await self._initialize_pool()
+        await self._ensure_initialized()
 
-        print(f"[{datetime.now()}] 📋 MCP Pool: Returning {len(self.cached_tools)} cached tools")
         return self.cached_tools
 
-    async def get_tools_from_client(self, client):
-        """Get tools from a specific client (deprecated - use get_cached_tools instead).
-
-        Args:
-            client: MCP client to get tools from
-
-        Returns:
-            List of tools from the client
-        """
-        from datetime import datetime
-
-        try:
-            tools = await asyncio.wait_for(client.get_tools(), timeout=30.0)
-            print(f"[{datetime.now()}] ✅ MCP Pool: Got {len(tools)} tools from client")
-            return tools
-        except asyncio.TimeoutError:
-            print(f"[{datetime.now()}] ⚠️  MCP Pool: Client get_tools timed out after 30 seconds")
-            raise
-        except Exception as e:
-            print(f"[{datetime.now()}] ⚠️  MCP Pool: Client get_tools failed: {e}")
-            raise
-
-# Global registry
-_mcp_clients: list = []  # All created MCP clients (for cleanup)
-_mcp_client_pools: dict = {}  # Pools by config hash (one pool per docs_path)
-_cleanup_registered = False
+    async def get_tools(self) -> list:
+        """Get the tool list, from the schema cache without starting the server when possible.
 
+        Tools built from cached schemas start the pool on their first call (through
+        acquire()), so a run that never calls an MCP tool never starts the server.
 
-def _calculate_mcp_pool_size() -> int:
-    """Calculate optimal MCP client pool size based on CPU cores.
+        Returns:
+            Live tools if the pool is running, else cached-schema tools, else live tools
+            after starting the pool
+        """
+        if self.initialized:
+            return self.cached_tools
+        if await self.load_schema_cache():
+            return self._schema_cache_tools
+        return await self.get_cached_tools()
 
-    Strategy:
-    - 1-4 cores: pool_size = 2 (minimal parallelism)
-    - 5-8 cores: pool_size = 3 (moderate parallelism)
-    - 9-16 cores: pool_size = 5 (good parallelism)
-    - 17+ cores: pool_size = 8 (high parallelism)
+    async def load_schema_cache(self) -> bool:
+        """Build tools from the on-disk schema cache, if it has an entry for this server.
 
-    Returns:
-        Optimal pool size for current system
-    """
-    import os
-    from datetime import datetime
+        Returns:
+            Whether cached-schema tools are available
+        """
+        if self._schema_cache_tools is None and self.tool_schema_fingerprint:
+            schemas = await asyncio.to_thread(
+                load_mcp_tool_schemas, self.tool_schema_cache_dir, self.tool_schema_fingerprint
+            )
+            if schemas is not None:
+                self._schema_cache_tools = [make_cached_mcp_tool(schema) for schema in schemas]
+                log_event(logging.INFO, "mcp_pool.schema_cache_hit", tool_count=len(schemas))
+        return self._schema_cache_tools is not None
+
+    def get_stats(self) -> dict:
+        """Pool size and wait-time metrics."""
+        return {
+            **self.stats,
+            "wait_seconds_total": round(self.stats["wait_seconds_total"], 3),
+            "wait_seconds_max": round(self.stats["wait_seconds_max"], 3),
+            "wait_seconds_avg": round(self.stats["wait_seconds_total"] / max(self.stats["acquires"], 1), 3),
+            "pool_size": len(self.clients),
+            "idle": self.idle_clients.qsize(),
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+        }
 
-    cpu_count = os.cpu_count() or 4  # Default to 4 if detection fails
+# Global registry
+_mcp_clients: list = []  # All created MCP clients (for cleanup)
+_mcp_client_pools: dict = {}  # Pools by config hash (one pool per docs_path)
+_cleanup_registered = False
 
-    if cpu_count <= 4:
-        pool_size = 2
-    elif cpu_count <= 8:
-        pool_size = 3
-    elif cpu_count <= 16:
-        pool_size = 5
-    else:
-        pool_size = 8
 
-    print(f"[{datetime.now()}] 💻 System: Detected {cpu_count} CPU cores → MCP pool size = {pool_size}")
-    return pool_size
+def get_mcp_pool_stats() -> dict:
+    """Get the size and wait-time metrics of every MCP client pool, by config hash prefix."""
+    return {cache_key[:8]: pool.get_stats() for cache_key, pool in _mcp_client_pools.items()}
 
 def _cleanup_all_mcp_clients():
     """Cleanup all MCP clients, pools, and their Node.js subprocesses when process exits"""
     global _mcp_clients, _mcp_client_pools
-    from datetime import datetime
     import subprocess
     import sys
 
@@ -744,35 +2629,30 @@ def _cleanup_all_mcp_clients():
     _mcp_client_pools.clear()
 
     if _mcp_clients:
-        print(f"\n[{datetime.now()}] 🧹 Cleaning up {len(_mcp_clients)} MCP client(s)...")
+        log_event(logging.INFO, "mcp_cleanup.start", client_count=len(_mcp_clients))
 
         for idx, client in enumerate(_mcp_clients):
             try:
-                print(f"[{datetime.now()}] 🧹 Cleaning up MCP client {idx + 1}/{len(_mcp_clients)}...")
-
                 # Try to access the underlying MCP server processes
                 if hasattr(client, '_clients'):
                     # MultiServerMCPClient has _clients dict
                     for server_name, server_client in client._clients.items():
-                        print(f"[{datetime.now()}]    📡 Server: {server_name}")
                         # Try to terminate the subprocess if it exists
                         if hasattr(server_client, '_process') and server_client._process:
                             try:
                                 server_client._process.terminate()
-                                print(f"[{datetime.now()}]    ✓ Terminated subprocess for {server_name}")
+                                log_event(logging.DEBUG, "mcp_cleanup.terminated_subprocess", server=server_name)
                             except:
                                 pass
 
                 # Try standard close methods
                 if hasattr(client, 'close'):
                     client.close()
-                    print(f"[{datetime.now()}]    ✓ Called close() on client")
                 elif hasattr(client, 'cleanup'):
                     client.cleanup()
-                    print(f"[{datetime.now()}]    ✓ Called cleanup() on client")
 
             except Exception as e:
-                print(f"[{datetime.now()}] ⚠️ Error cleaning up MCP client {idx + 1}: {e}")
+                log_event(logging.WARNING, "mcp_cleanup.client_failed", client_index=idx + 1, error=str(e))
 
         _mcp_clients.clear()
 
@@ -802,7 +2682,7 @@ def _cleanup_all_mcp_clients():
                                 except:
                                     pass
                     if killed_count > 0:
-                        print(f"[{datetime.now()}] 🧹 Killed {killed_count} orphan Node.js MCP process(es)")
+                        log_event(logging.INFO, "mcp_cleanup.killed_orphans", process_count=killed_count)
             else:
                 # Unix/Linux/Mac: Find and kill node processes
                 subprocess.run(
@@ -812,9 +2692,9 @@ def _cleanup_all_mcp_clients():
                     stderr=subprocess.DEVNULL
                 )
         except Exception as e:
-            print(f"[{datetime.now()}] ⚠️ Error during orphan process cleanup: {e}")
+            log_event(logging.WARNING, "mcp_cleanup.orphan_cleanup_failed", error=str(e))
 
-        print(f"[{datetime.now()}] ✅ MCP cleanup completed")
+        log_event(logging.INFO, "mcp_cleanup.completed")
 
 def _register_cleanup_handlers():
     """Register cleanup handlers for process exit"""
@@ -831,8 +2711,7 @@ def _register_cleanup_handlers():
 
     # Register signal handlers for forced termination
     def signal_handler(signum, frame):
-        from datetime import datetime
-        print(f"\n[{datetime.now()}] 🛑 Received signal {signum}, cleaning up...")
+        log_event(logging.WARNING, "process.signal_received", signal=signum)
         _cleanup_all_mcp_clients()
         import sys
         sys.exit(0)
@@ -847,21 +2726,26 @@ def _register_cleanup_handlers():
 
     _cleanup_registered = True
 
-async def load_mcp_tools(
-    config: RunnableConfig,
-    existing_tool_names: set[str],
-) -> list[BaseTool]:
-    """Load and configure MCP (Model Context Protocol) tools with authentication.
+def get_mcp_tool_schema_cache_dir(configurable: Configuration) -> Optional[str]:
+    """Get the MCP tool schema cache directory, or None if the cache is disabled."""
+    path = configurable.mcp_tool_schema_cache_path
+    if path is None:
+        path = os.path.join(get_default_cache_dir(), "mcp_tool_schemas")
+    return path or None
+
+async def get_mcp_client_pool(config: RunnableConfig) -> Optional[MCPClientPool]:
+    """Get (or create) the MCP client pool for the configured MCP server.
+
+    The pool is only registered here; its connections are opened on first use
+    or by prewarm_mcp_pool().
 
     Args:
         config: Runtime configuration containing MCP server details
-        existing_tool_names: Set of tool names already in use to avoid conflicts
 
     Returns:
-        List of configured MCP tools ready for use
+        The pool shared by every run with the same server configuration, or None
+        if MCP tools are not configured (or authentication is missing)
     """
-    global _mcp_clients
-
     # Register cleanup handlers on first call
     _register_cleanup_handlers()
 
@@ -876,7 +2760,7 @@ async def load_mcp_tools(
     # Step 2: Validate configuration requirements
     mcp_config = configurable.mcp_config
     if not mcp_config or not mcp_config.tools:
-        return []
+        return None
 
     # Validate based on transport type
     if mcp_config.transport == "stdio":
@@ -894,7 +2778,7 @@ async def load_mcp_tools(
         )
 
     if not config_valid:
-        return []
+        return None
 
     # Step 3: Set up MCP server connection based on transport
     if mcp_config.transport == "stdio":
@@ -925,54 +2809,87 @@ async def load_mcp_tools(
             }
         }
     # TODO: When Multi-MCP Server support is merged in OAP, update this code
-    
-    # Step 4: Load tools from MCP server using resource pool
-    try:
-        import asyncio
-        import time
-        import json
-        import hashlib
-        from datetime import datetime
 
-        # Create a cache key based on MCP server config
-        config_json = json.dumps(mcp_server_config, sort_keys=True)
-        cache_key = hashlib.md5(config_json.encode()).hexdigest()
+    # Step 4: Get or create the resource pool for this configuration
+    config_json = json.dumps(mcp_server_config, sort_keys=True)
+    cache_key = hashlib.md5(config_json.encode()).hexdigest()
+    if cache_key not in _mcp_client_pools:
+        _mcp_client_pools[cache_key] = MCPClientPool(
+            mcp_server_config,
+            min_size=configurable.mcp_pool_min_size,
+            max_size=configurable.mcp_pool_max_size,
+            grow_after_wait_seconds=configurable.mcp_pool_grow_after_wait_seconds,
+            idle_timeout_seconds=configurable.mcp_pool_idle_timeout_seconds,
+            tool_schema_cache_dir=get_mcp_tool_schema_cache_dir(configurable)
+        )
+        log_event(logging.INFO, "mcp.pool_registered", cache_key=cache_key[:8], pool_count=len(_mcp_client_pools))
+    return _mcp_client_pools[cache_key]
+
+async def prewarm_mcp_pool(config: RunnableConfig):
+    """Start the MCP client pool in the background, so server start-up overlaps other work.
 
-        print(f"[{datetime.now()}] 🔌 MCP: Starting MCP pool access (cache_key: {cache_key[:8]}...)")
-        start_time = time.time()
+    Called from the early graph nodes (clarification, research brief); researchers
+    then find the connections and the tool list ready. Skipped when the tool schema
+    cache can answer the tool list, so the servers only start once a tool is called.
+    Never raises.
 
-        # Get or create a resource pool for this configuration
-        global _mcp_client_pools
-        if cache_key not in _mcp_client_pools:
-            pool_size = _calculate_mcp_pool_size()
-            _mcp_client_pools[cache_key] = MCPClientPool(mcp_server_config, pool_size)
-            print(f"[{datetime.now()}] 🏊 MCP: Created new pool for cache_key {cache_key[:8]} (total pools: {len(_mcp_client_pools)})")
+    Args:
+        config: Runtime configuration containing MCP server details
+    """
+    try:
+        pool = await get_mcp_client_pool(config)
+    except Exception as e:
+        log_event(logging.WARNING, "mcp_pool.prewarm_failed", error=str(e))
+        return
+    if pool is None or pool.initialized or await pool.load_schema_cache():
+        return
+    pool.start()
+
+async def load_mcp_tools(
+    config: RunnableConfig,
+    existing_tool_names: set[str],
+) -> list[BaseTool]:
+    """Load and configure MCP (Model Context Protocol) tools with authentication.
+
+    Args:
+        config: Runtime configuration containing MCP server details
+        existing_tool_names: Set of tool names already in use to avoid conflicts
 
-        pool = _mcp_client_pools[cache_key]
+    Returns:
+        List of configured MCP tools ready for use
+    """
+    # Step 1: Validate the configuration and look up the resource pool
+    pool = await get_mcp_client_pool(config)
+    if pool is None:
+        return []
 
-        # Get cached tools from pool (initialized once, reused by all researchers)
+    # Step 2: Load tools from MCP server using resource pool
+    try:
+        # Get the pool's tool list (cached schemas or fetched once from the first connection, reused by all researchers)
         # This avoids stdio contention when multiple researchers request tools simultaneously
-        available_mcp_tools = await pool.get_cached_tools()
+        with span("mcp.get_tools", pool_initialized=pool.initialized):
+            available_mcp_tools = await pool.get_tools()
 
         # Attach pool reference to each tool for later acquire/release during tool calls
         for tool in available_mcp_tools:
             tool._mcp_pool = pool
 
     except asyncio.TimeoutError:
-        print(f"[{datetime.now()}] ⚠️  MCP: Pool access timed out")
+        log_event(logging.WARNING, "mcp.pool_access_timeout")
         warnings.warn(
             f"MCP pool access timed out - skipping MCP tools"
         )
         return []
     except Exception as e:
         # If MCP server connection fails, return empty list
-        print(f"[{datetime.now()}] ❌ MCP: Connection failed: {str(e)}")
+        log_event(logging.ERROR, "mcp.connection_failed", error=str(e))
         warnings.warn(
             f"MCP server connection failed: {str(e)} - skipping MCP tools"
         )
         return []
     
-    # Step 5: Filter and configure tools
+    # Step 3: Filter and configure tools
+    mcp_config = Configuration.from_runnable_config(config).mcp_config
     configured_tools = []
     for mcp_tool in available_mcp_tools:
         # Skip tools with conflicting names
@@ -993,6 +2910,448 @@ async def load_mcp_tools(
     return configured_tools
 
 
+##########################
+# Local Docs Utils
+##########################
+
+# In-process counterparts of the filesystem MCP server's tools, with the same names and
+# arguments. File I/O runs in worker threads; large files are memory-mapped so head/tail
+# reads only touch the pages they need.
+LOCAL_DOCS_MMAP_THRESHOLD_BYTES = 1024 * 1024
+LOCAL_DOCS_MAX_SEARCH_RESULTS = 500
+# Directory the full-text index is persisted in (hidden from the listing and search tools)
+LOCAL_DOCS_INDEX_DIRNAME = ".odr_index"
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+def resolve_local_docs_path(path: str, root: str) -> str:
+    """Resolve a path a researcher passed in, refusing anything outside the docs directory.
+
+    Relative paths are tried against the working directory (the docs path as the
+    user wrote it, e.g. "./test_docs/a.md") and then against the docs directory.
+
+    Args:
+        path: Path from the tool call
+        root: Local docs directory
+
+    Returns:
+        Absolute, symlink-resolved path inside root
+
+    Raises:
+        ToolException: If the path resolves outside root
+    """
+    root = os.path.realpath(root)
+    candidates = [path] if os.path.isabs(path) else [os.path.abspath(path), os.path.join(root, path)]
+    allowed = []
+    for candidate in candidates:
+        resolved = os.path.realpath(candidate)
+        if resolved == root or resolved.startswith(root + os.sep):
+            if os.path.exists(resolved):
+                return resolved
+            allowed.append(resolved)
+    if allowed:
+        return allowed[0]
+    raise ToolException(f"Access denied - path outside allowed directory: {path} not in {root}")
+
+def _get_local_docs_root(config: Optional[RunnableConfig]) -> str:
+    """Get the configured local docs directory for a tool call."""
+    root = Configuration.from_runnable_config(config).local_docs_path
+    if not root:
+        raise ToolException("No local documents directory is configured")
+    return root
+
+def _head_offset(data, size: int, lines: int) -> int:
+    """Byte offset just past the first `lines` lines."""
+    position = 0
+    for _ in range(lines):
+        position = data.find(b"\n", position)
+        if position < 0:
+            return size
+        position += 1
+    return position
+
+def _tail_offset(data, size: int, lines: int) -> int:
+    """Byte offset where the last `lines` lines start."""
+    position = size - 1 if data[size - 1:size] == b"\n" else size
+    for _ in range(lines):
+        position = data.rfind(b"\n", 0, position)
+        if position < 0:
+            return 0
+    return position + 1
+
+def read_local_text_file(path: str, head: Optional[int] = None, tail: Optional[int] = None) -> str:
+    """Read a text file, or only its first/last lines, memory-mapping large files.
+
+    Args:
+        path: Resolved file path
+        head: If set, return only the first N lines
+        tail: If set, return only the last N lines
+
+    Returns:
+        File content decoded as UTF-8 (undecodable bytes replaced)
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return ""
+    with open(path, "rb") as f:
+        if size < LOCAL_DOCS_MMAP_THRESHOLD_BYTES:
+            data = f.read()
+            mapped = None
+        else:
+            data = mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if head:
+                data = data[:_head_offset(data, size, head)]
+            elif tail:
+                data = data[_tail_offset(data, size, tail):]
+            elif mapped is not None:
+                data = mapped[:]
+            return data.decode("utf-8", errors="replace")
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+def list_local_directory(path: str) -> str:
+    """List a directory as "[DIR] name" / "[FILE] name" lines."""
+    with os.scandir(path) as entries:
+        lines = [
+            f"{'[DIR]' if entry.is_dir() else '[FILE]'} {entry.name}"
+            for entry in sorted(entries, key=lambda entry: entry.name)
+            if entry.name != LOCAL_DOCS_INDEX_DIRNAME
+        ]
+    return "\n".join(lines) or "Empty directory"
+
+def search_local_files(path: str, pattern: str, exclude_patterns: list[str]) -> str:
+    """Recursively find files and directories whose name matches a pattern.
+
+    Patterns with glob characters are matched against names and relative paths;
+    anything else is a case-insensitive substring of the name.
+    """
+    is_glob = bool(_GLOB_CHARS.search(pattern))
+    needle = pattern.lower()
+    matches = []
+    for directory, dirnames, filenames in os.walk(path):
+        relative_dir = os.path.relpath(directory, path)
+        dirnames[:] = [name for name in dirnames if name != LOCAL_DOCS_INDEX_DIRNAME]
+        for name in dirnames + filenames:
+            relative_path = os.path.normpath(os.path.join(relative_dir, name))
+            if any(fnmatch.fnmatch(relative_path, exclude) or fnmatch.fnmatch(name, exclude) for exclude in exclude_patterns):
+                continue
+            if is_glob:
+                matched = fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative_path, pattern)
+            else:
+                matched = needle in name.lower()
+            if matched:
+                matches.append(os.path.join(directory, name))
+                if len(matches) >= LOCAL_DOCS_MAX_SEARCH_RESULTS:
+                    return "\n".join(matches) + f"\n(stopped after {LOCAL_DOCS_MAX_SEARCH_RESULTS} matches - narrow the pattern)"
+        # Do not descend into excluded directories
+        dirnames[:] = [
+            name for name in dirnames
+            if not any(fnmatch.fnmatch(name, exclude) for exclude in exclude_patterns)
+        ]
+    return "\n".join(matches) or "No matches found"
+
+@tool(description="Get a detailed listing of all files and directories in a specified path. Results distinguish files and directories with [FILE] and [DIR] prefixes. Only works within the local documents directory.")
+async def list_directory(path: str, config: RunnableConfig = None) -> str:
+    """List a directory inside the local documents directory."""
+    resolved = resolve_local_docs_path(path, _get_local_docs_root(config))
+    if not os.path.isdir(resolved):
+        raise ToolException(f"Not a directory: {path}")
+    return await asyncio.to_thread(list_local_directory, resolved)
+
+@tool(description="Read the complete contents of a file as text. Use the 'head' parameter to read only the first N lines, or the 'tail' parameter to read only the last N lines. Only works within the local documents directory.")
+async def read_text_file(
+    path: str,
+    head: Optional[int] = None,
+    tail: Optional[int] = None,
+    config: RunnableConfig = None
+) -> str:
+    """Read a text file inside the local documents directory."""
+    if head and tail:
+        raise ToolException("Cannot specify both head and tail parameters simultaneously")
+    resolved = resolve_local_docs_path(path, _get_local_docs_root(config))
+    if not os.path.isfile(resolved):
+        raise ToolException(f"Not a file: {path}")
+    return await asyncio.to_thread(read_local_text_file, resolved, head, tail)
+
+@tool(description="Read the complete contents of a file as text. DEPRECATED: use read_text_file instead. Only works within the local documents directory.")
+async def read_file(path: str, config: RunnableConfig = None) -> str:
+    """Read a file inside the local documents directory (alias of read_text_file)."""
+    resolved = resolve_local_docs_path(path, _get_local_docs_root(config))
+    if not os.path.isfile(resolved):
+        raise ToolException(f"Not a file: {path}")
+    return await asyncio.to_thread(read_local_text_file, resolved)
+
+@tool(description="Recursively search for files and directories matching a pattern, starting from a directory. Glob patterns ('*.md', '**/report*') match names and relative paths; plain text matches any name containing it, case-insensitively. Returns full paths. Only searches within the local documents directory.")
+async def search_files(
+    path: str,
+    pattern: str,
+    excludePatterns: Optional[list[str]] = None,
+    config: RunnableConfig = None
+) -> str:
+    """Search file names inside the local documents directory."""
+    resolved = resolve_local_docs_path(path, _get_local_docs_root(config))
+    if not os.path.isdir(resolved):
+        raise ToolException(f"Not a directory: {path}")
+    return await asyncio.to_thread(search_local_files, resolved, pattern, excludePatterns or [])
+
+# Full-text index over the local docs directory: passages scored with BM25, persisted
+# next to the corpus and refreshed incrementally by file mtime/size
+LOCAL_DOCS_INDEX_VERSION = 1
+LOCAL_DOCS_INDEX_EXTENSIONS = {
+    ".md", ".markdown", ".txt", ".rst", ".csv", ".tsv", ".json", ".jsonl",
+    ".html", ".htm", ".xml", ".yaml", ".yml", ".tex", ".log",
+}
+LOCAL_DOCS_INDEX_RESCAN_SECONDS = 10
+LOCAL_DOCS_PASSAGE_CHARS = 600
+LOCAL_DOCS_BM25_K1 = 1.2
+LOCAL_DOCS_BM25_B = 0.75
+# Latin/digit words, or runs of CJK ideographs, kana and hangul
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_INDEX_TOKEN_PATTERN = re.compile(rf"[0-9a-z\u00c0-\u024f]+|[{_CJK_CHARS}]+")
+_CJK_RUN = re.compile(rf"[{_CJK_CHARS}]")
+
+def tokenize_for_index(text: str) -> list[str]:
+    """Tokenize text for the BM25 index.
+
+    Latin words are lowercased as-is; CJK runs (which have no word boundaries) become
+    their characters plus overlapping character bigrams, so "耕地保护" matches "耕地",
+    "保护" and a one-character query such as "地".
+    """
+    tokens = []
+    for run in _INDEX_TOKEN_PATTERN.findall(text.lower()):
+        if _CJK_RUN.match(run):
+            tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+def split_into_passages(text: str, max_chars: int = LOCAL_DOCS_PASSAGE_CHARS) -> list[dict]:
+    """Split a document into passages of whole paragraphs, each up to about max_chars.
+
+    Returns:
+        List of {"line": first line number (1-based), "heading": nearest markdown heading, "text": passage}
+    """
+    passages = []
+    heading = ""
+    current, current_line, current_heading = [], 1, ""
+
+    def flush():
+        if current:
+            passages.append({"line": current_line, "heading": current_heading, "text": "\n".join(current)})
+            current.clear()
+
+    paragraph, paragraph_line = [], 1
+    for line_number, line in enumerate(text.splitlines() + [""], start=1):
+        if line.strip():
+            if not paragraph:
+                paragraph_line = line_number
+            paragraph.append(line)
+            continue
+        if not paragraph:
+            continue
+        block = "\n".join(paragraph)
+        paragraph = []
+        if block.lstrip().startswith("#"):
+            # A heading starts a new passage and labels the ones that follow
+            flush()
+            heading = block.strip().lstrip("#").strip()
+        if current and sum(len(part) for part in current) + len(block) > max_chars:
+            flush()
+        if not current:
+            current_line, current_heading = paragraph_line, heading
+        # Paragraphs longer than a passage are cut into passage-sized pieces
+        while len(block) > max_chars:
+            current.append(block[:max_chars])
+            flush()
+            block = block[max_chars:]
+            current_line, current_heading = paragraph_line, heading
+        current.append(block)
+    flush()
+    return passages
+
+class LocalDocsIndex:
+    """BM25 full-text index over the text files of a local docs directory.
+
+    Architecture:
+    - Per-file passages persisted as JSON in <root>/.odr_index/, keyed by relative path
+      with the (mtime, size) they were built from
+    - Refreshes re-read only new or changed files and drop deleted ones; they run in a
+      worker thread and swap in a new immutable snapshot, so searches never block on them
+    - The first refresh is started in the background at graph start; later searches
+      rescan at most every LOCAL_DOCS_INDEX_RESCAN_SECONDS
+    """
+
+    def __init__(self, root: str):
+        """Initialize the index for a docs directory.
+
+        Args:
+            root: Local docs directory
+        """
+        self.root = os.path.realpath(root)
+        self.index_path = os.path.join(self.root, LOCAL_DOCS_INDEX_DIRNAME, "bm25.json")
+        self.files: dict[str, dict] = {}  # relative path -> {"mtime", "size", "passages"}
+        self.snapshot: Optional[dict] = None
+        self.last_refresh = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _load(self):
+        """Load persisted passages, ignoring a missing, unreadable or outdated index file."""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == LOCAL_DOCS_INDEX_VERSION:
+                self.files = data["files"]
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def _save(self):
+        """Persist passages atomically; an unwritable docs directory only disables persistence."""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": LOCAL_DOCS_INDEX_VERSION, "files": self.files}, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            log_event(logging.WARNING, "local_docs_index.write_failed", root=self.root, error=str(e))
+
+    def _scan(self) -> dict[str, os.stat_result]:
+        """Find indexable files under the root, skipping hidden files and directories."""
+        found = {}
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            for name in filenames:
+                if name.startswith(".") or os.path.splitext(name)[1].lower() not in LOCAL_DOCS_INDEX_EXTENSIONS:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    found[os.path.relpath(path, self.root)] = os.stat(path)
+                except OSError:
+                    continue
+        return found
+
+    def refresh(self):
+        """Bring the index up to date with the directory (blocking; run in a worker thread)."""
+        with span("local_docs_index.refresh", root=self.root) as fields:
+            if self.snapshot is None:
+                self._load()
+            found = self._scan()
+            changed = 0
+            files = {path: entry for path, entry in self.files.items() if path in found}
+            removed = len(self.files) - len(files)
+            for path, stat in found.items():
+                entry = files.get(path)
+                if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    continue
+                try:
+                    text = read_local_text_file(os.path.join(self.root, path))
+                except OSError as e:
+                    log_event(logging.WARNING, "local_docs_index.read_failed", path=path, error=str(e))
+                    continue
+                files[path] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "passages": split_into_passages(text)}
+                changed += 1
+            self.files = files
+            if changed or removed or self.snapshot is None:
+                self.snapshot = self._build_snapshot(files)
+            if changed or removed:
+                self._save()
+            self.last_refresh = time.monotonic()
+            fields.update(files=len(files), changed=changed, removed=removed)
+
+    @staticmethod
+    def _build_snapshot(files: dict[str, dict]) -> dict:
+        """Build the in-memory postings (term -> [(passage id, term frequency)])."""
+        passages, lengths = [], []
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for path, entry in sorted(files.items()):
+            for passage in entry["passages"]:
+                passage_id = len(passages)
+                passages.append((path, passage))
+                counts: dict[str, int] = {}
+                for token in tokenize_for_index(passage["heading"] + "\n" + passage["text"]):
+                    counts[token] = counts.get(token, 0) + 1
+                lengths.append(sum(counts.values()))
+                for token, count in counts.items():
+                    postings.setdefault(token, []).append((passage_id, count))
+        return {
+            "passages": passages,
+            "lengths": lengths,
+            "postings": postings,
+            "average_length": (sum(lengths) / len(lengths)) if lengths else 0.0,
+        }
+
+    def start(self) -> asyncio.Task:
+        """Start a background refresh unless one is running (idempotent)."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(asyncio.to_thread(self.refresh))
+        return self._refresh_task
+
+    async def ensure_fresh(self):
+        """Wait for the first build, and rescan for changed files if the last scan is stale."""
+        if self.snapshot is None or time.monotonic() - self.last_refresh > LOCAL_DOCS_INDEX_RESCAN_SECONDS:
+            await asyncio.shield(self.start())
+
+    def search(self, query: str, max_results: int) -> list[tuple[float, str, dict]]:
+        """Score passages against a query with BM25.
+
+        Returns:
+            Up to max_results (score, relative path, passage) tuples, best first
+        """
+        snapshot = self.snapshot
+        if not snapshot or not snapshot["passages"]:
+            return []
+        total = len(snapshot["passages"])
+        scores: dict[int, float] = {}
+        for token in set(tokenize_for_index(query)):
+            matches = snapshot["postings"].get(token)
+            if not matches:
+                continue
+            idf = math.log(1 + (total - len(matches) + 0.5) / (len(matches) + 0.5))
+            for passage_id, frequency in matches:
+                length_norm = 1 - LOCAL_DOCS_BM25_B + LOCAL_DOCS_BM25_B * snapshot["lengths"][passage_id] / snapshot["average_length"]
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * frequency * (LOCAL_DOCS_BM25_K1 + 1) / (frequency + LOCAL_DOCS_BM25_K1 * length_norm)
+        best = heapq.nlargest(max_results, scores.items(), key=lambda item: item[1])
+        return [(score, *snapshot["passages"][passage_id]) for passage_id, score in best]
+
+_local_docs_indexes: dict[str, LocalDocsIndex] = {}  # Indexes by docs directory
+
+def get_local_docs_index(root: str) -> LocalDocsIndex:
+    """Get the process-wide index for a docs directory."""
+    root = os.path.realpath(root)
+    if root not in _local_docs_indexes:
+        _local_docs_indexes[root] = LocalDocsIndex(root)
+    return _local_docs_indexes[root]
+
+def prewarm_local_docs_index(config: RunnableConfig):
+    """Start building the local docs index in the background, if a docs directory is configured."""
+    root = Configuration.from_runnable_config(config).local_docs_path
+    if root and os.path.isdir(root):
+        get_local_docs_index(root).start()
+
+@tool(description="Full-text search over the local documents. Returns the best-matching passages ranked by relevance, each with its file path and line number, so you can cite it or read around it with read_text_file. Prefer this over reading whole files when looking for specific facts. Works for Chinese and English queries.")
+async def search_local_docs(query: str, max_results: int = 5, config: RunnableConfig = None) -> str:
+    """Search the local documents index and format the ranked passages."""
+    index = get_local_docs_index(_get_local_docs_root(config))
+    await index.ensure_fresh()
+    results = await asyncio.to_thread(index.search, query, max(1, min(max_results, 20)))
+    if not results:
+        return f"No local document passages matched: {query}"
+    formatted_output = f"Local document passages for '{query}':\n\n"
+    for i, (score, path, passage) in enumerate(results, start=1):
+        location = f"{os.path.join(index.root, path)}, line {passage['line']}"
+        if passage["heading"]:
+            location += f", section: {passage['heading']}"
+        formatted_output += f"--- PASSAGE {i} (score {score:.2f}) ---\n{location}\n\n{passage['text']}\n\n"
+    return formatted_output
+
+def get_local_docs_tools(configurable: Configuration) -> list[BaseTool]:
+    """Get the in-process local document tools, if a local docs directory is configured."""
+    if not configurable.local_docs_path:
+        return []
+    return [search_local_docs, list_directory, read_text_file, read_file, search_files]
+
 ##########################
 # Tool Utils
 ##########################
@@ -1052,6 +3411,9 @@ async def get_all_tools(config: RunnableConfig):
     search_api = SearchAPI(get_config_value(configurable.search_api))
     search_tools = await get_search_tool(search_api)
     tools.extend(search_tools)
+
+    # Add the in-process local document tools if a docs directory is configured
+    tools.extend(get_local_docs_tools(configurable))
     
     # Track existing tool names to prevent conflicts
     existing_tool_names = {
@@ -1065,9 +3427,218 @@ async def get_all_tools(config: RunnableConfig):
     
     return tools
 
+class ResearchToolkit:
+    """Tools available to researchers for one configuration, assembled once.
+
+    Researchers call get_research_toolkit() on every ReAct iteration; the toolkit is
+    memoized by a fingerprint of the tool-relevant configuration (search API and MCP
+    settings), so search/MCP tool discovery and MCP tool wrapping run once instead of
+    on every step. Because the tool objects are stable, the tool-bound research model
+    is memoized as well (see get_configured_chat_model_with_tools).
+    """
+
+    def __init__(self, tools: list):
+        """Initialize the toolkit.
+
+        Args:
+            tools: Assembled research, search and MCP tools
+        """
+        self.tools = tools
+        self.tools_by_name = {
+            tool.name if hasattr(tool, "name") else tool.get("name", "web_search"): tool
+            for tool in tools
+        }
+
+RESEARCH_TOOLKIT_CACHE_SIZE = 32
+_research_toolkits: OrderedDict = OrderedDict()  # Toolkit build tasks by config fingerprint
+
+def get_toolkit_fingerprint(config: RunnableConfig) -> Optional[str]:
+    """Fingerprint the configuration that determines the researcher toolkit.
+
+    Args:
+        config: Runtime configuration specifying search API and MCP settings
+
+    Returns:
+        Hex digest, or None if the toolkit must not be memoized (per-user MCP auth)
+    """
+    configurable = Configuration.from_runnable_config(config)
+    mcp_config = configurable.mcp_config
+    if mcp_config and mcp_config.auth_required:
+        # Authenticated MCP tools depend on per-user tokens that expire
+        return None
+
+    payload = {
+        "search_api": get_config_value(configurable.search_api),
+        "mcp_config": mcp_config.model_dump() if mcp_config else None,
+        "local_docs_path": configurable.local_docs_path,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+async def get_research_toolkit(config: RunnableConfig) -> ResearchToolkit:
+    """Get the memoized researcher toolkit for a configuration.
+
+    Args:
+        config: Runtime configuration specifying search API and MCP settings
+
+    Returns:
+        ResearchToolkit shared by every researcher with the same tool configuration
+    """
+    fingerprint = get_toolkit_fingerprint(config)
+    if fingerprint is None:
+        return ResearchToolkit(await get_all_tools(config))
+
+    build_task = _research_toolkits.get(fingerprint)
+    if build_task is None or (build_task.done() and build_task.exception() is not None):
+        # Concurrent researchers share one build instead of assembling tools in parallel
+        build_task = asyncio.ensure_future(get_all_tools(config))
+        _research_toolkits[fingerprint] = build_task
+        while len(_research_toolkits) > RESEARCH_TOOLKIT_CACHE_SIZE:
+            _research_toolkits.popitem(last=False)
+    else:
+        _research_toolkits.move_to_end(fingerprint)
+
+    tools = await asyncio.shield(build_task)
+    toolkit = getattr(build_task, "toolkit", None)
+    if toolkit is None:
+        toolkit = build_task.toolkit = ResearchToolkit(tools)
+
+        # MCP tools missing although configured means the server failed - retry next time
+        configurable = Configuration.from_runnable_config(config)
+        expected_mcp_tools = set(configurable.mcp_config.tools or []) if configurable.mcp_config else set()
+        if expected_mcp_tools and not expected_mcp_tools & set(toolkit.tools_by_name):
+            if _research_toolkits.get(fingerprint) is build_task:
+                del _research_toolkits[fingerprint]
+    return toolkit
+
 def get_notes_from_tool_calls(messages: list[MessageLikeRepresentation]):
-    """Extract notes from tool call messages."""
-    return [tool_msg.content for tool_msg in filter_messages(messages, include_types="tool")]
+    """Extract notes from successful tool call messages and background research deliveries."""
+    return [
+        message.content
+        for message in filter_messages(messages, include_types=["tool", "human"])
+        if (
+            message.type == "tool"
+            and message.status != "error"
+            and not str(message.content).startswith(BACKGROUND_RESEARCH_PENDING_PREFIX)
+        )
+        or (message.type == "human" and message.name == BACKGROUND_RESEARCH_MESSAGE_NAME)
+    ]
+
+##########################
+# Background Research Utils
+##########################
+
+BACKGROUND_RESEARCH_MESSAGE_NAME = "background_research"
+BACKGROUND_RESEARCH_PENDING_PREFIX = "[Research still running]"
+
+# Research units left running after a supervisor step, per thread: thread_id -> tool_call_id -> (topic, task)
+_background_research: dict[str, dict[str, tuple[str, asyncio.Task]]] = {}
+
+def emit_research_progress(event: dict):
+    """Send a research progress event to stream_mode="custom" consumers, if any."""
+    try:
+        get_stream_writer()(event)
+    except RuntimeError:
+        # Called outside a graph run - nobody is listening
+        pass
+
+def register_background_research(thread_id: str, tool_call_id: str, topic: str, task: asyncio.Task):
+    """Keep a still-running research unit so its result can be delivered in a later step."""
+    _background_research.setdefault(thread_id, {})[tool_call_id] = (topic, task)
+
+def background_research_message_id(tool_call_id: str) -> str:
+    """Id of the message delivering a background research unit's findings (or failure)."""
+    return f"{BACKGROUND_RESEARCH_MESSAGE_NAME}:{tool_call_id}"
+
+def find_orphaned_background_research(thread_id: Optional[str], messages: list) -> list[dict]:
+    """Find research units sent to the background that neither delivered nor run in this process.
+
+    The registry only lives in memory, so after a crash or a resumed run the supervisor
+    history can still say a unit is running in the background while nothing is.
+
+    Args:
+        thread_id: Thread the research units belong to
+        messages: Supervisor message history
+
+    Returns:
+        The ConductResearch tool calls to run again
+    """
+    running = _background_research.get(thread_id, {})
+    delivered = {message.id for message in messages if message.type == "human" and message.id}
+    tool_calls = {
+        tool_call["id"]: tool_call
+        for message in messages if message.type == "ai"
+        for tool_call in message.tool_calls
+    }
+    return [
+        tool_calls[message.tool_call_id]
+        for message in messages
+        if message.type == "tool"
+        and str(message.content).startswith(BACKGROUND_RESEARCH_PENDING_PREFIX)
+        and message.tool_call_id in tool_calls
+        and message.tool_call_id not in running
+        and background_research_message_id(message.tool_call_id) not in delivered
+    ]
+
+def _collect_background_result(task: asyncio.Task):
+    """Return a finished task's result, or the exception it failed with."""
+    if task.cancelled():
+        return asyncio.CancelledError("Background research was cancelled")
+    return task.exception() or task.result()
+
+def pop_finished_background_research(thread_id: Optional[str]) -> list[tuple[str, str, Any]]:
+    """Take the background research units of a thread that have finished.
+
+    Args:
+        thread_id: Thread the research units belong to
+
+    Returns:
+        (tool_call_id, topic, result or exception) for each finished unit
+    """
+    running = _background_research.get(thread_id, {})
+    finished = [
+        (tool_call_id, topic, _collect_background_result(task))
+        for tool_call_id, (topic, task) in running.items()
+        if task.done()
+    ]
+    for tool_call_id, _, _ in finished:
+        del running[tool_call_id]
+    if not running:
+        _background_research.pop(thread_id, None)
+    return finished
+
+async def drain_background_research(thread_id: Optional[str]) -> list[tuple[str, str, Any]]:
+    """Wait for every background research unit of a thread and take their results.
+
+    Args:
+        thread_id: Thread the research units belong to
+
+    Returns:
+        (tool_call_id, topic, result or exception) for each unit
+    """
+    running = _background_research.get(thread_id, {})
+    if running:
+        await asyncio.wait([task for _, task in running.values()])
+    return pop_finished_background_research(thread_id)
+
+def cancel_background_research(thread_id: Optional[str]) -> int:
+    """Cancel and forget every background research unit of a thread.
+
+    Used when a run is cancelled or fails before the research phase drains its
+    stragglers, so they neither keep running nor stay referenced.
+
+    Args:
+        thread_id: Thread the research units belong to
+
+    Returns:
+        Number of units that were still running
+    """
+    running = _background_research.pop(thread_id, {})
+    cancelled = 0
+    for _, task in running.values():
+        if not task.done():
+            task.cancel()
+            cancelled += 1
+    return cancelled
 
 ##########################
 # Model Provider Native Websearch Utils
@@ -1326,6 +3897,257 @@ def get_model_token_limit(model_string):
     # Model not found in lookup table
     return None
 
+##########################
+# Context Budget Utils
+##########################
+
+CONTEXT_BUDGET_SAFETY_MARGIN = 0.9  # Headroom for token estimation error
+MIN_CONDENSED_NOTE_TOKENS = 256  # Below this share, drop whole notes instead of condensing all of them
+MIN_REPORT_CLUSTER_TOKENS = 4000  # Smallest group of notes worth a separate section draft
+ELIDED_TOOL_OUTPUT_TOKENS = 200  # Head excerpt kept from a compacted tool output
+TOOL_OUTPUT_DIGEST_TOKENS = 300  # Size of the digest that replaces a tool output outside the context window
+DIGEST_SOURCE_SNIPPET_CHARS = 200  # Leading summary text kept per search source in a digest
+CONDENSED_NOTE_MARKER = "\n[... condensed to fit the context window ...]"
+
+def get_prompt_token_budget(model_name: str, max_output_tokens: int, fixed_prompt_tokens: int = 0) -> Optional[int]:
+    """Estimate how many prompt tokens are left for variable content in a model call.
+
+    Args:
+        model_name: Model identifier looked up in MODEL_TOKEN_LIMITS
+        max_output_tokens: Configured max output tokens (reserved, capped at half the context)
+        fixed_prompt_tokens: Tokens already used by the fixed part of the prompt
+
+    Returns:
+        Token budget for the variable content, or None if the model's limit is unknown
+    """
+    model_token_limit = get_model_token_limit(model_name)
+    if not model_token_limit:
+        return None
+    reserved_output_tokens = min(max_output_tokens, model_token_limit // 2)
+    usable_tokens = int((model_token_limit - reserved_output_tokens) * CONTEXT_BUDGET_SAFETY_MARGIN)
+    return max(0, usable_tokens - fixed_prompt_tokens)
+
+def condense_text(text: str, max_tokens: int, text_tokens: Optional[int] = None) -> str:
+    """Shorten text to roughly max_tokens, cutting at paragraph or sentence boundaries.
+
+    Args:
+        text: Text to condense
+        max_tokens: Target token count
+        text_tokens: Pre-computed token estimate of text
+
+    Returns:
+        The text itself if it fits, otherwise its leading part with a condensation marker
+    """
+    text_tokens = estimate_token_count(text) if text_tokens is None else text_tokens
+    if text_tokens <= max_tokens:
+        return text
+    max_tokens = max(0, max_tokens - estimate_token_count(CONDENSED_NOTE_MARKER))
+
+    # Keep whole leading paragraphs while they fit
+    kept_paragraphs = []
+    used_tokens = 0
+    for paragraph in text.split("\n"):
+        paragraph_tokens = estimate_token_count(paragraph) + 1
+        if used_tokens + paragraph_tokens > max_tokens:
+            break
+        kept_paragraphs.append(paragraph)
+        used_tokens += paragraph_tokens
+    if kept_paragraphs and used_tokens >= max_tokens // 2:
+        return "\n".join(kept_paragraphs).rstrip() + CONDENSED_NOTE_MARKER
+
+    # Otherwise find the longest prefix within budget and back off to the last sentence end
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_token_count(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    cut = low
+    head = text[:cut]
+    sentence_end = max(head.rfind(mark) for mark in ("。", "！", "？", ". ", "! ", "? ", "\n"))
+    if sentence_end > cut // 2:
+        head = head[:sentence_end + 1]
+    return head.rstrip() + CONDENSED_NOTE_MARKER
+
+def is_reflection_note(note: str) -> bool:
+    """Check whether a note is a think_tool reflection rather than research findings."""
+    return note.startswith("Reflection recorded:")
+
+def pack_findings(notes: list[str], token_budget: int, note_tokens: Optional[list[int]] = None) -> str:
+    """Pack research notes into a token budget, keeping or condensing whole notes.
+
+    Priority order:
+    1. All notes verbatim if they fit
+    2. Drop think_tool reflections (lowest priority)
+    3. Give every remaining note a fair share: notes below the share stay verbatim,
+       larger ones are condensed at paragraph/sentence boundaries
+    4. If the fair share gets too small, keep notes in order until the budget is spent
+
+    Args:
+        notes: Research notes in collection order
+        token_budget: Maximum tokens for the packed findings
+        note_tokens: Pre-computed token estimates for notes (computed if omitted)
+
+    Returns:
+        Findings string that fits the budget
+    """
+    if note_tokens is None:
+        note_tokens = [estimate_token_count(note) for note in notes]
+    if sum(note_tokens) <= token_budget:
+        return "\n".join(notes)
+
+    # Drop reflections first
+    indexed_notes = [
+        (note, tokens) for note, tokens in zip(notes, note_tokens)
+        if not is_reflection_note(note)
+    ]
+    if sum(tokens for _, tokens in indexed_notes) <= token_budget:
+        return "\n".join(note for note, _ in indexed_notes)
+
+    # Water-fill: find the largest per-note cap such that sum(min(tokens, cap)) fits
+    remaining_budget = token_budget
+    remaining_notes = len(indexed_notes)
+    note_cap = 0
+    for tokens in sorted(tokens for _, tokens in indexed_notes):
+        fair_share = remaining_budget // remaining_notes
+        if tokens > fair_share:
+            note_cap = fair_share
+            break
+        remaining_budget -= tokens
+        remaining_notes -= 1
+
+    if note_cap >= MIN_CONDENSED_NOTE_TOKENS:
+        return "\n".join(
+            condense_text(note, note_cap, tokens) for note, tokens in indexed_notes
+        )
+
+    # Too many notes to condense them all meaningfully - keep them in order
+    packed_notes = []
+    remaining_budget = token_budget
+    for note, tokens in indexed_notes:
+        if remaining_budget < MIN_CONDENSED_NOTE_TOKENS:
+            break
+        packed_notes.append(condense_text(note, remaining_budget, tokens))
+        remaining_budget -= min(tokens, remaining_budget)
+    return "\n".join(packed_notes)
+
+def compact_messages(messages: list[BaseMessage], token_budget: int) -> tuple[list[BaseMessage], dict]:
+    """Elide the oldest tool outputs of a message history until it fits a token budget.
+
+    Tool outputs are cut to a head excerpt (with a condensation marker), oldest
+    first, and the last one only as far as needed. Other messages are kept verbatim,
+    so the history may still exceed the budget if it is dominated by them.
+
+    Args:
+        messages: Message history in order
+        token_budget: Token budget for the whole history
+
+    Returns:
+        The compacted history and stats: tokens before/after and tool outputs elided
+    """
+    message_tokens = [estimate_message_tokens([message]) for message in messages]
+    tokens_before = sum(message_tokens)
+    overflow = tokens_before - token_budget
+    compacted = list(messages)
+    elided_count = 0
+    for index, message in enumerate(messages):
+        if overflow <= 0:
+            break
+        if not isinstance(message, ToolMessage) or message_tokens[index] <= ELIDED_TOOL_OUTPUT_TOKENS:
+            continue
+        content = str(message.content)
+        content_tokens = estimate_token_count(content)
+        target_tokens = max(ELIDED_TOOL_OUTPUT_TOKENS, content_tokens - overflow)
+        condensed_content = condense_text(content, target_tokens, content_tokens)
+        if condensed_content == content:
+            continue
+        compacted[index] = message.model_copy(update={"content": condensed_content})
+        overflow -= content_tokens - estimate_token_count(condensed_content)
+        elided_count += 1
+    return compacted, {
+        "tokens_before": tokens_before,
+        "tokens_after": token_budget + overflow,
+        "tool_outputs_elided": elided_count
+    }
+
+def make_tool_output_digest(content: str) -> str:
+    """Build a compact digest of a tool output for older turns of the researcher loop.
+
+    Search results keep each source's title, URL and the start of its summary;
+    other outputs keep a head excerpt.
+
+    Args:
+        content: Full tool output
+
+    Returns:
+        Digest of at most roughly TOOL_OUTPUT_DIGEST_TOKENS tokens
+    """
+    sources = re.findall(r"--- SOURCE (\d+): (.*?) ---\nURL: (\S+)\n\nSUMMARY:\n(.*?)(?=\n-{80}|\Z)", content, re.DOTALL)
+    if not sources:
+        return condense_text(content, TOOL_OUTPUT_DIGEST_TOKENS)
+    digest_lines = [f"[Digest of {len(sources)} search results]"]
+    for number, title, url, summary in sources:
+        summary_text = re.sub(r"</?(summary|key_excerpts)>", "", summary).strip()
+        snippet = " ".join(summary_text.split())[:DIGEST_SOURCE_SNIPPET_CHARS]
+        digest_lines.append(f"{number}. {title} ({url}): {snippet}")
+    return condense_text("\n".join(digest_lines), TOOL_OUTPUT_DIGEST_TOKENS)
+
+def apply_context_window(messages: list[BaseMessage], digests: dict[str, str], window: int) -> list[BaseMessage]:
+    """Keep the last tool exchanges verbatim and replace older tool outputs with digests.
+
+    An exchange is an AI message with tool calls plus the tool messages answering it.
+
+    Args:
+        messages: Researcher message history
+        digests: Tool output digests keyed by tool_call_id
+        window: Number of most recent exchanges kept verbatim (0 keeps everything)
+
+    Returns:
+        The windowed message history
+    """
+    if window <= 0:
+        return messages
+    exchange_starts = [
+        index for index, message in enumerate(messages)
+        if isinstance(message, AIMessage) and message.tool_calls
+    ]
+    if len(exchange_starts) <= window:
+        return messages
+    window_start = exchange_starts[-window]
+    return [
+        message.model_copy(update={"content": digests[message.tool_call_id]})
+        if index < window_start and isinstance(message, ToolMessage) and message.tool_call_id in digests
+        else message
+        for index, message in enumerate(messages)
+    ]
+
+def cluster_notes(note_tokens: list[int], cluster_budget: int) -> list[list[int]]:
+    """Group consecutive notes into clusters that each fit a token budget.
+
+    Notes larger than the budget get a cluster of their own (and are condensed
+    when the cluster is packed).
+
+    Args:
+        note_tokens: Token estimate of each note, in collection order
+        cluster_budget: Maximum tokens per cluster
+
+    Returns:
+        Clusters as lists of note indices
+    """
+    clusters: list[list[int]] = []
+    current_cluster: list[int] = []
+    current_tokens = 0
+    for index, tokens in enumerate(note_tokens):
+        if current_cluster and current_tokens + tokens > cluster_budget:
+            clusters.append(current_cluster)
+            current_cluster, current_tokens = [], 0
+        current_cluster.append(index)
+        current_tokens += tokens
+    if current_cluster:
+        clusters.append(current_cluster)
+    return clusters
+
 def remove_up_to_last_ai_message(messages: list[MessageLikeRepresentation]) -> list[MessageLikeRepresentation]:
     """Truncate message history by removing up to the last AI message.
     
@@ -1346,6 +4168,206 @@ def remove_up_to_last_ai_message(messages: list[MessageLikeRepresentation]) -> l
     # No AI messages found, return original list
     return messages
 
+##########################
+# Run Metrics Utils
+##########################
+
+# Graph nodes attributed to each reported phase (research_supervisor is the sum of its subgraph nodes)
+METRICS_NODE_PHASES = {
+    "clarify_with_user": "clarify",
+    "write_research_brief": "brief",
+    "supervisor": "supervisor",
+    "supervisor_tools": "supervisor",
+    "researcher": "researcher",
+    "researcher_tools": "researcher",
+    "compress_research": "compress",
+    "final_report_generation": "final_report",
+}
+
+def _new_phase_metrics() -> dict:
+    """Create an empty metrics bucket."""
+    return {
+        "node_seconds": 0.0,
+        "llm_calls": 0,
+        "llm_errors": 0,
+        "llm_seconds": 0.0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "tool_calls": 0,
+        "tool_seconds": 0.0,
+        "search_queries": 0,
+        "pages_summarized": 0,
+        "summary_cache_hits": 0,
+        "summary_dedup_hits": 0,
+    }
+
+async def dispatch_metrics_event(name: str, data: dict, config: Optional[RunnableConfig]):
+    """Report a metrics event (searches, cache hits) to the run's callback handlers, if any."""
+    if config is None:
+        return
+    try:
+        await adispatch_custom_event(name, data, config=config)
+    except RuntimeError:
+        # Not inside a traced run - nobody is listening
+        pass
+
+class RunMetricsCollector(AsyncCallbackHandler):
+    """Callback handler that accounts tokens, calls, time and cache hits for a whole run.
+
+    Pass it in the run config's callbacks. Every event is attributed to a phase
+    through the graph node in its metadata (langgraph_node), and to a research
+    unit through the research_unit_id metadata set by the supervisor.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        """Initialize an empty collector; the run's wall clock starts now."""
+        self.started_at = time.time()
+        self.phases: dict[str, dict] = {}
+        self.research_units: dict[str, dict] = {}
+        self._runs: dict[UUID, tuple[float, dict]] = {}
+
+    def _buckets(self, metadata: Optional[dict]) -> list[dict]:
+        """Get the phase (and research unit) metrics buckets an event belongs to."""
+        metadata = metadata or {}
+        phase = METRICS_NODE_PHASES.get(metadata.get("langgraph_node"), "other")
+        buckets = [self.phases.setdefault(phase, _new_phase_metrics())]
+        unit_id = metadata.get("research_unit_id")
+        if unit_id:
+            unit = self.research_units.setdefault(unit_id, {
+                "research_topic": metadata.get("research_topic", ""),
+                "started_at": time.time(),
+                "finished_at": time.time(),
+                **_new_phase_metrics()
+            })
+            buckets.append(unit)
+        return buckets
+
+    def _start(self, run_id: UUID, metadata: Optional[dict]):
+        """Remember when a run started (this also starts its research unit's wall clock)."""
+        self._buckets(metadata)
+        self._runs[run_id] = (time.time(), metadata or {})
+
+    def _finish(self, run_id: UUID) -> Optional[tuple[float, list[dict]]]:
+        """Get a finished run's duration and buckets."""
+        started = self._runs.pop(run_id, None)
+        if started is None:
+            return None
+        start_time, metadata = started
+        buckets = self._buckets(metadata)
+        now = time.time()
+        for bucket in buckets:
+            if "finished_at" in bucket:
+                bucket["finished_at"] = max(bucket["finished_at"], now)
+        return now - start_time, buckets
+
+    async def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs: Any):
+        """Time graph node runs (the chain named after its own node)."""
+        node = (metadata or {}).get("langgraph_node")
+        if node in METRICS_NODE_PHASES and kwargs.get("name") == node:
+            self._start(run_id, metadata)
+
+    async def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any):
+        """Add a finished node's time to its phase."""
+        finished = self._finish(run_id)
+        if finished:
+            duration, buckets = finished
+            for bucket in buckets:
+                bucket["node_seconds"] += duration
+
+    async def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Add a failed node's time to its phase."""
+        await self.on_chain_end(None, run_id=run_id)
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs: Any):
+        """Start timing an LLM call."""
+        self._start(run_id, metadata)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        """Count a finished LLM call and its token usage."""
+        finished = self._finish(run_id)
+        if not finished:
+            return
+        duration, buckets = finished
+        input_tokens, output_tokens = get_llm_result_usage(response)
+        total_tokens = (input_tokens + output_tokens) or get_llm_result_token_usage(response) or 0
+        for bucket in buckets:
+            bucket["llm_calls"] += 1
+            bucket["llm_seconds"] += duration
+            bucket["input_tokens"] += input_tokens
+            bucket["output_tokens"] += output_tokens
+            bucket["total_tokens"] += total_tokens
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Count a failed LLM call."""
+        finished = self._finish(run_id)
+        if finished:
+            duration, buckets = finished
+            for bucket in buckets:
+                bucket["llm_errors"] += 1
+                bucket["llm_seconds"] += duration
+
+    async def on_tool_start(self, serialized, input_str, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs: Any):
+        """Start timing a tool call."""
+        self._start(run_id, metadata)
+
+    async def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any):
+        """Count a finished tool call."""
+        finished = self._finish(run_id)
+        if finished:
+            duration, buckets = finished
+            for bucket in buckets:
+                bucket["tool_calls"] += 1
+                bucket["tool_seconds"] += duration
+
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """Count a failed tool call."""
+        await self.on_tool_end(None, run_id=run_id)
+
+    async def on_custom_event(self, name: str, data: Any, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs: Any):
+        """Count searches and webpage summary cache outcomes reported by the tools."""
+        if name == "web_search":
+            for bucket in self._buckets(metadata):
+                bucket["search_queries"] += data.get("queries", 0)
+        elif name == "webpage_summary":
+            counter = {
+                "summarized": "pages_summarized",
+                "cache_hit": "summary_cache_hits",
+                "deduplicated": "summary_dedup_hits",
+            }.get(data.get("outcome"))
+            if counter:
+                for bucket in self._buckets(metadata):
+                    bucket[counter] += 1
+
+    def summary(self) -> dict:
+        """Build the run summary: totals, per-phase and per-research-unit metrics.
+
+        Returns:
+            JSON-serializable metrics summary
+        """
+        def rounded(metrics: dict) -> dict:
+            return {key: round(value, 3) if isinstance(value, float) else value for key, value in metrics.items()}
+
+        # Node time is left out of the totals: nested nodes (supervisor_tools around researchers) overlap
+        totals = _new_phase_metrics()
+        del totals["node_seconds"]
+        for metrics in self.phases.values():
+            for key in totals:
+                totals[key] += metrics[key]
+        research_units = {}
+        for unit_id, unit in self.research_units.items():
+            metrics = {key: value for key, value in unit.items() if key not in ("started_at", "finished_at")}
+            metrics["wall_seconds"] = unit["finished_at"] - unit["started_at"]
+            research_units[unit_id] = rounded(metrics)
+        return {
+            "wall_seconds": round(time.time() - self.started_at, 3),
+            "totals": rounded(totals),
+            "phases": {phase: rounded(metrics) for phase, metrics in self.phases.items()},
+            "research_units": research_units,
+        }
+
 ##########################
 # Misc Utils
 ##########################
@@ -0,0 +1,170 @@
+"""Tests for the shared LLM rate limiter, driven by a fake clock."""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from open_deep_research import utils
+from open_deep_research.utils import (
+    LLM_PRIORITY_HIGH,
+    LLM_PRIORITY_LOW,
+    LLM_PRIORITY_NORMAL,
+    LLMRateLimitCallbackHandler,
+    LLMRateLimiter,
+)
+
+
+class FakeClock:
+    """Stands in for the time module inside utils, with a monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(utils, "time", fake_clock)
+    return fake_clock
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def waiter(limiter, priority=LLM_PRIORITY_NORMAL, tokens=0):
+    return asyncio.create_task(limiter.acquire(priority, tokens))
+
+
+def refill(limiter, clock, seconds):
+    """Let time pass and re-run admission, as the limiter's timer would."""
+    clock.advance(seconds)
+    limiter._dispatch()
+
+
+def close(limiter):
+    if limiter._timer is not None:
+        limiter._timer.cancel()
+
+
+def test_request_bucket_refills_at_requests_per_minute(clock):
+    async def scenario():
+        limiter = LLMRateLimiter(requests_per_minute=6)  # One request every 10 seconds, burst of one
+        await limiter.acquire(LLM_PRIORITY_NORMAL, 0)
+
+        second = waiter(limiter)
+        await settle()
+        assert not second.done()
+        refill(limiter, clock, 9.9)
+        await settle()
+        assert not second.done()
+        refill(limiter, clock, 0.1)
+        await settle()
+        assert second.done()
+        close(limiter)
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_refills_and_reconciles_real_usage(clock):
+    async def scenario():
+        limiter = LLMRateLimiter(tokens_per_minute=600)  # 10 tokens per second, 100 token burst
+        await limiter.acquire(LLM_PRIORITY_NORMAL, 100)
+
+        second = waiter(limiter, tokens=50)
+        await settle()
+        refill(limiter, clock, 4)
+        await settle()
+        assert not second.done()
+        refill(limiter, clock, 1)
+        await settle()
+        assert second.done()
+
+        # The first call used far fewer tokens than estimated: the difference is refunded
+        limiter.release(100, 20)
+        assert limiter._token_allowance == pytest.approx(80)
+        close(limiter)
+
+    asyncio.run(scenario())
+
+
+def test_waiting_calls_are_admitted_by_priority_then_arrival(clock):
+    async def scenario():
+        limiter = LLMRateLimiter(max_concurrency=1)
+        await limiter.acquire(LLM_PRIORITY_NORMAL, 0)
+
+        admitted = []
+        names = ["low", "normal-1", "high", "normal-2"]
+        priorities = [LLM_PRIORITY_LOW, LLM_PRIORITY_NORMAL, LLM_PRIORITY_HIGH, LLM_PRIORITY_NORMAL]
+        tasks = [waiter(limiter, priority) for priority in priorities]
+        for name, task in zip(names, tasks):
+            task.add_done_callback(lambda _, name=name: admitted.append(name))
+        await settle()
+        assert admitted == []
+
+        for _ in names:
+            limiter.release(0)
+            await settle()
+        assert admitted == ["high", "normal-1", "normal-2", "low"]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_gives_up_its_place(clock):
+    async def scenario():
+        limiter = LLMRateLimiter(max_concurrency=1)
+        await limiter.acquire(LLM_PRIORITY_NORMAL, 0)
+
+        cancelled = waiter(limiter, LLM_PRIORITY_HIGH)
+        queued = waiter(limiter, LLM_PRIORITY_LOW)
+        await settle()
+        cancelled.cancel()
+        await settle()
+
+        limiter.release(0)
+        await settle()
+        assert queued.done() and not queued.cancelled()
+        assert limiter.active == 1
+        assert limiter._waiters == []
+
+    asyncio.run(scenario())
+
+
+def test_rate_limit_error_backs_off_for_retry_after(clock):
+    class RateLimitError(Exception):
+        status_code = 429
+
+        class response:
+            headers = {"retry-after": "7"}
+
+    async def scenario():
+        limiter = LLMRateLimiter(max_concurrency=2)
+        handler = LLMRateLimitCallbackHandler(limiter, LLM_PRIORITY_NORMAL)
+        run_id = uuid.uuid4()
+        await handler.on_chat_model_start({}, [[]], run_id=run_id)
+        await handler.on_llm_error(RateLimitError("429 Too Many Requests"), run_id=run_id)
+        assert limiter.active == 0
+
+        blocked = waiter(limiter)
+        await settle()
+        refill(limiter, clock, 6.9)
+        await settle()
+        assert not blocked.done()
+        refill(limiter, clock, 0.1)
+        await settle()
+        assert blocked.done()
+        close(limiter)
+
+    asyncio.run(scenario())
@@ -0,0 +1,83 @@
+"""Tests for the BM25 full-text index over the local docs directory."""
+
+import os
+
+from open_deep_research import utils
+from open_deep_research.utils import (
+    LOCAL_DOCS_INDEX_DIRNAME,
+    LocalDocsIndex,
+    split_into_passages,
+    tokenize_for_index,
+)
+
+
+def test_tokenize_latin_words_and_cjk_characters_and_bigrams():
+    assert tokenize_for_index("BM25 Index") == ["bm25", "index"]
+    assert tokenize_for_index("耕地保护") == ["耕", "地", "保", "护", "耕地", "地保", "保护"]
+
+
+def test_tokenize_single_cjk_character_between_punctuation():
+    assert tokenize_for_index("（田）") == ["田"]
+    assert "地" in tokenize_for_index("耕地")
+
+
+def test_split_into_passages_tracks_lines_and_headings():
+    text = "# 标题\n\n第一段。\n\n## 小节\n\n第二段，\n仍是第二段。\n"
+    passages = split_into_passages(text)
+    assert [passage["line"] for passage in passages] == [1, 5]
+    assert [passage["heading"] for passage in passages] == ["标题", "小节"]
+    assert passages[1]["text"] == "## 小节\n第二段，\n仍是第二段。"
+
+
+def test_split_into_passages_merges_short_and_cuts_long_paragraphs():
+    short = "\n\n".join(["短段落。"] * 5)
+    assert len(split_into_passages(short, max_chars=100)) == 1
+
+    passages = split_into_passages("长" * 250, max_chars=100)
+    assert [len(passage["text"]) for passage in passages] == [100, 100, 50]
+    assert all(passage["line"] == 1 for passage in passages)
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_search_ranks_matching_passages(tmp_path):
+    write(tmp_path / "cropland.md", "# 耕地\n\n四川省耕地占补平衡成效明显。\n\n## 其他\n\n城镇化进程加快。\n")
+    write(tmp_path / "notes.txt", "Remote sensing monitors cropland quality.")
+    write(tmp_path / "image.png", "耕地占补平衡")
+    index = LocalDocsIndex(str(tmp_path))
+    index.refresh()
+
+    assert sorted(index.files) == ["cropland.md", "notes.txt"]
+    score, path, passage = index.search("耕地占补平衡", 5)[0]
+    assert path == "cropland.md" and passage["line"] == 1 and score > 0
+    assert index.search("remote SENSING", 5)[0][1] == "notes.txt"
+    assert index.search("地", 5)
+    assert index.search("不存在的词", 5) == []
+
+
+def test_refresh_is_incremental_and_persisted(tmp_path, monkeypatch):
+    write(tmp_path / "a.md", "alpha document")
+    write(tmp_path / "b.md", "beta document")
+    LocalDocsIndex(str(tmp_path)).refresh()
+    assert os.path.exists(tmp_path / LOCAL_DOCS_INDEX_DIRNAME / "bm25.json")
+
+    reads = []
+    read_local_text_file = utils.read_local_text_file
+    monkeypatch.setattr(utils, "read_local_text_file", lambda path: reads.append(path) or read_local_text_file(path))
+
+    # A fresh index (e.g. a new process) loads the persisted passages and re-reads only changed files
+    write(tmp_path / "b.md", "beta document, gamma edition")
+    os.remove(tmp_path / "a.md")
+    index = LocalDocsIndex(str(tmp_path))
+    index.refresh()
+    assert [os.path.basename(path) for path in reads] == ["b.md"]
+    assert sorted(index.files) == ["b.md"]
+    assert index.search("gamma", 5)[0][1] == "b.md"
+    assert index.search("alpha", 5) == []
+
+    reads.clear()
+    index.refresh()
+    assert reads == []
@@ -0,0 +1,122 @@
+"""Tests for the elastic MCP client pool, using fake connections instead of MCP servers."""
+
+import asyncio
+
+import pytest
+
+from open_deep_research import utils
+from open_deep_research.utils import MCPClientPool
+
+
+class FakePooledClient:
+    """Stands in for MCPPooledClient: starts instantly, pings with a configurable delay."""
+
+    ping_delay = 0.0
+    ping_result = True
+
+    def __init__(self, mcp_config):
+        self.client = object()
+        self.tools = []
+        self.tool_coroutines = {}
+        self.last_used = 0.0
+        self.closed = False
+
+    async def start(self, timeout=None):
+        await asyncio.sleep(0.01)
+
+    async def ping(self, timeout=None):
+        await asyncio.sleep(self.ping_delay)
+        return self.ping_result
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_connections(monkeypatch):
+    monkeypatch.setattr(utils, "MCPPooledClient", FakePooledClient)
+    monkeypatch.setattr(FakePooledClient, "ping_delay", 0.0)
+    monkeypatch.setattr(FakePooledClient, "ping_result", True)
+
+
+def make_pool(**kwargs):
+    options = {"min_size": 1, "max_size": 3, "grow_after_wait_seconds": 0.05, "idle_timeout_seconds": 60}
+    return MCPClientPool({"server": {}}, **{**options, **kwargs})
+
+
+def test_grows_when_acquire_waits():
+    async def scenario():
+        pool = make_pool()
+        first = await pool.acquire()
+        assert len(pool.clients) == 1
+
+        # The only connection is busy: the waiting acquire opens a second one
+        second = await asyncio.wait_for(pool.acquire(), timeout=1)
+        assert second is not first
+        assert len(pool.clients) == 2
+        assert pool.stats["waited_acquires"] == 1
+
+        # Never beyond max_size
+        third = await pool.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.acquire(), timeout=0.3)
+        assert len(pool.clients) == 3
+
+        for client in (first, second, third):
+            await pool.release(client)
+
+    asyncio.run(scenario())
+
+
+def test_reaps_idle_clients_down_to_min_size():
+    async def scenario():
+        pool = make_pool(idle_timeout_seconds=0.2)
+        clients = [await pool.acquire() for _ in range(3)]
+        assert len(pool.clients) == 3
+        for client in clients:
+            await pool.release(client)
+
+        await asyncio.sleep(0.6)
+        assert len(pool.clients) == 1
+        assert sum(client.closed for client in clients) == 2
+        assert pool.stats["clients_closed_idle"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_broken_release_replaces_client():
+    async def scenario():
+        pool = make_pool(max_size=1)
+        broken = await pool.acquire()
+        await pool.release(broken, broken=True)
+        assert broken.closed
+        assert broken not in pool.clients
+
+        replacement = await asyncio.wait_for(pool.acquire(), timeout=1)
+        assert replacement is not broken
+        assert pool.stats["clients_replaced"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_health_check_does_not_leak_client(monkeypatch):
+    async def scenario():
+        pool = make_pool(max_size=1)
+        client = await pool.acquire()
+        await pool.release(client)
+
+        # The idle connection gets pinged, and the acquire times out during the ping
+        monkeypatch.setattr(utils, "MCP_POOL_HEALTH_CHECK_IDLE_SECONDS", 0)
+        monkeypatch.setattr(FakePooledClient, "ping_delay", 1.0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.acquire(), timeout=0.05)
+        await asyncio.sleep(0.05)
+        assert client.closed
+        assert client not in pool.clients
+
+        # The capacity came back: a later acquire gets a fresh connection
+        monkeypatch.setattr(FakePooledClient, "ping_delay", 0.0)
+        replacement = await asyncio.wait_for(pool.acquire(), timeout=1)
+        assert replacement is not client
+
+    asyncio.run(scenario())
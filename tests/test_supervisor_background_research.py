@@ -0,0 +1,169 @@
+"""Tests for straggling research units handed to the background by supervisor_tools."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+
+from open_deep_research import deep_researcher
+from open_deep_research.state import AgentState, SupervisorState
+from open_deep_research.utils import (
+    BACKGROUND_RESEARCH_MESSAGE_NAME,
+    BACKGROUND_RESEARCH_PENDING_PREFIX,
+    _background_research,
+    register_background_research,
+)
+
+THREAD_ID = "thread-1"
+CONFIG = {"configurable": {"thread_id": THREAD_ID, "research_straggler_grace_seconds": 1}}
+
+
+@pytest.fixture(autouse=True)
+def stub_research_units(monkeypatch):
+    """Replace the researcher subgraph: each topic finishes when its event is set."""
+    events = {}
+
+    async def run_research_unit(tool_call, config, slots):
+        topic = tool_call["args"]["research_topic"]
+        async with slots:
+            await events.setdefault(topic, asyncio.Event()).wait()
+        return {"compressed_research": f"findings on {topic}", "raw_notes": [f"raw {topic}"]}
+
+    monkeypatch.setattr(deep_researcher, "run_research_unit", run_research_unit)
+    _background_research.clear()
+    yield events
+    _background_research.clear()
+
+
+def conduct_research(*topics):
+    return AIMessage(content="", tool_calls=[
+        {"name": "ConductResearch", "args": {"research_topic": topic}, "id": f"call-{topic}"}
+        for topic in topics
+    ])
+
+
+def research_complete():
+    return AIMessage(content="", tool_calls=[{"name": "ResearchComplete", "args": {}, "id": "call-done"}])
+
+
+def think():
+    return AIMessage(content="", tool_calls=[{"name": "think_tool", "args": {"reflection": "waiting"}, "id": "call-think"}])
+
+
+def supervisor_state(messages):
+    return {"supervisor_messages": messages, "research_brief": "brief", "research_iterations": 1}
+
+
+async def run_step_with_straggler(events):
+    """Run a step where "fast" finishes at once and "slow" outlives the grace period."""
+    events["fast"] = asyncio.Event()
+    events["fast"].set()
+    events["slow"] = asyncio.Event()
+    history = [conduct_research("fast", "slow")]
+    command = await deep_researcher.supervisor_tools(supervisor_state(history), CONFIG)
+    return history + command.update["supervisor_messages"], command
+
+
+def test_straggler_goes_to_background_after_grace_period(stub_research_units):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        messages, command = await run_step_with_straggler(stub_research_units)
+        assert 1 <= loop.time() - started_at < 2
+        assert command.goto == "supervisor"
+
+        fast, slow = messages[1:]
+        assert fast.content == "findings on fast"
+        assert slow.content.startswith(BACKGROUND_RESEARCH_PENDING_PREFIX)
+        assert set(_background_research[THREAD_ID]) == {"call-slow"}
+        assert command.update["raw_notes"] == ["raw fast"]
+
+        stub_research_units["slow"].set()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+
+def test_finished_background_research_is_delivered_on_next_step(stub_research_units):
+    async def scenario():
+        messages, _ = await run_step_with_straggler(stub_research_units)
+        stub_research_units["slow"].set()
+        await asyncio.sleep(0.01)
+
+        command = await deep_researcher.supervisor_tools(supervisor_state(messages + [think()]), CONFIG)
+        delivery = command.update["supervisor_messages"][-1]
+        assert isinstance(delivery, HumanMessage)
+        assert delivery.name == BACKGROUND_RESEARCH_MESSAGE_NAME
+        assert "findings on slow" in delivery.content
+        assert command.update["raw_notes"] == ["raw slow"]
+        assert THREAD_ID not in _background_research
+
+    asyncio.run(scenario())
+
+
+def test_phase_end_waits_for_background_research(stub_research_units):
+    async def scenario():
+        messages, _ = await run_step_with_straggler(stub_research_units)
+        asyncio.get_running_loop().call_later(0.05, stub_research_units["slow"].set)
+
+        command = await deep_researcher.supervisor_tools(supervisor_state(messages + [research_complete()]), CONFIG)
+        assert command.goto == END
+        assert command.update["notes"] == ["findings on fast", "Background research on \"slow\" finished:\n\nfindings on slow"]
+        assert command.update["raw_notes"] == ["raw slow"]
+        assert THREAD_ID not in _background_research
+
+    asyncio.run(scenario())
+
+
+def test_research_supervisor_cancels_background_research_when_run_fails(monkeypatch):
+    started = []
+
+    async def failing_supervisor(state, config):
+        task = asyncio.create_task(asyncio.sleep(60))
+        started.append(task)
+        register_background_research(THREAD_ID, "call-slow", "slow", task)
+        raise RuntimeError("supervisor failed")
+
+    builder = StateGraph(SupervisorState)
+    builder.add_node("supervisor", failing_supervisor)
+    builder.add_edge(START, "supervisor")
+    monkeypatch.setattr(deep_researcher, "supervisor_subgraph", builder.compile())
+
+    graph = StateGraph(AgentState)
+    graph.add_node("research_supervisor", deep_researcher.research_supervisor)
+    graph.add_edge(START, "research_supervisor")
+    graph.add_edge("research_supervisor", END)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await graph.compile().ainvoke({"messages": [], "research_brief": "brief"}, CONFIG)
+        await asyncio.sleep(0)
+        assert started[0].cancelled()
+        assert THREAD_ID not in _background_research
+
+    asyncio.run(scenario())
+
+
+def test_background_research_lost_with_the_process_is_rerun(stub_research_units):
+    async def scenario():
+        # History from an earlier process: "slow" was sent to the background and never delivered
+        history = [
+            conduct_research("slow"),
+            ToolMessage(
+                content=f"{BACKGROUND_RESEARCH_PENDING_PREFIX} continues in the background.",
+                name="ConductResearch", tool_call_id="call-slow"
+            ),
+        ]
+        stub_research_units["slow"] = asyncio.Event()
+        stub_research_units["slow"].set()
+
+        command = await deep_researcher.supervisor_tools(supervisor_state(history + [research_complete()]), CONFIG)
+        assert command.update["notes"] == ["Background research on \"slow\" finished:\n\nfindings on slow"]
+
+        # Once delivered, it is not run again
+        delivered = history + [HumanMessage(content="done", name=BACKGROUND_RESEARCH_MESSAGE_NAME, id="background_research:call-slow")]
+        command = await deep_researcher.supervisor_tools(supervisor_state(delivered + [research_complete()]), CONFIG)
+        assert command.update["notes"] == ["done"]
+
+    asyncio.run(scenario())